@@ -1,15 +1,57 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from framework.logger import log_info, log_error
+from selenium.common.exceptions import SessionNotCreatedException
+from framework.logger import (
+    logger, log_info, log_to_file, log_warning, log_error, start_log_server, disable_file_logging
+)
+import html
+from urllib.parse import urlsplit
 import pytest
 import os
 import time
-from framework.actions import safe_click, remove_all_overlays
+from framework.actions import (
+    safe_click,
+    remove_all_overlays,
+    get_wait_savings,
+    merge_wait_savings,
+    format_wait_savings_report,
+    get_stale_retry_stats,
+    merge_stale_retry_stats,
+    format_stale_retry_report,
+    pop_navigation_timings
+)
+from framework import chrome_startup
+from framework.backends import BACKENDS, DEFAULT_CAPABILITIES, select_backend
+from framework.http_backend import HttpBrowser
+from framework.browser_pool import BrowserPool, DEFAULT_POOL_SIZE, reset_browser_state
+from framework.session_cache import SessionCache
+from framework.stand_in_server import StandInServer
+from framework import profiler
+from framework.wait_manager import WAIT_SETTINGS, configure_waits
+from framework.state import prepare_state
+from framework.catalog import load_product_matrix, scrape_product_matrix
+from framework import perf_history
+from framework.stream_report import StreamReporter, TestLogBuffer, artifact_path, get_run_dir, save_artifact
+from framework.failure_capture import ArtifactWriter, DEFAULT_RETENTION_RUNS, capture_failure, prune_artifacts
+from framework.network import DEFAULT_BLOCKLIST, IMAGE_PATTERNS, set_blocked_urls
 
 # 🚨 הגדרת Timeout קבוע גבוה
 COMMAND_TIMEOUT_SECONDS = 300
 
+LIVE_BASE_URL = "https://automationexercise.com"
+
+# כותב ה-NDJSON של הדוח הזורם (בתהליך הראשי בלבד)
+_stream_reporter = None
+
+# כותב ה-artifacts של בדיקות שנכשלו ברקע (בכל תהליך שמריץ בדיקות)
+_artifact_writer = None
+
+# זמני בדיקות ופעולות להיסטוריית הביצועים (בתהליך הראשי): {nodeid: (outcome, duration)}, [(nodeid, action, calls, total)]
+_session_started = time.time()
+_test_timings = {}
+_action_timings = []
+
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -18,25 +60,354 @@ def pytest_addoption(parser):
         default="True",
         help="האם להריץ את הדפדפן במצב נסתר (True/False)."
     )
+    parser.addoption(
+        "--browser-pool-size",
+        action="store",
+        type=int,
+        default=int(os.environ.get("BROWSER_POOL_SIZE", DEFAULT_POOL_SIZE)),
+        help="מספר הדפדפנים המחוממים מראש בכל worker (ברירת מחדל: 1 או BROWSER_POOL_SIZE)."
+    )
+    parser.addoption(
+        "--backend",
+        action="store",
+        default="auto",
+        choices=("auto",) + tuple(BACKENDS),
+        help="backend לבדיקות: auto (הזול ביותר שמספק את ה-capabilities של הבדיקה), chrome, "
+             "headless-shell או http (בקשות HTTP ו-parser של HTML, בלי JS)."
+    )
+    parser.addoption(
+        "--headless-shell-path",
+        action="store",
+        default=os.environ.get("CHROME_HEADLESS_SHELL", ""),
+        help="נתיב ל-chrome-headless-shell. בלעדיו ה-backend headless-shell אינו זמין."
+    )
+    parser.addoption(
+        "--chrome-profile-template",
+        action="store",
+        default=os.environ.get("CHROME_PROFILE_TEMPLATE", ""),
+        help="תיקיית פרופיל תבנית (disk cache חם ו-cookies של הסכמה) שמועתקת לכל דפדפן. "
+             "יצירה: python -m framework.chrome_startup <dir> [base_url]"
+    )
+    parser.addoption(
+        "--target",
+        action="store",
+        default="live",
+        choices=("live", "local"),
+        help="מול מה לרוץ: live (האתר האמיתי) או local (שרת מקומי עם דפים מוקלטים, בלי רשת)."
+    )
+    parser.addoption(
+        "--block-requests",
+        action="store",
+        default="True",
+        help="חסימת בקשות לדומיינים של פרסומות, אנליטיקס ופונטים (True/False)."
+    )
+    parser.addoption(
+        "--extra-blocked-urls",
+        action="store",
+        default="",
+        help="תבניות URL נוספות לחסימה, מופרדות בפסיקים (למשל *cdn.example.com*)."
+    )
+    parser.addoption(
+        "--block-images",
+        action="store",
+        default="False",
+        help="חסימת תמונות בכל הבדיקות (True/False). בדיקה בודדת יכולה לבקש זאת עם @pytest.mark.block_images."
+    )
+    parser.addoption(
+        "--page-load-strategy",
+        action="store",
+        default="normal",
+        choices=("normal", "eager", "none"),
+        help="מתי driver.get חוזר: normal (כל המשאבים), eager (DOM מוכן) או none (מיד). navigate() ממתין ל-DOM בכל מקרה."
+    )
+    parser.addoption(
+        "--wait-timeout",
+        action="store",
+        type=float,
+        default=WAIT_SETTINGS["timeout"],
+        help="timeout ברירת מחדל (בשניות) לכל ההמתנות של framework."
+    )
+    parser.addoption(
+        "--wait-poll",
+        action="store",
+        type=float,
+        default=WAIT_SETTINGS["initial_poll"],
+        help="מרווח ה-polling הראשון (בשניות). המרווח גדל בהדרגה עד --wait-max-poll."
+    )
+    parser.addoption(
+        "--wait-max-poll",
+        action="store",
+        type=float,
+        default=WAIT_SETTINGS["max_poll"],
+        help="מרווח ה-polling המקסימלי (בשניות)."
+    )
+    parser.addoption(
+        "--profile-actions",
+        action="store",
+        default="False",
+        help="פרופיילר לכל helper ופקודת WebDriver: זמן, round trips ו-polls (True/False). "
+             "כותב reports/profile_<run>.folded ומצרף טבלת hot-path לכל בדיקה בדוח."
+    )
+    parser.addoption(
+        "--stream-report",
+        action="store",
+        default="True",
+        help="כתיבת כל תוצאה ל-reports/run_<id>/results.ndjson ברגע שהבדיקה מסתיימת, עם viewer חי "
+             "(index.html באותה תיקייה; הגשה: python -m framework.stream_report <dir>) (True/False)."
+    )
+    parser.addoption(
+        "--failure-artifacts",
+        action="store",
+        default="True",
+        help="בבדיקה שנכשלה: צילום מסך, page source ולוג הדפדפן, דחוסים ונכתבים ברקע ל-artifacts/ "
+             "ומקושרים מהדוחות (True/False)."
+    )
+    parser.addoption(
+        "--artifact-retention",
+        action="store",
+        type=int,
+        default=DEFAULT_RETENTION_RUNS,
+        help="מספר הריצות האחרונות ששומרות artifacts; בריצות ישנות יותר תיקיית artifacts/ נמחקת "
+             "(ברירת מחדל: 10 או ARTIFACT_RETENTION_RUNS, 0 = ללא מחיקה)."
+    )
+    parser.addoption(
+        "--perf-history",
+        action="store",
+        default="True",
+        help="שמירת זמני הבדיקות והפעולות ב-reports/perf_history.sqlite לפי commit ותצורה (True/False). "
+             "השוואה: python -m framework.perf_history compare"
+    )
+    parser.addoption(
+        "--crawl-links",
+        action="store",
+        default="False",
+        help="בבדיקת הכפתורים בדף הבית: בדיקה שכל ה-hrefs שנאספו עונים (סטטוס וזמן תגובה), "
+             "במקביל ועם rate limit לכל host (True/False)."
+    )
+    parser.addoption(
+        "--crawl-depth",
+        action="store",
+        type=int,
+        default=0,
+        help="כמה רמות לסרוק מעבר לקישורים של דף הבית (קישורים של אותו אתר בלבד; ברירת מחדל: 0)."
+    )
+    parser.addoption(
+        "--product-matrix",
+        action="store",
+        default=os.path.join("tests", "data", "products.json"),
+        help="מקור המוצרים לבדיקות המטריצה: קובץ JSON (ברירת מחדל: tests/data/products.json) "
+             "או scrape - כל המוצרים שבעמוד /products של האתר הנבדק."
+    )
+    parser.addoption(
+        "--accordion-mode",
+        action="store",
+        default="bulk",
+        choices=("bulk", "interactive", "both"),
+        help="אופן בדיקת האקורדיון בעמוד Test Cases: bulk (מעבר DOM אחד), interactive (לחיצה על כל פאנל) או both (השוואת זמנים)."
+    )
+    parser.addoption(
+        "--flaky-reruns",
+        action="store",
+        type=int,
+        default=1,
+        help="כמה פעמים להריץ שוב בדיקה שנכשלה - רק אותה, בדפדפן חדש (0 = ללא). בדיקה שעוברת בריצה חוזרת "
+             "נשמרת כ-flaky בהיסטוריית הביצועים. --reruns של pytest-rerunfailures גובר."
+    )
+    parser.addoption(
+        "--quarantine",
+        action="store",
+        default="True",
+        help="בדיקות ששיעור ה-flaky שלהן בהיסטוריה עובר את --flaky-threshold רצות בנתיב נפרד (worker משלהן "
+             "ב---dist=loadgroup), וכישלון שלהן מדווח כ-xfail ולא מכשיל את הריצה (True/False). "
+             "רשימה: python -m framework.perf_history flaky"
+    )
+    parser.addoption(
+        "--flaky-threshold",
+        action="store",
+        type=float,
+        default=perf_history.FLAKY_THRESHOLD,
+        help="שיעור ה-flaky (מתוך 20 הריצות האחרונות של הבדיקה) שמעליו היא עוברת להסגר (ברירת מחדל: 0.2)."
+    )
 
 
-@pytest.fixture(scope="session")
-def driver(request):
-    log_info("🚀 מפעיל דפדפן Chrome...")
+def pytest_configure(config):
+    global _artifact_writer
+    # 💡 --collect-only לא מריץ בדיקות ולכן לא יוצר את logs/ ו-reports/
+    if config.option.collectonly:
+        disable_file_logging()
+    configure_waits(
+        timeout=config.getoption("--wait-timeout"),
+        initial_poll=config.getoption("--wait-poll"),
+        max_poll=config.getoption("--wait-max-poll")
+    )
+    if _is_true(config.getoption("--profile-actions")):
+        profiler.enable()
+    config.crawl_links = _is_true(config.getoption("--crawl-links"))
 
-    # קריאת הערך שהועבר לדגל --headless
-    headless_arg = request.config.getoption("--headless").lower()
+    # 💡 ריצה חוזרת של הבדיקה שנכשלה בלבד (pytest-rerunfailures), במקום להריץ שוב את כל הריצה
+    if config.pluginmanager.hasplugin("rerunfailures") and config.getoption("reruns", default=None) is None:
+        config.option.reruns = config.getoption("--flaky-reruns")
 
-    chrome_options = Options()
+    # 💡 בהרצה מקבילית: התהליך הראשי הוא הכותב היחיד לקובץ הלוג, וה-workers שולחים אליו רשומות
+    is_controller = not hasattr(config, "workerinput")
+    if is_controller and config.getoption("numprocesses", default=None):
+        start_log_server()
+
+    # 💡 דוח זורם: התהליך הראשי כותב את ה-NDJSON; מי שמריץ את הבדיקות אוסף את הלוג של כל בדיקה
+    config.test_log_buffer = None
+    if _is_true(config.getoption("--stream-report")):
+        if not is_controller or not config.getoption("numprocesses", default=None):
+            config.test_log_buffer = TestLogBuffer()
+            logger.addHandler(config.test_log_buffer)
+        if is_controller:
+            get_run_dir()  # קובע את מזהה הריצה לפני שה-workers מופעלים; התיקייה נוצרת רק ב-pytest_sessionstart
 
-    if headless_arg == 'false' or headless_arg == 'no':
-        is_headless = False
-        log_info("💻 מריץ דפדפן במצב: גלוי (Non-Headless)")
+    # 💡 artifacts של כישלונות: נכתבים ברקע בכל תהליך שמריץ בדיקות; ניקוי ריצות ישנות בתהליך הראשי
+    runs_tests = not is_controller or not config.getoption("numprocesses", default=None)
+    if _is_true(config.getoption("--failure-artifacts")):
+        if runs_tests:
+            _artifact_writer = ArtifactWriter()
+        if is_controller:
+            prune_artifacts(config.getoption("--artifact-retention"), current_run_dir=get_run_dir())
+
+    config.addinivalue_line(
+        "markers",
+        "block_images: הבדיקה לא בודקת תצוגה ולכן תמונות נחסמות ברמת הרשת."
+    )
+    config.addinivalue_line(
+        "markers",
+        "needs(**state): ה-state שהבדיקה צריכה, מוכן על ידי ה-fixture driver בלי UI "
+        "(למשל needs(products_in_cart=[1]))."
+    )
+    config.addinivalue_line(
+        "markers",
+        "capabilities(*caps): היכולות שהבדיקה צריכה (dom, js, interaction, headed). "
+        "ללא marker: dom, js, interaction (דפדפן מלא)."
+    )
+    config.addinivalue_line(
+        "markers",
+        "quarantined(rate): נוסף אוטומטית לבדיקה flaky שבהסגר - רצה בנתיב נפרד וכישלון שלה לא מכשיל את הריצה."
+    )
+
+    # 💡 ההסגר נקבע פעם אחת בתהליך הראשי ועובר ל-workers, כך שכולם אוספים את אותן בדיקות באותו סדר
+    if not is_controller:
+        config.quarantine = config.workerinput.get("quarantine", {})
+    elif _is_true(config.getoption("--quarantine")) and os.path.exists(perf_history.DB_PATH):
+        config.quarantine = perf_history.quarantined_tests(config.getoption("--flaky-threshold"))
     else:
-        is_headless = True
-        log_info("🤖 מריץ דפדפן במצב: נסתר (Headless)")
+        config.quarantine = {}
+
+
+def pytest_sessionstart(session):
+    global _stream_reporter
+    config = session.config
+    # 💡 הדוח הזורם נפתח רק כשבאמת מריצים בדיקות - --collect-only לא יוצר תיקיות ב-reports/ או ב-logs/
+    if (_is_true(config.getoption("--stream-report")) and not hasattr(config, "workerinput")
+            and not config.option.collectonly):
+        _stream_reporter = StreamReporter()
+        _stream_reporter.write({
+            "type": "session", "run_id": os.environ.get("TEST_RUN_ID"), "started": _stream_reporter.started,
+            "target": config.getoption("--target"), "backend": config.getoption("--backend"),
+        })
+        log_info(f"📡 דוח זורם: {_stream_reporter.path}")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    node.workerinput["quarantine"] = node.config.quarantine
+
+
+def _history_nodeid(nodeid: str) -> str:
+    """ה-nodeid בלי הסיומת @<group> ש-xdist מוסיף ב-loadgroup - ההיסטוריה של בדיקה לא תלויה בנתיב שבו רצה."""
+    base, _, group = nodeid.rpartition("@")
+    return base if base and "]" not in group and "::" not in group else nodeid
+
+
+# 💡 tryfirst: ה-xdist_group צריך להיות על הבדיקה לפני ש-xdist מוסיף את שם הקבוצה ל-nodeid
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    # 💡 בדיקות בהסגר: נתיב משלהן (קבוצת xdist אחת) ובסוף התור, כך שהן לא מעכבות את הבדיקות שקובעות את התוצאה
+    quarantined = [item for item in items if _history_nodeid(item.nodeid) in config.quarantine]
+    for item in quarantined:
+        item.add_marker(pytest.mark.quarantined(config.quarantine[_history_nodeid(item.nodeid)]))
+        item.add_marker(pytest.mark.xdist_group("quarantine"))
+    if quarantined:
+        items[:] = [item for item in items if item not in quarantined] + quarantined
+        log_info(f"🚧 {len(quarantined)} בדיקות flaky בהסגר רצות בנתיב נפרד")
+
+
+# ===================== מטריצת מוצרים =====================
+
+_product_matrix = None
+
+
+def get_product_matrix(config) -> list:
+    """המוצרים לבדיקות המטריצה - נטענים פעם אחת לכל תהליך (גם ב-collection)."""
+    global _product_matrix
+    if _product_matrix is None:
+        source = config.getoption("--product-matrix")
+        if source != "scrape":
+            _product_matrix = load_product_matrix(os.path.join(str(config.rootpath), source))
+        elif config.getoption("--target") == "local":
+            # 💡 ה-collection רץ לפני ה-fixtures - שרת מקומי זמני לסריקה בלבד
+            server = StandInServer()
+            server.start()
+            try:
+                _product_matrix = scrape_product_matrix(server.base_url)
+            finally:
+                server.stop()
+        else:
+            _product_matrix = scrape_product_matrix(LIVE_BASE_URL)
+        log_info(f"🛍️ מטריצת מוצרים: {len(_product_matrix)} מוצרים ({source})")
+    return _product_matrix
+
+
+def pytest_generate_tests(metafunc):
+    # בדיקה שמקבלת product רצה פעם לכל מוצר במטריצה
+    if "product" in metafunc.fixturenames:
+        products = get_product_matrix(metafunc.config)
+        metafunc.parametrize("product", products, ids=[product.slug for product in products])
+
 
-    if is_headless:
+@pytest.fixture(scope="session")
+def product_matrix(request):
+    """כל מטריצת המוצרים (לבדיקות שעוברות על כל הקטלוג בבת אחת)."""
+    return get_product_matrix(request.config)
+
+
+def _is_true(value: str) -> bool:
+    return value.lower() not in ("false", "no", "0")
+
+
+def get_blocked_urls(config, block_images: bool = False) -> list:
+    """רשימת תבניות ה-URL לחסימה לפי האופציות בשורת הפקודה."""
+    patterns = []
+    if _is_true(config.getoption("--block-requests")):
+        patterns.extend(DEFAULT_BLOCKLIST)
+    patterns.extend(p.strip() for p in config.getoption("--extra-blocked-urls").split(",") if p.strip())
+    if block_images or _is_true(config.getoption("--block-images")):
+        patterns.extend(IMAGE_PATTERNS)
+    return patterns
+
+
+def create_chrome_driver(is_headless: bool, base_url: str = LIVE_BASE_URL, blocked_urls=(),
+                         page_load_strategy: str = "normal", profile_template: str = "", binary_path: str = None):
+    """מפעיל מופע Chrome חדש עם דגלי היציבות של הפרויקט (או chrome-headless-shell כשמועבר binary_path)."""
+    started = time.perf_counter()
+    # 💡 נתיבי chromedriver ו-Chrome מה-cache - בלי להריץ את Selenium Manager בכל הפעלה
+    paths = chrome_startup.resolve_binary_paths()
+
+    chrome_options = Options()
+    chrome_options.page_load_strategy = page_load_strategy
+    if binary_path:
+        chrome_options.binary_location = binary_path
+    elif paths["browser_path"]:
+        chrome_options.binary_location = paths["browser_path"]
+    if profile_template:
+        chrome_options.add_argument(f"--user-data-dir={chrome_startup.copy_profile_template(profile_template)}")
+
+    # chrome-headless-shell הוא headless מעצם הגדרתו
+    if is_headless and not binary_path:
         chrome_options.add_argument("--headless=new")
 
     # 💡 דגלים ליציבות (עבור Chrome Options)
@@ -51,28 +422,464 @@ def driver(request):
     chrome_options.add_argument("--disable-features=RendererCodeIntegrity")
     chrome_options.add_argument("--disable-site-isolation-trials")
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    # לוג הקונסול נשמר כ-artifact כשבדיקה נכשלת
+    chrome_options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
 
-    try:
-        # ✅ שינוי קריטי: שימוש ב-Service() ריק (מפעיל את Selenium Manager)
+    def start(driver_path):
         service = Service(
-            # אין צורך ב-executable_path=
+            executable_path=driver_path,
             timeout=COMMAND_TIMEOUT_SECONDS
             # service_args נשאר ריק כיוון שה-command-timeout יועבר כארגומנט ל-Service
         )
+        return webdriver.Chrome(service=service, options=chrome_options)
 
-        driver = webdriver.Chrome(
-            service=service,
-            options=chrome_options
-        )
+    try:
+        driver = start(paths["driver_path"])
+    except SessionNotCreatedException as e:
+        # 💡 chromedriver מה-cache לא תואם ל-Chrome (למשל עדכון שה-cache לא זיהה) - פתרון מחדש וניסיון אחד נוסף
+        log_warning(f"הפעלת Chrome נכשלה, מאתר מחדש את chromedriver: {e.msg}")
+        paths = chrome_startup.resolve_binary_paths(refresh=True)
+        if paths["browser_path"] and not binary_path:
+            chrome_options.binary_location = paths["browser_path"]
+        driver = start(paths["driver_path"])
+    launched = time.perf_counter()
 
-        driver.maximize_window()
-        time.sleep(1)
-        driver.get("https://automationexercise.com/")
+    # 💡 בלי maximize_window ו-sleep: גודל החלון נקבע כבר ב---window-size
+    # 💡 החסימה מוגדרת לפני הטעינה הראשונה, כך שפרסומות לא נטענות בכלל
+    if blocked_urls:
+        set_blocked_urls(driver, blocked_urls)
+    # חימום: טעינה ראשונה של האתר ממלאת את ה-cache של הדפדפן
+    driver.get(f"{base_url}/")
+    chrome_startup.record_startup(launched - started, time.perf_counter() - started)
+    return driver
+
+
+@pytest.fixture(scope="session")
+def stand_in_server():
+    """שרת מקומי שמדמה את האתר (דפים, עגלה והתחברות) - אחד לכל worker."""
+    server = StandInServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def base_url(request):
+    """כתובת הבסיס של האתר הנבדק, לפי --target."""
+    if request.config.getoption("--target") == "local":
+        return request.getfixturevalue("stand_in_server").base_url
+    return LIVE_BASE_URL
+
+
+def _is_headless(config) -> bool:
+    return config.getoption("--headless").lower() not in ("false", "no")
+
+
+def available_backends(config) -> tuple:
+    """ה-backends שאפשר להפעיל בריצה הנוכחית, מהזול ליקר."""
+    backends = ["http"]
+    if _is_headless(config) and config.getoption("--headless-shell-path"):
+        backends.append("headless-shell")
+    backends.append("chrome")
+    return tuple(backends)
+
+
+def _backend_for(node, config) -> str:
+    """ה-backend הזול ביותר שמספק את ה-capabilities שהבדיקה (או המודול) הצהירו עליהן."""
+    marker = node.get_closest_marker("capabilities")
+    required = set(marker.args) if marker else set(DEFAULT_CAPABILITIES)
+    try:
+        return select_backend(required, config.getoption("--backend"), available_backends(config))
+    except ValueError as e:
+        pytest.skip(str(e))
 
-        yield driver
 
+def _create_pool(config, base_url: str, backend: str) -> BrowserPool:
+    size = config.getoption("--browser-pool-size")
+    if backend == "http":
+        log_info("🪶 מפעיל backend מסוג http (בלי דפדפן)")
+        return BrowserPool(factory=HttpBrowser, size=size, reset=lambda d: d.reset())
+
+    log_info("🚀 מפעיל דפדפן Chrome..." if backend == "chrome" else "🚀 מפעיל chrome-headless-shell...")
+    is_headless = _is_headless(config)
+    log_info("🤖 מריץ דפדפן במצב: נסתר (Headless)" if is_headless else "💻 מריץ דפדפן במצב: גלוי (Non-Headless)")
+
+    binary_path = config.getoption("--headless-shell-path") if backend == "headless-shell" else None
+    profile_template = config.getoption("--chrome-profile-template")
+    keep_cookies = chrome_startup.CONSENT_COOKIES if profile_template else ()
+    return BrowserPool(
+        factory=lambda: create_chrome_driver(is_headless, base_url, get_blocked_urls(config),
+                                             config.getoption("--page-load-strategy"), profile_template,
+                                             binary_path),
+        size=size,
+        reset=lambda d: reset_browser_state(d, origins=(base_url,), keep_cookies=keep_cookies)
+    )
+
+
+@pytest.fixture(scope="session")
+def browser_pools(request, base_url):
+    """מאגר לכל backend (לכל worker של pytest-xdist). מאגר נוצר ומחומם רק כשבדיקה ראשונה צריכה אותו,
+    כך שריצה של בדיקות http בלבד לא מפעילה Chrome כלל."""
+    pools = {}
+
+    def get_pool(backend: str) -> BrowserPool:
+        if backend not in pools:
+            pool = _create_pool(request.config, base_url, backend)
+            pool.warm_up()
+            pools[backend] = pool
+        return pools[backend]
+
+    try:
+        yield get_pool
+    finally:
+        for backend, pool in pools.items():
+            log_info(f"🚪 סוגר את מאגר ה-{backend}...")
+            pool.close()
+
+
+@pytest.fixture(scope="session")
+def session_cache(base_url):
+    """cache של sessions מחוברים (cookies + localStorage) לכל worker."""
+    return SessionCache(origin=base_url)
+
+
+@pytest.fixture
+def driver(request, browser_pools, base_url):
+    """דפדפן מושכר מהמאגר של ה-backend המתאים, עם cookies ו-storage נקיים לכל בדיקה וה-state שהוצהר ב-needs."""
+    needs = request.node.get_closest_marker("needs")
+    backend = _backend_for(request.node, request.config)
+    request.node.user_properties.append(("backend", backend))
+    browser_pool = browser_pools(backend)
+    driver = browser_pool.acquire()
+    # חסימת תמונות לבדיקה בודדת, ושחזור הרשימה הרגילה בסיומה (ב-http תמונות לא נטענות ממילא)
+    block_images = backend != "http" and request.node.get_closest_marker("block_images") is not None
+    if block_images:
+        set_blocked_urls(driver, get_blocked_urls(request.config, block_images=True))
+    try:
+        if needs:
+            prepare_state(driver, base_url, **needs.kwargs)
+        yield driver
     finally:
-        log_info("🚪 סוגר את הדפדפן...")
-        if 'driver' in locals() and driver:
-            driver.quit()
+        if block_images:
+            set_blocked_urls(driver, get_blocked_urls(request.config))
+        if getattr(request.node, "discard_browser", False):
+            # 💡 דפדפן של בדיקה שנכשלה לא חוזר למאגר - הריצה החוזרת שלה מקבלת דפדפן חדש
+            browser_pool.discard(driver)
+        else:
+            browser_pool.release(driver)
+
+
+# ===================== Navigation Timing בדוח =====================
+
+_navigation_by_page = {}
+
+
+def _add_report_html(report, html: str):
+    """מצרף קטע HTML לבדיקה בדוח של pytest-html (אם מותקן)."""
+    try:
+        from pytest_html import extras
+    except ImportError:
+        return
+    report.extras = getattr(report, "extras", []) + [extras.html(html)]
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    timings = pop_navigation_timings()
+    if report.failed and report.when in ("setup", "call"):
+        item.discard_browser = True
+        if _artifact_writer:
+            _attach_failure_artifacts(item, report)
+        if item.get_closest_marker("quarantined") and _is_last_attempt(item):
+            _quarantine_failure(item, report)
+    if item.config.test_log_buffer and _is_streamed(report):
+        _attach_log_excerpt(item, report)
+    if report.when != "call":
+        return
+    if timings:
+        _attach_navigation_timings(item, report, timings)
+    if profiler.is_enabled():
+        _attach_action_profile(item, report)
+
+
+def _attach_navigation_timings(item, report, timings):
+    # user_properties עוברים גם מ-workers של xdist לתהליך הראשי
+    item.user_properties.append(("navigation_timings", timings))
+    report.user_properties.append(("navigation_timings", timings))
+
+    rows = "".join(
+        f"<tr><td>{html.escape(t['url'])}</td><td>{t['ttfb_ms']}</td><td>{t['dom_content_loaded_ms']}</td>"
+        f"<td>{t['load_ms']}</td><td>{t['get_ms']}</td></tr>"
+        for t in timings
+    )
+    table = (
+        "<table><tr><th>URL</th><th>TTFB (ms)</th><th>DOMContentLoaded (ms)</th>"
+        f"<th>load (ms)</th><th>driver.get (ms)</th></tr>{rows}</table>"
+    )
+    _add_report_html(report, table)
+
+
+# ===================== בדיקות flaky והסגר =====================
+
+def _is_last_attempt(item) -> bool:
+    """האם זה הניסיון האחרון של הבדיקה (אחריו pytest-rerunfailures לא יריץ אותה שוב)."""
+    try:
+        from pytest_rerunfailures import get_reruns_count
+    except ImportError:
+        return True
+    return getattr(item, "execution_count", 1) > (get_reruns_count(item) or 0)
+
+
+def _quarantine_failure(item, report):
+    """כישלון סופי של בדיקה בהסגר מדווח כ-xfail: מופיע בדוחות אבל לא מכשיל את הריצה."""
+    rate = item.get_closest_marker("quarantined").args[0]
+    report.outcome = "skipped"
+    report.wasxfail = f"quarantined: flaky in {rate:.0%} of recent runs"
+    report.user_properties.append(("quarantined", round(rate, 2)))
+    log_info(f"🚧 {item.nodeid} בהסגר - הכישלון לא מכשיל את הריצה")
+
+
+def _merged_outcome(previous: str, report) -> str:
+    """התוצאה של בדיקה על פני כל השלבים והניסיונות: ניסיון שנכשל ואחריו ניסיון שעבר = flaky.
+    כישלון של בדיקה בהסגר (xfail) נשמר כ-failed."""
+    if report.outcome == "rerun":
+        return "rerun"
+    if report.failed or (report.skipped and hasattr(report, "wasxfail")):
+        return "failed"
+    if report.skipped:
+        return previous if previous == "failed" else "skipped"
+    if previous == "rerun" and report.when == "call":
+        return "flaky"
+    return previous
+
+
+def format_flaky_summary(config) -> str:
+    """בדיקות שעברו רק בריצה חוזרת, בדיקות שבהסגר, ומה השתנה בהסגר לריצה הבאה."""
+    lines = []
+    for nodeid, (outcome, _) in sorted(_test_timings.items()):
+        if nodeid in config.quarantine:
+            lines.append(f"🚧 {nodeid} - בהסגר ({config.quarantine[nodeid]:.0%} flaky), תוצאה: {outcome}")
+        elif outcome == "flaky":
+            lines.append(f"🔁 {nodeid} - עברה רק בריצה חוזרת (flaky)")
+    if _is_true(config.getoption("--quarantine")) and os.path.exists(perf_history.DB_PATH):
+        upcoming = perf_history.quarantined_tests(config.getoption("--flaky-threshold"))
+        lines.extend(f"➕ {nodeid} נכנסת להסגר ({rate:.0%} flaky)"
+                     for nodeid, rate in sorted(upcoming.items()) if nodeid not in config.quarantine)
+        lines.extend(f"➖ {nodeid} יוצאת מההסגר" for nodeid in sorted(config.quarantine) if nodeid not in upcoming)
+    return "\n".join(lines)
+
+
+# ===================== דוח זורם (NDJSON) =====================
+
+def _is_streamed(report) -> bool:
+    """רשומה לכל בדיקה: שלב ה-call, או setup/teardown שנכשלו או דילגו."""
+    return report.when == "call" or report.outcome != "passed"
+
+
+def _attach_log_excerpt(item, report):
+    lines, truncated = item.config.test_log_buffer.excerpt()
+    report.user_properties.append(("log_excerpt", lines))
+    if truncated:
+        # 💡 הלוג המלא נשמר כקובץ מקושר - לא מוטמע בדוח
+        attach_artifact(item, report, "log.txt", "\n".join(item.config.test_log_buffer.lines))
+
+
+def _attach_failure_artifacts(item, report):
+    """צילום מסך, page source ולוג הדפדפן של בדיקה שנכשלה - הכתיבה לדיסק ברקע."""
+    driver = item.funcargs.get("driver")
+    if driver is None:
+        return
+    for name, data in capture_failure(driver, since=getattr(item, "started_at", 0)):
+        attach_artifact(item, report, name, data, writer=_artifact_writer)
+    log_info(f"📎 artifacts של הכישלון ב-{item.nodeid} נשמרים ב-{get_run_dir()}")
+
+
+def attach_artifact(item, report, name: str, data, writer: ArtifactWriter = None):
+    """שומר artifact (צילום מסך, page source, לוג) כקובץ בתיקיית הריצה ומקשר אליו מהדוחות.
+    עם writer הקובץ נכתב ברקע (ונדחס אם שמו מסתיים ב-.gz), והקישור נוצר מיד."""
+    name_in_run = f"{item.nodeid}-{report.when}-{name}"
+    if writer is not None:
+        path = artifact_path(name_in_run)
+        writer.submit(path, data)
+    else:
+        path = save_artifact(name_in_run, data)
+    artifacts = next((value for key, value in report.user_properties if key == "artifacts"), None)
+    if artifacts is None:
+        artifacts = []
+        report.user_properties.append(("artifacts", artifacts))
+    artifacts.append({"name": name, "path": path})
+
+    html_path = getattr(item.config.option, "htmlpath", None)
+    if html_path:
+        try:
+            from pytest_html import extras
+        except ImportError:
+            return
+        link = os.path.relpath(os.path.join(get_run_dir(), path), os.path.dirname(os.path.abspath(html_path)))
+        report.extras = getattr(report, "extras", []) + [extras.url(link, name=name)]
+    return path
+
+
+# ===================== פרופיילר פעולות =====================
+
+def pytest_runtest_setup(item):
+    item.started_at = time.time()  # לוג הדפדפן ב-artifacts של כישלון מתחיל מכאן
+    item.discard_browser = False
+    profiler.set_current_test(item.nodeid)
+    if item.config.test_log_buffer:
+        item.config.test_log_buffer.reset()
+
+
+def _attach_action_profile(item, report):
+    stats = profiler.get_test_stats(item.nodeid)
+    if not stats:
+        return
+    report.user_properties.append(("action_profile", stats))
+    table = profiler.format_ranked_table(stats)
+    log_info(f"🔥 hot-path של {item.nodeid}:\n{table}")
+    _add_report_html(report, f"<pre>{html.escape(table)}</pre>")
+
+
+def _profile_output_path() -> str:
+    os.makedirs("reports", exist_ok=True)
+    run_id = os.environ.get("TEST_RUN_ID") or time.strftime("%Y%m%d_%H%M%S")
+    return os.path.join("reports", f"profile_{run_id}.folded")
+
+
+def pytest_runtest_logreport(report):
+    if _stream_reporter and _is_streamed(report):
+        _stream_reporter.write_result(report, report.user_properties)
+    _collect_perf_timings(report)
+    if report.when != "call":
+        return
+    for name, timings in report.user_properties:
+        if name == "navigation_timings":
+            for t in timings:
+                _navigation_by_page.setdefault(t["url"], []).append(t)
+
+
+def _collect_perf_timings(report):
+    """מצטבר לכל בדיקה: משך כל השלבים והניסיונות, תוצאה (כולל flaky), וזמני הפעולות (פרופיילר) והדפים שנטענו."""
+    nodeid = _history_nodeid(report.nodeid)
+    outcome, duration = _test_timings.get(nodeid, ("passed", 0.0))
+    _test_timings[nodeid] = (_merged_outcome(outcome, report), duration + report.duration)
+    if report.when != "call":
+        return
+    for name, value in report.user_properties:
+        if name == "action_profile":
+            _action_timings.extend((nodeid, action, entry["calls"], entry["total"])
+                                   for action, entry in value.items())
+        elif name == "navigation_timings":
+            _action_timings.extend((nodeid, f"navigate {urlsplit(t['url']).path or '/'}", 1, t["get_ms"] / 1000)
+                                   for t in value)
+
+
+def _perf_config(config) -> dict:
+    """התצורה שמשפיעה על זמנים - ריצות מושוות רק מול ריצות עם אותה תצורה."""
+    return {
+        "target": config.getoption("--target"),
+        "backend": config.getoption("--backend"),
+        "headless": _is_headless(config),
+        "page_load_strategy": config.getoption("--page-load-strategy"),
+        "block_requests": _is_true(config.getoption("--block-requests")),
+        "block_images": _is_true(config.getoption("--block-images")),
+        "workers": config.getoption("numprocesses", default=None) or 0,
+        "profile_actions": profiler.is_enabled(),
+    }
+
+
+def format_navigation_summary() -> str:
+    """טבלת דפים מסודרת מהאיטי למהיר, לפי ממוצע זמן ה-driver.get."""
+    lines = [f"{'page':<50}{'loads':>7}{'TTFB':>8}{'DCL':>8}{'load':>8}{'get':>8}"]
+
+    def avg(values):
+        values = [v for v in values if v is not None]
+        return f"{sum(values) / len(values):.0f}" if values else "-"
+
+    pages = sorted(_navigation_by_page.items(),
+                   key=lambda item: -sum(t["get_ms"] for t in item[1]) / len(item[1]))
+    for url, timings in pages:
+        lines.append(f"{url[-50:]:<50}{len(timings):>7}"
+                     f"{avg(t['ttfb_ms'] for t in timings):>8}"
+                     f"{avg(t['dom_content_loaded_ms'] for t in timings):>8}"
+                     f"{avg(t['load_ms'] for t in timings):>8}"
+                     f"{avg(t['get_ms'] for t in timings):>8}")
+    return "\n".join(lines)
+
+
+# ===================== דוח חיסכון בזמן המתנה =====================
+
+def pytest_sessionfinish(session, exitstatus):
+    if _artifact_writer:
+        _artifact_writer.close()
+    if _stream_reporter:
+        _stream_reporter.close(int(exitstatus))
+    if (not hasattr(session.config, "workerinput") and _test_timings
+            and _is_true(session.config.getoption("--perf-history"))):
+        run = perf_history.record_run(os.environ.get("TEST_RUN_ID"), _perf_config(session.config), _session_started,
+                                      int(exitstatus), _test_timings, _action_timings)
+        log_info(f"📈 זמני הריצה נשמרו בהיסטוריית הביצועים (ריצה #{run}, {perf_history.DB_PATH})")
+
+    # ב-worker של pytest-xdist: העברת הסטטיסטיקה לתהליך הראשי
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["wait_savings"] = get_wait_savings()
+        workeroutput["stale_retries"] = get_stale_retry_stats()
+        workeroutput["startup_times"] = chrome_startup.get_startup_times()
+        if profiler.is_enabled():
+            workeroutput["folded_stacks"] = profiler.get_folded_stacks()
+    elif profiler.is_enabled():
+        path = _profile_output_path()
+        profiler.write_folded_stacks(path)
+        log_info(f"🔥 קובץ flame graph נשמר ב: {path}")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    # בתהליך הראשי: איחוד הסטטיסטיקה מכל ה-workers
+    stats = getattr(node, "workeroutput", {}).get("wait_savings")
+    if stats:
+        merge_wait_savings(stats)
+    stale_retries = getattr(node, "workeroutput", {}).get("stale_retries")
+    if stale_retries:
+        merge_stale_retry_stats(stale_retries)
+    startup_times = getattr(node, "workeroutput", {}).get("startup_times")
+    if startup_times:
+        chrome_startup.merge_startup_times(startup_times)
+    folded = getattr(node, "workeroutput", {}).get("folded_stacks")
+    if folded:
+        profiler.merge_folded_stacks(folded)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if hasattr(terminalreporter.config, "workerinput") or terminalreporter.config.option.collectonly:
+        return
+    report = format_wait_savings_report()
+    terminalreporter.write_sep("=", "⏱️ זמן שנחסך לעומת time.sleep קבוע")
+    terminalreporter.write_line(report)
+    log_to_file(f"דוח חיסכון בהמתנות:\n{report}")
+
+    stale_report = format_stale_retry_report()
+    terminalreporter.write_sep("=", "🔁 שחזור אלמנטים stale")
+    terminalreporter.write_line(stale_report)
+    log_to_file(f"שחזור אלמנטים stale:\n{stale_report}")
+
+    startup_report = chrome_startup.format_startup_report()
+    terminalreporter.write_sep("=", "🚀 זמני הפעלת דפדפנים")
+    terminalreporter.write_line(startup_report)
+    log_to_file(f"זמני הפעלת דפדפנים:\n{startup_report}")
+
+    if _navigation_by_page:
+        strategy = terminalreporter.config.getoption("--page-load-strategy")
+        navigation = format_navigation_summary()
+        terminalreporter.write_sep("=", f"🌐 זמני טעינת דפים (ms, page load strategy: {strategy})")
+        terminalreporter.write_line(navigation)
+        log_to_file(f"זמני טעינת דפים:\n{navigation}")
 
+    flaky = format_flaky_summary(terminalreporter.config)
+    if flaky:
+        terminalreporter.write_sep("=", "🚧 בדיקות flaky והסגר")
+        terminalreporter.write_line(flaky)
+        log_to_file(f"בדיקות flaky והסגר:\n{flaky}")
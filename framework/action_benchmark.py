@@ -0,0 +1,144 @@
+import argparse
+import json
+import time
+from pathlib import Path
+from statistics import quantiles
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from . import actions, profiler
+
+# 💡 מיקרו-benchmark ל-helpers של ה-framework מול דף סטטי מקומי (file://, בלי רשת): כך שינוי ב-helper
+#    נמדד בנפרד מהאתר האמיתי. לכל helper: פעולות לשנייה, p50/p95 וכמה round trips של WebDriver עולה קריאה.
+
+BENCHMARK_PAGE = Path(__file__).with_name("benchmark_page.html").resolve().as_uri()
+TARGET = (By.ID, "target")
+
+
+def _fresh_target(driver: WebDriver):
+    """מחזיר את הכפתור עם locator (כמו שמחזיר wait_for_clickable), בלי מטמון."""
+    return actions.wait_for_clickable(driver, *TARGET, cache=False)
+
+
+def _stale_target(driver: WebDriver):
+    """מחזיר הפניה לכפתור ואז מחליף אותו ב-DOM - ההפניה נעשית stale."""
+    element = _fresh_target(driver)
+    driver.execute_script("window.rerenderTarget();")
+    return element
+
+
+# (שם, setup שמחזיר את הארגומנטים - לא נמדד, הפעולה הנמדדת)
+BENCHMARK_CASES = [
+    ("safe_click", lambda d: (_fresh_target(d),),
+     lambda d, el: actions.safe_click(d, el)),
+    ("wait_for_clickable (uncached)", lambda d: (),
+     lambda d: actions.wait_for_clickable(d, *TARGET, cache=False)),
+    ("wait_for_clickable (cached)", lambda d: (),
+     lambda d: actions.wait_for_clickable(d, *TARGET, cache=True)),
+    ("safe_find", lambda d: (),
+     lambda d: actions.safe_find(d, *TARGET)),
+    ("safe_find (missing)", lambda d: (),
+     lambda d: actions.safe_find(d, By.ID, "missing", timeout=0)),
+    ("remove_all_overlays (none)", lambda d: (),
+     lambda d: actions.remove_all_overlays(d, force=True)),
+    ("remove_all_overlays (5)", lambda d: d.execute_script("window.addOverlays(5);") or (),
+     lambda d: actions.remove_all_overlays(d, force=True)),
+    ("hover_over_element", lambda d: (_fresh_target(d),),
+     lambda d, el: actions.hover_over_element(d, el)),
+    ("retry_on_stale (fresh)", lambda d: (_fresh_target(d),),
+     lambda d, el: actions.retry_on_stale(actions.safe_click, d, el)),
+    ("retry_on_stale (stale)", lambda d: (_stale_target(d),),
+     lambda d, el: actions.retry_on_stale(actions.safe_click, d, el)),
+]
+
+
+def _run_case(driver: WebDriver, setup, operation, iterations: int) -> list:
+    """מריץ את הפעולה iterations פעמים ומחזיר את זמני הקריאות בשניות (setup לא נכלל)."""
+    timings = []
+    for _ in range(iterations):
+        args = setup(driver)
+        started = time.perf_counter()
+        operation(driver, *args)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _count_round_trips(driver: WebDriver, name: str, setup, operation, iterations: int) -> float:
+    """סופר פקודות WebDriver לקריאה דרך הפרופיילר - בריצה נפרדת, כדי שהספירה לא תשפיע על הזמנים.
+    ה-setup רץ מחוץ למסגרת ולכן לא נספר."""
+    profiler.set_current_test(f"benchmark:{name}")
+    total = 0
+    try:
+        for _ in range(iterations):
+            args = setup(driver)
+            with profiler.count_round_trips() as counter:
+                operation(driver, *args)
+            total += counter.round_trips
+    finally:
+        profiler.set_current_test("session")
+    return total / iterations
+
+
+def run_benchmarks(driver: WebDriver, iterations: int = 50, warmup: int = 5, cases=None) -> list:
+    """מריץ את כל ה-cases על דף ה-benchmark ומחזיר שורת תוצאה לכל אחד."""
+    results = []
+    for name, setup, operation in BENCHMARK_CASES:
+        if cases and name.split(" ")[0] not in cases:
+            continue
+        driver.get(BENCHMARK_PAGE)
+        _run_case(driver, setup, operation, warmup)
+        timings = _run_case(driver, setup, operation, iterations)
+        round_trips = _count_round_trips(driver, name, setup, operation, min(iterations, 10))
+        p50, p95 = (quantiles(timings, n=100)[i] for i in (49, 94)) if len(timings) > 1 else (timings[0],) * 2
+        results.append({
+            "name": name,
+            "calls": iterations,
+            "ops_per_sec": iterations / sum(timings),
+            "p50_ms": p50 * 1000,
+            "p95_ms": p95 * 1000,
+            "round_trips": round_trips,
+        })
+    return results
+
+
+def format_results(results: list) -> str:
+    lines = [f"{'helper':<32}{'calls':>7}{'ops/sec':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'round trips':>13}"]
+    for row in results:
+        lines.append(f"{row['name']:<32}{row['calls']:>7}{row['ops_per_sec']:>10.1f}{row['p50_ms']:>10.2f}"
+                     f"{row['p95_ms']:>10.2f}{row['round_trips']:>13.1f}")
+    return "\n".join(lines)
+
+
+def create_benchmark_driver() -> WebDriver:
+    """Chrome headless בלי גישה לרשת - הדף נטען מקובץ מקומי."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from .chrome_startup import resolve_binary_paths
+
+    paths = resolve_binary_paths()
+    options = webdriver.ChromeOptions()
+    if paths["browser_path"]:
+        options.binary_location = paths["browser_path"]
+    options.add_argument("--headless=new")
+    options.add_argument("--window-size=1280,900")
+    # 💡 כל שם מארח נכשל ברזולוציה - אין שום תעבורה החוצה שתשפיע על המדידה
+    options.add_argument("--host-resolver-rules=MAP * ~NOTFOUND")
+    return webdriver.Chrome(options=options, service=Service(executable_path=paths["driver_path"]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m framework.action_benchmark")
+    parser.add_argument("--iterations", type=int, default=50, help="קריאות נמדדות לכל helper")
+    parser.add_argument("--warmup", type=int, default=5, help="קריאות חימום שלא נמדדות")
+    parser.add_argument("--only", nargs="*", help="רק helpers אלה (למשל safe_click safe_find)")
+    parser.add_argument("--json", help="שמירת התוצאות לקובץ JSON (להשוואה בין commits)")
+    args = parser.parse_args()
+
+    driver = create_benchmark_driver()
+    try:
+        results = run_benchmarks(driver, args.iterations, args.warmup, args.only)
+    finally:
+        driver.quit()
+    print(format_results(results))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
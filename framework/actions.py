@@ -2,44 +2,72 @@ import time
 import random
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException, \
-    StaleElementReferenceException
+    StaleElementReferenceException, ElementClickInterceptedException
 from selenium.webdriver.common.action_chains import ActionChains
-from typing import Union
-from .logger import log_info, log_warning, log_error, log_success
-
-DEFAULT_TIMEOUT = 10
+from typing import Union, NamedTuple, List
+from . import locators
+from .http_backend import HttpBrowser
+from .logger import log_info, log_warning, log_error, log_success, log_debug
+from .network import is_request_blocking_enabled
+from .profiler import profiled
+from .wait_manager import DEFAULT_TIMEOUT, get_wait
 
 
 # ===================== Core Selenium Actions =====================
 
+@profiled
 def safe_click(driver: WebDriver, element: WebElement):
     """מבצע לחיצה בטוחה לאחר גלילה והמתנה ללחיצות."""
     try:
         driver.execute_script("arguments[0].scrollIntoView({block:'center'});", element)
-        WebDriverWait(driver, 5).until(EC.element_to_be_clickable(element))
-        element.click()
+        get_wait(driver).until(EC.element_to_be_clickable(element), action="safe_click")
+        try:
+            element.click()
+        except ElementClickInterceptedException:
+            # 💡 fallback: משהו מכסה את האלמנט למרות חסימת הרשת - מסירים overlays ומנסים שוב
+            log_warning("הלחיצה נחסמה על ידי אלמנט אחר, מסיר overlays ומנסה שוב")
+            remove_all_overlays(driver, force=True)
+            element.click()
         log_success("לחיצה בוצעה בהצלחה")
     except Exception as e:
         log_error(f"שגיאה ב-safe_click: {e}")
         raise
 
 
-def wait_for_clickable(driver: WebDriver, by_type: str, locator: str, timeout: int = DEFAULT_TIMEOUT) -> WebElement:
-    """ממתין עד שאלמנט יהיה לחיץ, ומחזיר אותו."""
+@profiled
+def wait_for_clickable(driver: WebDriver, by_type: str, locator: str, timeout: float = None,
+                       poll: float = None, cache: bool = True) -> WebElement:
+    """ממתין עד שאלמנט יהיה לחיץ, ומחזיר אותו.
+    כש-cache פעיל, אלמנט שכבר נמצא בעמוד הנוכחי נבדק ישירות בלי חיפוש חוזר ב-DOM."""
+    key = (by_type, locator)
+    wait = get_wait(driver)
     try:
-        element = WebDriverWait(driver, timeout).until(
-            EC.element_to_be_clickable((by_type, locator))
+        cached = locators.get_cached(driver, key) if cache else None
+        if cached is not None:
+            try:
+                return wait.until(EC.element_to_be_clickable(cached), action="wait_for_clickable",
+                                  timeout=timeout, poll=poll)
+            except StaleElementReferenceException:
+                locators.forget(driver, key)
+
+        element = wait.until(
+            EC.element_to_be_clickable(key),
+            action="wait_for_clickable", timeout=timeout, poll=poll
         )
+        if cache:
+            locators.remember(driver, key, element)
+        else:
+            locators.track(element, key)  # 💡 כדי ש-retry_on_stale יוכל לאתר אותו מחדש
         return element
     except Exception as e:
         log_error(f"לא ניתן למצוא אלמנט לחיץ: {locator}")
         raise
 
 
+@profiled
 def hover_over_element(driver: WebDriver, element: WebElement):
     """מבצע ריחוף עכבר מעל אלמנט."""
     try:
@@ -50,8 +78,13 @@ def hover_over_element(driver: WebDriver, element: WebElement):
         raise
 
 
-def remove_all_overlays(driver: WebDriver):
-    """מנסה להסיר מודאלים ו-overlays מהדף באמצעות JS (כולל פרסומות ו-iframes)."""
+@profiled
+def remove_all_overlays(driver: WebDriver, force: bool = False):
+    """מנסה להסיר מודאלים ו-overlays מהדף באמצעות JS (כולל פרסומות ו-iframes).
+    כשחסימת הרשת פעילה הפרסומות לא נטענות כלל, ולכן מדלגים (אלא אם force=True)."""
+    if not force and is_request_blocking_enabled(driver):
+        log_debug("חסימת רשת פעילה - דילוג על הסרת overlays")
+        return
     try:
         # 💡 לוגיקה משופרת להסרת פרסומות ואלמנטים קופצים שאינם מנוקים
         js = """
@@ -72,20 +105,72 @@ def remove_all_overlays(driver: WebDriver):
 
 # ===================== Generic Find Helpers =====================
 
-def safe_find(driver: WebDriver, by: str, value: str, timeout: int = DEFAULT_TIMEOUT) -> Union[WebElement, None]:
+@profiled
+def safe_find(driver: WebDriver, by: str, value: str, timeout: float = None,
+              poll: float = None) -> Union[WebElement, None]:
     """מחפש אלמנט בבטחה ומחזיר None אם לא נמצא."""
     try:
-        return WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((by, value))
+        element = get_wait(driver).until(
+            EC.presence_of_element_located((by, value)),
+            action="safe_find", timeout=timeout, poll=poll
         )
     except:
         return None
+    locators.track(element, (by, value))
+    return element
+
+
+class ElementRecord(NamedTuple):
+    """תמונת מצב קומפקטית של אלמנט, כפי שנאספה ב-inspect_elements."""
+    text: str
+    value: Union[str, None]
+    href: Union[str, None]
+    displayed: bool
+    enabled: bool
+
+
+_INSPECT_ELEMENTS_JS = """
+const [by, selector, root] = arguments;
+const scope = root || document;
+let nodes = [];
+if (by === 'xpath') {
+    const result = document.evaluate(selector, scope, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+} else {
+    nodes = Array.from(scope.querySelectorAll(selector));
+}
+return nodes.map(el => {
+    const displayed = el.checkVisibility
+        ? el.checkVisibility({checkOpacity: true, checkVisibilityCSS: true})
+        : !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    return [
+        el.innerText || '',
+        el.getAttribute('value'),
+        el.getAttribute('href') === null ? null : el.href,
+        displayed,
+        !el.disabled
+    ];
+});
+"""
+
+
+def inspect_elements(driver: WebDriver, by: str, value: str, root: WebElement = None) -> List[ElementRecord]:
+    """אוסף text/value/href/גלוי/פעיל לכל האלמנטים התואמים בקריאת execute_script אחת (XPath או CSS)."""
+    if by not in (By.XPATH, By.CSS_SELECTOR):
+        raise ValueError(f"inspect_elements תומך רק ב-XPath או CSS, התקבל: {by}")
+    if isinstance(driver, HttpBrowser):
+        # 💡 backend בלי JS: אותן רשומות, מה-HTML שכבר נטען
+        return [ElementRecord(el.text, el.get_attribute("value"), el.get_attribute("href"),
+                              el.is_displayed(), el.is_enabled())
+                for el in (root or driver).find_elements(by, value)]
+    rows = driver.execute_script(_INSPECT_ELEMENTS_JS, by, value, root)
+    return [ElementRecord(*row) for row in rows]
 
 
 def scroll_click(driver: WebDriver, el: WebElement):
     """גולל למיקום האלמנט ולוחץ עליו."""
     driver.execute_script("arguments[0].scrollIntoView(true);", el)
-    time.sleep(0.3)
+    wait_for_scroll_settled(driver, el, legacy_sleep=0.3)
     el.click()
 
 
@@ -98,17 +183,278 @@ def close_popup(driver: WebDriver):
         pass
 
 
+# ===================== Condition-based Waits =====================
+# המתנות מבוססות תנאי במקום time.sleep קבוע.
+# כל helper מקבל legacy_sleep - משך ה-sleep הישן שהוא מחליף - כדי שנוכל לדווח בסוף הריצה כמה זמן נחסך.
+
+_wait_savings = {}
+
+
+def _record_wait(label: str, legacy_sleep: float, started: float):
+    """רושם את זמן ההמתנה בפועל מול ה-sleep הקבוע שהוחלף."""
+    if not legacy_sleep:
+        return
+    entry = _wait_savings.setdefault(label, {"calls": 0, "legacy": 0.0, "actual": 0.0})
+    entry["calls"] += 1
+    entry["legacy"] += legacy_sleep
+    entry["actual"] += time.perf_counter() - started
+
+
+def get_wait_savings() -> dict:
+    """מחזיר עותק של סטטיסטיקת החיסכון לפי סוג המתנה."""
+    return {label: dict(entry) for label, entry in _wait_savings.items()}
+
+
+def merge_wait_savings(stats: dict):
+    """ממזג סטטיסטיקה שהגיעה מ-worker אחר (pytest-xdist)."""
+    for label, entry in stats.items():
+        target = _wait_savings.setdefault(label, {"calls": 0, "legacy": 0.0, "actual": 0.0})
+        for key in target:
+            target[key] += entry.get(key, 0)
+
+
+def format_wait_savings_report() -> str:
+    """בונה טבלת סיכום של הזמן שנחסך לעומת ה-sleeps הישנים."""
+    if not _wait_savings:
+        return "לא נרשמו המתנות מבוססות תנאי בריצה זו."
+    lines = [f"{'wait':<24}{'calls':>7}{'legacy (s)':>12}{'actual (s)':>12}{'saved (s)':>11}"]
+    total_legacy = total_actual = 0.0
+    for label, entry in sorted(_wait_savings.items()):
+        saved = entry["legacy"] - entry["actual"]
+        total_legacy += entry["legacy"]
+        total_actual += entry["actual"]
+        lines.append(f"{label:<24}{entry['calls']:>7}{entry['legacy']:>12.2f}{entry['actual']:>12.2f}{saved:>11.2f}")
+    lines.append(f"{'TOTAL':<24}{'':>7}{total_legacy:>12.2f}{total_actual:>12.2f}{total_legacy - total_actual:>11.2f}")
+    return "\n".join(lines)
+
+
+def _document_ready(driver: WebDriver) -> bool:
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def wait_for_navigation(driver: WebDriver, anchor: WebElement = None, url_contains: str = None,
+                        timeout: float = None, legacy_sleep: float = 0):
+    """ממתין לסיום ניווט: האלמנט הישן (anchor) נעשה stale, ה-URL תואם וה-DOM נטען במלואו."""
+    started = time.perf_counter()
+    wait = get_wait(driver)
+    locators.invalidate(driver)
+    try:
+        if anchor is not None:
+            wait.until(EC.staleness_of(anchor), action="wait_for_navigation", timeout=timeout)
+        if url_contains:
+            wait.until(EC.url_contains(url_contains), action="wait_for_navigation", timeout=timeout)
+        wait.until(_document_ready, action="wait_for_navigation", timeout=timeout)
+    except TimeoutException:
+        log_warning(f"Timeout בהמתנה לניווט (url_contains={url_contains})")
+        raise
+    finally:
+        _record_wait("navigation", legacy_sleep, started)
+
+
+def wait_for_modal_visible(driver: WebDriver, locator: tuple = (By.CSS_SELECTOR, ".modal-content"),
+                           timeout: float = None, legacy_sleep: float = 0) -> WebElement:
+    """ממתין עד שחלון מודאל (למשל popup של הוספה לעגלה) יהיה גלוי, ומחזיר אותו."""
+    started = time.perf_counter()
+    try:
+        return get_wait(driver).until(
+            EC.visibility_of_element_located(locator), action="wait_for_modal_visible", timeout=timeout
+        )
+    except TimeoutException:
+        log_warning(f"Timeout בהמתנה למודאל: {locator[1]}")
+        raise
+    finally:
+        _record_wait("modal visible", legacy_sleep, started)
+
+
+def wait_for_scroll_settled(driver: WebDriver, element: WebElement = None, timeout: float = None,
+                            legacy_sleep: float = 0):
+    """ממתין שהגלילה תתייצב - מיקום הדף (והאלמנט, אם נמסר) זהה בשתי דגימות רצופות."""
+    started = time.perf_counter()
+    js = """
+    const el = arguments[0];
+    return [window.scrollX, window.scrollY, el ? el.getBoundingClientRect().top : 0];
+    """
+    last = {"position": None}
+
+    def settled(d):
+        position = d.execute_script(js, element)
+        is_settled = position == last["position"]
+        last["position"] = position
+        return is_settled
+
+    try:
+        # 💡 poll קבוע: "התייצבות" מוגדרת כשתי דגימות זהות במרווח קצר
+        get_wait(driver).until(settled, action="wait_for_scroll_settled", timeout=timeout, poll=0.05)
+    except TimeoutException:
+        log_warning("Timeout בהמתנה להתייצבות הגלילה")
+        raise
+    finally:
+        _record_wait("scroll settled", legacy_sleep, started)
+
+
+def wait_for_network_idle(driver: WebDriver, idle_time: float = 0.5, timeout: float = None,
+                          legacy_sleep: float = 0):
+    """ממתין שהדף יטען, שאין בקשות jQuery פעילות ושלא נוספו משאבי רשת במשך idle_time שניות."""
+    started = time.perf_counter()
+    js = """
+    const pending = (window.jQuery && window.jQuery.active) || 0;
+    return [document.readyState, pending, performance.getEntriesByType('resource').length];
+    """
+    last = {"resources": None, "since": None}
+
+    def idle(d):
+        ready_state, pending, resources = d.execute_script(js)
+        now = time.perf_counter()
+        if ready_state != "complete" or pending or resources != last["resources"]:
+            last["resources"], last["since"] = resources, now
+            return False
+        return now - last["since"] >= idle_time
+
+    try:
+        get_wait(driver).until(idle, action="wait_for_network_idle", timeout=timeout)
+    except TimeoutException:
+        log_warning("Timeout בהמתנה ל-network idle")
+        raise
+    finally:
+        _record_wait("network idle", legacy_sleep, started)
+
+
+# ===================== Navigation =====================
+
+_NAVIGATION_TIMING_JS = """
+const [nav] = performance.getEntriesByType('navigation');
+return nav ? [nav.responseStart, nav.domContentLoadedEventEnd, nav.loadEventEnd] : null;
+"""
+
+_navigation_timings = []
+
+
+@profiled
+def navigate(driver: WebDriver, url: str, timeout: float = None) -> dict:
+    """driver.get עם המתנה מפורשת ל-DOM (מתאים גם ל-page load strategy מסוג eager/none),
+    ורישום Navigation Timing של הדף: TTFB, DOMContentLoaded ו-load (None אם עוד לא הסתיים)."""
+    started = time.perf_counter()
+    wait = get_wait(driver)
+    locators.invalidate(driver)
+
+    if isinstance(driver, HttpBrowser):
+        # ב-backend מסוג http אין DOM חי לחכות לו - התזמון נמדד על בקשת ה-HTTP עצמה
+        driver.get(url)
+        record = {"url": url, "get_ms": round((time.perf_counter() - started) * 1000),
+                  "ttfb_ms": driver.last_timing["ttfb_ms"], "dom_content_loaded_ms": None,
+                  "load_ms": driver.last_timing["load_ms"]}
+        _navigation_timings.append(record)
+        log_debug(f"🌐 {url} (http): TTFB {record['ttfb_ms']}ms | load {record['load_ms']}ms")
+        return record
+
+    if driver.capabilities.get("pageLoadStrategy") == "none":
+        # ב-none ה-get חוזר מיד - מוודאים שהמסמך הוחלף לפני שבודקים readyState
+        previous_origin = driver.execute_script("return performance.timeOrigin")
+        driver.get(url)
+        wait.until(lambda d: d.execute_script("return performance.timeOrigin") != previous_origin,
+                   action="navigate", timeout=timeout)
+    else:
+        driver.get(url)
+    wait.until(lambda d: d.execute_script("return document.readyState") != "loading",
+               action="navigate", timeout=timeout)
+
+    ttfb, dom_content_loaded, load = driver.execute_script(_NAVIGATION_TIMING_JS) or (None, None, None)
+    record = {
+        "url": url,
+        "get_ms": round((time.perf_counter() - started) * 1000),
+        "ttfb_ms": round(ttfb) if ttfb else None,
+        "dom_content_loaded_ms": round(dom_content_loaded) if dom_content_loaded else None,
+        "load_ms": round(load) if load else None,
+    }
+    _navigation_timings.append(record)
+    log_debug(f"🌐 {url}: TTFB {record['ttfb_ms']}ms | DCL {record['dom_content_loaded_ms']}ms | "
+              f"load {record['load_ms']}ms | get {record['get_ms']}ms")
+    return record
+
+
+def pop_navigation_timings() -> list:
+    """מחזיר ומנקה את ה-Navigation Timing שנאספו מאז הקריאה הקודמת."""
+    timings = list(_navigation_timings)
+    _navigation_timings.clear()
+    return timings
+
+
 # ===================== Retry Utility =====================
 
-def retry_on_stale(func, *args, retries=3, delay=0.5, **kwargs):
-    """Retry פונקציה במקרה של StaleElementReferenceException"""
+# 💡 אלמנט stale לא יחזור להיות תקין - לכן ה-locator של אלמנטים שנמצאו דרך wait_for_clickable / safe_find
+#    נרשם במטמון (locators.locator_of), ו-retry_on_stale מאתר אותם מחדש מיד במקום לחכות.
+
+# {שם הפונקציה: {"calls", "stale", "relocated", "failed"}}
+_stale_stats = {}
+
+
+def _relocate(driver: WebDriver, element: WebElement) -> WebElement:
+    """מאתר מחדש אלמנט לפי ה-locator שדרכו נמצא."""
+    locator = locators.locator_of(element)
+    locators.forget(driver, locator)
+    fresh = get_wait(driver).until(EC.presence_of_element_located(locator), action="relocate")
+    locators.track(fresh, locator)
+    return fresh
+
+
+@profiled
+def retry_on_stale(func, *args, retries=3, delay=0.05, max_delay=0.5, **kwargs):
+    """Retry פונקציה במקרה של StaleElementReferenceException.
+    אלמנטים שה-locator שלהם רשום מאותרים מחדש מיד; אחרת ממתינים delay שגדל פי 2 בכל ניסיון (עד max_delay)."""
+    if retries < 1:
+        raise ValueError(f"retries חייב להיות לפחות 1 (התקבל {retries})")
+    name = getattr(func, "__name__", repr(func))
+    stats = _stale_stats.setdefault(name, {"calls": 0, "stale": 0, "relocated": 0, "failed": 0})
+    stats["calls"] += 1
+    driver = next((arg for arg in args if isinstance(arg, WebDriver)), None)
+    args = list(args)
+
     for attempt in range(retries):
         try:
             return func(*args, **kwargs)
         except StaleElementReferenceException:
-            log_warning(f"StaleElementReferenceException, ניסיון {attempt + 1}/{retries}")
-            time.sleep(delay)
-    raise
+            stats["stale"] += 1
+            if attempt == retries - 1:
+                stats["failed"] += 1
+                log_error(f"StaleElementReferenceException ב-{name} גם אחרי {retries} ניסיונות")
+                raise
+
+            stale_indexes = [i for i, arg in enumerate(args)
+                             if isinstance(arg, WebElement) and locators.locator_of(arg)]
+            if driver is not None and stale_indexes:
+                for i in stale_indexes:
+                    args[i] = _relocate(driver, args[i])
+                stats["relocated"] += 1
+                log_warning(f"StaleElementReferenceException ב-{name}, האלמנט אותר מחדש "
+                            f"(ניסיון {attempt + 1}/{retries})")
+            else:
+                backoff = min(delay * 2 ** attempt, max_delay)
+                log_warning(f"StaleElementReferenceException ב-{name}, ניסיון {attempt + 1}/{retries} "
+                            f"(המתנה {backoff:.2f}s)")
+                time.sleep(backoff)
+
+
+def get_stale_retry_stats() -> dict:
+    return {name: dict(entry) for name, entry in _stale_stats.items()}
+
+
+def merge_stale_retry_stats(stats: dict):
+    """ממזג סטטיסטיקה שהגיעה מ-worker אחר (pytest-xdist)."""
+    for name, entry in stats.items():
+        target = _stale_stats.setdefault(name, {"calls": 0, "stale": 0, "relocated": 0, "failed": 0})
+        for key in target:
+            target[key] += entry.get(key, 0)
+
+
+def format_stale_retry_report() -> str:
+    """טבלת סיכום של ה-StaleElementReferenceException שטופלו לפי פונקציה."""
+    if not any(entry["stale"] for entry in _stale_stats.values()):
+        return "לא היו StaleElementReferenceException בריצה זו."
+    lines = [f"{'function':<24}{'calls':>7}{'stale':>7}{'relocated':>11}{'failed':>8}"]
+    for name, entry in sorted(_stale_stats.items()):
+        if entry["stale"]:
+            lines.append(f"{name:<24}{entry['calls']:>7}{entry['stale']:>7}{entry['relocated']:>11}{entry['failed']:>8}")
+    return "\n".join(lines)
 
 
 # ===================== logout if logged in Utility =====================
@@ -118,5 +464,5 @@ def logout_if_logged_in(driver):
     logout_link = safe_find(driver, By.LINK_TEXT, "Logout")
     if logout_link:
         safe_click(driver, logout_link)
+        wait_for_navigation(driver, anchor=logout_link, legacy_sleep=1)
         log_info("Logged out user")
-        time.sleep(1)
@@ -0,0 +1,27 @@
+# 💡 backends לפי סדר עלות (זיכרון וזמן הפעלה), מהזול ליקר. בדיקה מצהירה על היכולות שהיא צריכה
+#    (@pytest.mark.capabilities("dom")) ומקבלת את ה-backend הזול ביותר שמספק אותן.
+#    dom - קריאת HTML בלבד | js - execute_script | interaction - לחיצות, ריחוף והקלדה | headed - חלון גלוי
+BACKENDS = {
+    "http": {"dom"},
+    "headless-shell": {"dom", "js", "interaction"},
+    "chrome": {"dom", "js", "interaction", "headed"},
+}
+
+# בדיקה בלי marker נחשבת לבדיקת דפדפן מלאה
+DEFAULT_CAPABILITIES = ("dom", "js", "interaction")
+
+
+def select_backend(required, requested: str = "auto", available=tuple(BACKENDS)) -> str:
+    """בוחר backend: הזול ביותר מבין הזמינים שמספק את כל היכולות, או זה שנדרש במפורש.
+    זורק ValueError אם אין backend מתאים."""
+    required = set(required)
+    unknown = required - set().union(*BACKENDS.values())
+    if unknown:
+        raise ValueError(f"יכולות לא מוכרות: {', '.join(sorted(unknown))}")
+
+    candidates = list(BACKENDS) if requested == "auto" else [requested]
+    for name in candidates:
+        if name in available and required <= BACKENDS[name]:
+            return name
+    missing = sorted(required - BACKENDS.get(requested, set())) if requested != "auto" else sorted(required)
+    raise ValueError(f"אין backend זמין ({requested}) עם היכולות: {', '.join(missing)}")
@@ -0,0 +1,145 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from selenium.webdriver.remote.webdriver import WebDriver
+from .logger import log_info, log_warning, log_error
+
+DEFAULT_POOL_SIZE = 1
+LEASE_TIMEOUT = 120
+DEFAULT_ORIGINS = ("https://automationexercise.com",)
+_REPLACE_FAILED = object()  # מעיר את מי שממתין ב-acquire אחרי שהפעלת דפדפן מחליף נכשלה
+
+
+# ===================== Browser State Reset =====================
+
+def reset_browser_state(driver: WebDriver, origins: tuple = DEFAULT_ORIGINS, keep_cookies: tuple = ()):
+    """מנקה cookies, storage וחלונות נוספים - במקום להפעיל דפדפן חדש.
+    cookies ששמם ב-keep_cookies (למשל הסכמה לפרסומות מפרופיל התבנית) משוחזרים אחרי הניקוי."""
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+    # sessionStorage שייך לטאב ולכן מנוקה מתוך הדף הנוכחי
+    driver.execute_script(
+        "if (location.protocol.startsWith('http')) { localStorage.clear(); sessionStorage.clear(); }"
+    )
+    kept = []
+    if keep_cookies:
+        kept = [{key: value for key, value in cookie.items() if key not in ("size", "session")}
+                for cookie in driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+                if cookie["name"] in keep_cookies]
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    if kept:
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": kept})
+    for origin in origins:
+        driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+            "origin": origin,
+            "storageTypes": "local_storage,indexeddb,service_workers,cache_storage",
+        })
+    driver.get("about:blank")
+
+
+# ===================== Browser Pool =====================
+
+class BrowserPool:
+    """מאגר דפדפנים מחוממים מראש לכל worker. בדיקות שוכרות (lease) דפדפן ומחזירות אותו בסיום."""
+
+    def __init__(self, factory: Callable[[], WebDriver], size: int = DEFAULT_POOL_SIZE,
+                 reset: Callable[[WebDriver], None] = reset_browser_state):
+        self.factory = factory
+        self.size = max(1, size)
+        self.reset = reset
+        self._idle = queue.Queue()
+        self._all = []
+        self._lock = threading.Lock()
+        self._replacer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="browser-pool")
+        self._pending = 0
+        self._failure = None
+
+    def warm_up(self):
+        """מפעיל את כל הדפדפנים במקביל כדי שהבדיקה הראשונה לא תחכה להפעלה קרה."""
+        log_info(f"🔥 מחמם {self.size} דפדפנים במאגר...")
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            for driver in executor.map(lambda _: self.factory(), range(self.size)):
+                self._add(driver)
+
+    def _add(self, driver: WebDriver):
+        with self._lock:
+            self._all.append(driver)
+        self._idle.put(driver)
+
+    def _replace(self, driver: WebDriver):
+        """מוציא דפדפן תקול מהמאגר ומפעיל מחליף ברקע."""
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._lock:
+            self._pending += 1
+        self._replacer.submit(lambda: self._add(self.factory())).add_done_callback(self._replaced)
+
+    def _replaced(self, future):
+        """נקרא בסיום הפעלת המחליף. כישלון נרשם ומעיר את acquire, כדי שלא ימתין LEASE_TIMEOUT לדפדפן שלא יגיע."""
+        error = None if future.cancelled() else future.exception()
+        with self._lock:
+            self._pending -= 1
+            if error is not None:
+                self._failure = error
+        if error is not None:
+            log_error(f"הפעלת דפדפן מחליף למאגר נכשלה: {error}")
+            self._idle.put(_REPLACE_FAILED)
+
+    def _check_alive(self):
+        """זורק את שגיאת ההפעלה האחרונה כשאין במאגר דפדפן חי ואין מחליף בדרך."""
+        with self._lock:
+            if self._all or self._pending or self._failure is None:
+                return
+            failure = self._failure
+        log_error("אין דפדפנים חיים במאגר - הפעלת הדפדפן המחליף נכשלה")
+        raise failure
+
+    def acquire(self, reset: bool = True) -> WebDriver:
+        """שוכר דפדפן פנוי מהמאגר. עם reset=True ה-state של הבדיקה הקודמת מנוקה."""
+        while True:
+            if self._idle.empty():
+                self._check_alive()
+            try:
+                driver = self._idle.get(timeout=LEASE_TIMEOUT)
+            except queue.Empty:
+                log_error(f"לא התפנה דפדפן במאגר תוך {LEASE_TIMEOUT} שניות")
+                raise
+            if driver is _REPLACE_FAILED:
+                continue
+            if not reset:
+                return driver
+            try:
+                self.reset(driver)
+                return driver
+            except Exception as e:
+                log_warning(f"איפוס הדפדפן נכשל, מחליף אותו בדפדפן חדש: {e}")
+                self._replace(driver)
+
+    def release(self, driver: WebDriver):
+        """מחזיר דפדפן למאגר."""
+        self._idle.put(driver)
+
+    def discard(self, driver: WebDriver):
+        """מחזיר דפדפן שה-state שלו לא אמין (למשל אחרי בדיקה שנכשלה) - הוא נסגר ומוחלף בחדש ברקע."""
+        self._replace(driver)
+
+    def close(self):
+        """סוגר את כל הדפדפנים במאגר."""
+        self._replacer.shutdown(wait=True)
+        with self._lock:
+            drivers, self._all = self._all, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                log_warning(f"שגיאה בסגירת דפדפן: {e}")
@@ -0,0 +1,181 @@
+import json
+import re
+from typing import NamedTuple
+from .actions import navigate
+from .http_backend import HttpBrowser
+from .locators import CartPage, ProductDetailsPage, ProductsPage
+from .logger import log_info
+
+# 💡 מטריצת המוצרים לבדיקות מונחות-נתונים: מקובץ JSON, או מסריקה אחת של /products (בקשת HTTP אחת,
+#    בלי דפדפן) כדי לכסות את כל הקטלוג בלי לעדכן את הקובץ.
+#    תמונות מצב של הקטלוג והעגלה נקראות בקריאת script אחת כל אחת, ובדיקת מחירים היא diff ביניהן -
+#    בלי XPath לכל מוצר (ששובר על שמות עם גרשיים).
+
+
+class Product(NamedTuple):
+    id: int
+    name: str
+    price: str
+    category: str = ""
+
+    @property
+    def slug(self) -> str:
+        """מזהה קריא לפרמטר של pytest, למשל 1-Blue_Top."""
+        name = re.sub(r"\W+", "_", self.name).strip("_")
+        return f"{self.id}-{name}"
+
+
+def load_product_matrix(path: str) -> list:
+    """טוען את המוצרים מקובץ JSON: [{"id", "name", "price", "category"}]."""
+    with open(path, encoding="utf-8") as f:
+        return [Product(int(p["id"]), p["name"], p["price"], p.get("category", "")) for p in json.load(f)]
+
+
+def scrape_product_matrix(base_url: str) -> list:
+    """כל המוצרים שבעמוד /products, מבקשת HTTP אחת (בלי קטגוריה - היא לא מופיעה בכרטיס)."""
+    browser = HttpBrowser()
+    try:
+        return list(snapshot_catalogue(browser, base_url, with_categories=False))
+    finally:
+        browser.quit()
+
+
+# ===================== Page Snapshots =====================
+
+class CartLine(NamedTuple):
+    id: int
+    name: str
+    price: str
+    quantity: int
+    total: str
+
+
+class Catalogue:
+    """תמונת מצב של הקטלוג, עם אינדקס לפי id ולפי שם."""
+
+    def __init__(self, products, with_categories: bool = False):
+        self.with_categories = with_categories
+        self.by_id = {product.id: product for product in products}
+        self.by_name = {product.name: product for product in products}
+
+    def __getitem__(self, product_id: int) -> Product:
+        return self.by_id[product_id]
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def __len__(self):
+        return len(self.by_id)
+
+
+_CATALOGUE_JS = """
+const [cards, nameSel, priceSel, addSel, infoSel, withCategories, done] = arguments;
+const products = [];
+for (const card of document.querySelectorAll(cards)) {
+    const add = card.querySelector(addSel);
+    if (!add) continue;
+    products.push({id: Number(add.dataset.productId), name: card.querySelector(nameSel).textContent.trim(),
+                   price: card.querySelector(priceSel).textContent.trim(), category: ''});
+}
+if (!withCategories) { done(products); return; }
+// הקטגוריה מופיעה רק בעמוד המוצר - כל העמודים נטענים במקביל בתוך אותה קריאה
+Promise.all(products.map(p => fetch('/product_details/' + p.id, {credentials: 'same-origin'})
+    .then(r => r.text())
+    .then(html => {
+        const doc = new DOMParser().parseFromString(html, 'text/html');
+        const line = Array.from(doc.querySelectorAll(infoSel)).find(el => el.textContent.includes('Category:'));
+        p.category = line ? line.textContent.replace('Category:', '').trim() : '';
+    })))
+    .then(() => done(products), err => done(String(err)));
+"""
+
+_CART_JS = """
+const [rows, nameSel, priceSel, quantitySel, totalSel] = arguments;
+const text = (row, selector) => { const el = row.querySelector(selector); return el ? el.textContent.trim() : ''; };
+return Array.from(document.querySelectorAll(rows)).map(row => [
+    Number(row.id.replace('product-', '')), text(row, nameSel), text(row, priceSel),
+    Number(text(row, quantitySel)) || 0, text(row, totalSel)
+]);
+"""
+
+# {base_url: Catalogue} - הקטלוג נקרא פעם אחת לכל ריצה
+_catalogues = {}
+
+
+def _category_from_details(driver: HttpBrowser, base_url: str, product_id: int) -> str:
+    driver.get(f"{base_url}/product_details/{product_id}")
+    lines = [el.text for el in driver.find_elements(*ProductDetailsPage.INFO_LINES) if "Category:" in el.text]
+    return lines[0].replace("Category:", "").strip() if lines else ""
+
+
+def snapshot_catalogue(driver, base_url: str, with_categories: bool = True) -> Catalogue:
+    """id, שם, מחיר וקטגוריה של כל המוצרים ב-/products, בקריאת script אחת (הקטגוריות נטענות
+    באותה קריאה מעמודי המוצרים, במקביל). ב-backend ה-http - מה-HTML שנטען."""
+    navigate(driver, f"{base_url}/products")
+    if isinstance(driver, HttpBrowser):
+        products = []
+        for card in driver.find_elements(*ProductsPage.CARDS):
+            add_button = card.find_elements(*ProductsPage.CARD_ADD_TO_CART)
+            if add_button:
+                products.append(Product(int(add_button[0].get_attribute("data-product-id")),
+                                        card.find_element(*ProductsPage.CARD_NAME).text,
+                                        card.find_element(*ProductsPage.CARD_PRICE).text))
+        if with_categories:
+            products = [p._replace(category=_category_from_details(driver, base_url, p.id)) for p in products]
+    else:
+        rows = driver.execute_async_script(
+            _CATALOGUE_JS, ProductsPage.CARDS.value, ProductsPage.CARD_NAME.value, ProductsPage.CARD_PRICE.value,
+            ProductsPage.CARD_ADD_TO_CART.value, ProductDetailsPage.INFO_LINES.value, with_categories)
+        if not isinstance(rows, list):
+            raise RuntimeError(f"קריאת הקטלוג נכשלה: {rows}")
+        products = [Product(row["id"], row["name"], row["price"], row["category"]) for row in rows]
+
+    catalogue = Catalogue(products, with_categories)
+    log_info(f"🛍️ תמונת מצב של הקטלוג: {len(catalogue)} מוצרים")
+    return catalogue
+
+
+def get_catalogue(driver, base_url: str, refresh: bool = False, with_categories: bool = False) -> Catalogue:
+    """הקטלוג של האתר מהזיכרון; נקרא מהדף רק בפעם הראשונה בריצה (או עם refresh).
+    הקטגוריות דורשות טעינה של כל עמודי המוצרים - הן נטענות רק כשמבקשים with_categories."""
+    cached = _catalogues.get(base_url)
+    if refresh or cached is None or (with_categories and not cached.with_categories):
+        _catalogues[base_url] = snapshot_catalogue(driver, base_url, with_categories)
+    return _catalogues[base_url]
+
+
+def snapshot_cart(driver) -> dict:
+    """כל שורות העגלה בדף הנוכחי, בקריאת script אחת: {id: CartLine}."""
+    if isinstance(driver, HttpBrowser):
+        rows = []
+        for row in driver.find_elements(*CartPage.ROWS):
+            cell = {name: row.find_elements(*locator) for name, locator in
+                    (("name", CartPage.ROW_NAME), ("price", CartPage.ROW_PRICE),
+                     ("quantity", CartPage.ROW_QUANTITY), ("total", CartPage.ROW_TOTAL))}
+            text = {name: elements[0].text if elements else "" for name, elements in cell.items()}
+            rows.append([int(row.get_attribute("id").replace("product-", "")), text["name"], text["price"],
+                         int(text["quantity"] or 0), text["total"]])
+    else:
+        rows = driver.execute_script(_CART_JS, CartPage.ROWS.value, CartPage.ROW_NAME.value,
+                                     CartPage.ROW_PRICE.value, CartPage.ROW_QUANTITY.value, CartPage.ROW_TOTAL.value)
+    return {row[0]: CartLine(*row) for row in rows}
+
+
+def diff_cart(catalogue: Catalogue, cart: dict, expected: dict) -> list:
+    """משווה את העגלה לקטלוג: expected = {id: כמות}. מחזיר רשימת הבדלים (ריקה = תקין)."""
+    differences = []
+    for product_id, quantity in expected.items():
+        product = catalogue.by_id.get(product_id)
+        line = cart.get(product_id)
+        if product is None:
+            differences.append(f"מוצר {product_id} לא קיים בקטלוג")
+        elif line is None:
+            differences.append(f"'{product.name}' חסר בעגלה")
+        else:
+            for field, actual, wanted in (("שם", line.name, product.name), ("מחיר", line.price, product.price),
+                                          ("כמות", line.quantity, quantity)):
+                if actual != wanted:
+                    differences.append(f"'{product.name}': {field} בעגלה '{actual}', צפוי '{wanted}'")
+    for product_id in cart.keys() - expected.keys():
+        differences.append(f"מוצר לא צפוי בעגלה: '{cart[product_id].name}' ({product_id})")
+    return differences
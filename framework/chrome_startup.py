@@ -0,0 +1,151 @@
+import atexit
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from selenium.webdriver.common.selenium_manager import SeleniumManager
+from .logger import log_info, log_warning
+
+# 💡 נתיב ה-chromedriver וה-Chrome נשמרים בקובץ אחרי הפתרון הראשון, כך ש-Selenium Manager
+#    (תהליך חיצוני) לא רץ מחדש בכל session ובכל worker. ה-cache תקף רק לאותה התקנה של Chrome -
+#    אחרי עדכון אוטומטי ה-chromedriver שנשמר כבר לא תואם לדפדפן.
+DRIVER_CACHE_FILE = os.environ.get(
+    "DRIVER_CACHE_FILE", os.path.join(tempfile.gettempdir(), "automation_driver_paths.json")
+)
+
+# cookies של חלון ההסכמה (Google Funding Choices) - נשמרים בפרופיל התבנית ושורדים את איפוס הדפדפן
+CONSENT_COOKIES = ("FCCDCF", "FCNEC")
+
+# קבצי נעילה ו-crash של Chrome - לא מועתקים מהתבנית
+_PROFILE_IGNORE = shutil.ignore_patterns("Singleton*", "lockfile", "Crashpad", "Crash Reports", "*.log")
+
+_resolve_lock = threading.Lock()
+_startup_lock = threading.Lock()
+_startup_times = []
+
+
+# ===================== Driver Binary Cache =====================
+
+def _browser_fingerprint(browser_path: str) -> list:
+    """מזהה להתקנה של Chrome: זמן השינוי של קובץ הדפדפן ושל התיקייה שלו. עדכון מחליף את הקבצים
+    (או מוסיף תיקיית גרסה לידם), ולכן המזהה משתנה - בלי להפעיל את הדפדפן כדי לקרוא את הגרסה."""
+    if not browser_path:
+        return None
+    try:
+        binary = os.path.realpath(browser_path)
+        return [os.stat(binary).st_mtime_ns, os.stat(os.path.dirname(binary)).st_mtime_ns]
+    except OSError:
+        return None
+
+
+def _write_cache(paths: dict):
+    # 💡 כתיבה לקובץ זמני והחלפה אטומית - workers מקבילים לא קוראים קובץ כתוב למחצה
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(DRIVER_CACHE_FILE) or ".", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(paths, f)
+        os.replace(temp_path, DRIVER_CACHE_FILE)
+    except OSError as e:
+        log_warning(f"לא ניתן לשמור את נתיבי ה-driver ב-cache: {e}")
+
+
+def resolve_binary_paths(refresh: bool = False) -> dict:
+    """מחזיר {"driver_path", "browser_path"} מה-cache, ומריץ את Selenium Manager רק אם אין נתיב תקין,
+    אם Chrome עודכן מאז השמירה, או עם refresh=True (למשל כשהפעלת הדפדפן נכשלה)."""
+    with _resolve_lock:
+        if not refresh:
+            try:
+                with open(DRIVER_CACHE_FILE, encoding="utf-8") as f:
+                    cached = json.load(f)
+                paths = {"driver_path": cached.get("driver_path"), "browser_path": cached.get("browser_path")}
+                if (paths["driver_path"] and all(not path or os.path.exists(path) for path in paths.values())
+                        and cached.get("browser_fingerprint") == _browser_fingerprint(paths["browser_path"])):
+                    return paths
+            except (OSError, ValueError):
+                pass
+
+        started = time.perf_counter()
+        paths = SeleniumManager().binary_paths(["--browser", "chrome"])
+        paths = {"driver_path": paths.get("driver_path"), "browser_path": paths.get("browser_path")}
+        log_info(f"🔎 Selenium Manager איתר את chromedriver תוך {time.perf_counter() - started:.2f} שניות")
+        _write_cache(dict(paths, browser_fingerprint=_browser_fingerprint(paths["browser_path"])))
+        return paths
+
+
+# ===================== Template Profile =====================
+
+def copy_profile_template(template_dir: str) -> str:
+    """מעתיק את פרופיל התבנית לתיקייה זמנית לדפדפן אחד (Chrome נועל את תיקיית הפרופיל)."""
+    profile_dir = tempfile.mkdtemp(prefix="chrome-profile-")
+    shutil.copytree(template_dir, profile_dir, ignore=_PROFILE_IGNORE, dirs_exist_ok=True)
+    atexit.register(shutil.rmtree, profile_dir, ignore_errors=True)
+    return profile_dir
+
+
+def build_profile_template(template_dir: str, base_url: str, pages=("/", "/products", "/test_cases")):
+    """יוצר פרופיל תבנית: טוען את דפי האתר (disk cache חם) ומאשר את חלון ההסכמה אם הוא מופיע."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.common.by import By
+
+    paths = resolve_binary_paths()
+    options = webdriver.ChromeOptions()
+    if paths["browser_path"]:
+        options.binary_location = paths["browser_path"]
+    options.add_argument("--headless=new")
+    options.add_argument(f"--user-data-dir={os.path.abspath(template_dir)}")
+    driver = webdriver.Chrome(service=Service(executable_path=paths["driver_path"]), options=options)
+    try:
+        for page in pages:
+            driver.get(base_url.rstrip("/") + page)
+            consent = driver.find_elements(By.CSS_SELECTOR, "button.fc-cta-consent")
+            if consent:
+                consent[0].click()
+                log_info("🍪 חלון ההסכמה אושר ונשמר בפרופיל")
+    finally:
+        driver.quit()
+    log_info(f"📁 פרופיל תבנית נוצר ב: {template_dir}")
+
+
+# ===================== Startup Timing =====================
+
+def record_startup(launch: float, total: float):
+    """רושם את זמן ההפעלה של דפדפן: launch (עד session פעיל) ו-total (כולל טעינת החימום)."""
+    with _startup_lock:
+        _startup_times.append({"launch": launch, "total": total})
+
+
+def get_startup_times() -> list:
+    with _startup_lock:
+        return list(_startup_times)
+
+
+def merge_startup_times(times: list):
+    """ממזג זמנים שהגיעו מ-worker אחר (pytest-xdist)."""
+    with _startup_lock:
+        _startup_times.extend(times)
+
+
+def format_startup_report(target: float = 1.0) -> str:
+    """סיכום זמני הפעלת הדפדפנים מול היעד (בשניות)."""
+    if not _startup_times:
+        return "לא הופעלו דפדפנים בריצה זו."
+    lines = [f"{'':<10}{'browsers':>10}{'avg (s)':>10}{'max (s)':>10}"]
+    for key in ("launch", "total"):
+        values = [entry[key] for entry in _startup_times]
+        lines.append(f"{key:<10}{len(values):>10}{sum(values) / len(values):>10.2f}{max(values):>10.2f}")
+    slow = sum(1 for entry in _startup_times if entry["launch"] >= target)
+    lines.append(f"⚠️ {slow} דפדפנים הופעלו לאט מהיעד ({target:.1f}s)" if slow
+                 else f"✅ כל הדפדפנים הופעלו מתחת ליעד ({target:.1f}s)")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # python -m framework.chrome_startup <template_dir> [base_url]
+    if len(sys.argv) < 2:
+        print("usage: python -m framework.chrome_startup <template_dir> [base_url]")
+        sys.exit(2)
+    build_profile_template(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else "https://automationexercise.com")
@@ -0,0 +1,147 @@
+import base64
+import gzip
+import os
+import queue
+import shutil
+import threading
+from datetime import datetime
+from .http_backend import HttpBrowser
+from .logger import log_info, log_warning
+from .stream_report import ARTIFACTS_DIR, REPORTS_DIR, get_run_dir
+
+# 💡 artifacts לבדיקה שנכשלה: צילום מסך, page source ולוג הקונסול של הדפדפן.
+#    רק הקריאה מהדפדפן נעשית בזמן הבדיקה (3 פקודות WebDriver, ורק בכישלון); הדחיסה והכתיבה לדיסק
+#    נעשות ב-thread ברקע, כך שהבדיקה הבאה לא מחכה להן.
+
+MAX_ARTIFACT_BYTES = int(os.environ.get("FAILURE_ARTIFACT_MAX_KB", "2048")) * 1024  # לקובץ, אחרי דחיסה
+MAX_TEXT_BYTES = 8 * MAX_ARTIFACT_BYTES  # page source / לוג לפני דחיסה - נחתכים מעבר לזה
+MAX_RUN_BYTES = int(os.environ.get("FAILURE_ARTIFACTS_MAX_MB", "100")) * 1024 * 1024  # לכל תהליך בריצה
+DEFAULT_RETENTION_RUNS = int(os.environ.get("ARTIFACT_RETENTION_RUNS", "10"))
+SCREENSHOT_QUALITY = 60  # JPEG דרך CDP - בערך פי 5 קטן מ-PNG
+
+
+# ===================== Capture =====================
+
+def _screenshot(driver):
+    """צילום מסך דחוס (JPEG דרך CDP ב-Chrome, אחרת PNG) ושם הקובץ המתאים."""
+    if hasattr(driver, "execute_cdp_cmd"):
+        result = driver.execute_cdp_cmd("Page.captureScreenshot", {"format": "jpeg", "quality": SCREENSHOT_QUALITY})
+        return "screenshot.jpg", base64.b64decode(result["data"])
+    return "screenshot.png", driver.get_screenshot_as_png()
+
+
+def _browser_log(driver, since: float) -> str:
+    """רשומות הקונסול של הדפדפן מאז תחילת הבדיקה (הדפדפן מהמאגר משמש גם בדיקות קודמות)."""
+    entries = [entry for entry in driver.get_log("browser") if entry.get("timestamp", 0) >= since * 1000]
+    return "\n".join(
+        f"{datetime.fromtimestamp(entry['timestamp'] / 1000):%H:%M:%S.%f} {entry.get('level')}: {entry.get('message')}"
+        for entry in entries
+    )
+
+
+def capture_failure(driver, since: float = 0) -> list:
+    """קורא מהדפדפן את מה שצריך לניתוח הכישלון ומחזיר [(שם, נתונים)]. כל חלק נאסף בנפרד,
+    כך שדפדפן שקרס חלקית עדיין מחזיר את מה שאפשר. הנתונים עדיין לא דחוסים."""
+    captured = []
+    try:
+        captured.append(("page_source.html.gz", driver.page_source))
+    except Exception as e:
+        log_warning(f"לא ניתן לשמור page source: {e}")
+    if isinstance(driver, HttpBrowser):
+        return captured  # 💡 ב-backend ה-http אין מסך ואין קונסול
+    try:
+        captured.append(_screenshot(driver))
+    except Exception as e:
+        log_warning(f"לא ניתן לצלם מסך: {e}")
+    try:
+        captured.append(("browser_log.txt.gz", _browser_log(driver, since)))
+    except Exception as e:
+        log_warning(f"לא ניתן לקרוא את לוג הדפדפן: {e}")
+    return captured
+
+
+# ===================== Background Writer =====================
+
+class ArtifactWriter:
+    """כותב artifacts לדיסק ב-thread ברקע: דוחס קבצי .gz, ומדלג על קבצים מעל MAX_ARTIFACT_BYTES
+    ועל כל מה שמעבר לתקציב MAX_RUN_BYTES של התהליך."""
+
+    def __init__(self, run_dir: str = None, max_artifact_bytes: int = MAX_ARTIFACT_BYTES,
+                 max_run_bytes: int = MAX_RUN_BYTES):
+        self.run_dir = run_dir or get_run_dir()
+        self.max_artifact_bytes = max_artifact_bytes
+        self.max_run_bytes = max_run_bytes
+        self.bytes_written = 0
+        self.written = 0
+        self.skipped = 0
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def submit(self, relative_path: str, data):
+        """מכניס artifact לתור; חוזר מיד. הנתיב נקבע מראש כדי שאפשר יהיה לקשר אליו מהדוח."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+            self._thread.start()
+        self._queue.put((relative_path, data))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                self._write(*item)
+            except Exception as e:
+                log_warning(f"שגיאה בכתיבת artifact {item[0]}: {e}")
+
+    def _write(self, relative_path: str, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if relative_path.endswith(".gz"):
+            if len(data) > MAX_TEXT_BYTES:
+                data = data[:MAX_TEXT_BYTES] + b"\n... [truncated]"
+            data = gzip.compress(data, compresslevel=6)
+
+        if len(data) > self.max_artifact_bytes or self.bytes_written + len(data) > self.max_run_bytes:
+            self.skipped += 1
+            log_warning(f"artifact {relative_path} לא נשמר ({len(data) // 1024}KB) - חריגה ממגבלת הגודל")
+            return
+        with open(os.path.join(self.run_dir, relative_path), "wb") as f:
+            f.write(data)
+        self.bytes_written += len(data)
+        self.written += 1
+
+    def close(self, timeout: float = 30):
+        """ממתין שהתור יתרוקן (בסוף הריצה, לפני שהדוח נסגר)."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        if self.written or self.skipped:
+            log_info(f"📎 artifacts של כישלונות: {self.written} נשמרו ({self.bytes_written / 1024:.0f}KB), "
+                     f"{self.skipped} דולגו בגלל מגבלת גודל")
+
+
+# ===================== Retention =====================
+
+def prune_artifacts(keep: int = DEFAULT_RETENTION_RUNS, reports_dir: str = REPORTS_DIR, current_run_dir: str = None):
+    """מוחק את תיקיות ה-artifacts של כל הריצות מלבד keep האחרונות. results.ndjson נשאר -
+    הוא קטן ומשמש את ה-viewer וההיסטוריה."""
+    if keep <= 0 or not os.path.isdir(reports_dir):
+        return []
+    current = os.path.abspath(current_run_dir) if current_run_dir else None
+    runs = [os.path.join(reports_dir, name) for name in os.listdir(reports_dir) if name.startswith("run_")]
+    runs = [run for run in runs if os.path.isdir(os.path.join(run, ARTIFACTS_DIR)) and os.path.abspath(run) != current]
+    runs.sort(key=os.path.getmtime, reverse=True)
+    pruned = runs[keep - 1 if current else keep:]
+    for run in pruned:
+        shutil.rmtree(os.path.join(run, ARTIFACTS_DIR), ignore_errors=True)
+    return pruned
+
+
+if __name__ == "__main__":
+    # python -m framework.failure_capture [keep] - ניקוי ידני של artifacts ישנים
+    import sys
+
+    for run in prune_artifacts(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RETENTION_RUNS):
+        print(f"🗑️ {run}/{ARTIFACTS_DIR}")
@@ -0,0 +1,356 @@
+import re
+import time
+from html.parser import HTMLParser
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError
+from urllib.parse import urljoin
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+
+# 💡 backend קל בלי דפדפן: בקשת HTTP ו-parser של HTML, לבדיקות מבניות בלבד (מלאי קישורים, רשימת
+#    Test Cases). חושף חלק מה-API של WebDriver (get, find_elements, text, get_attribute) כך שאותם
+#    helpers עובדים; אין JavaScript ואין לחיצות. "גלוי" נקבע לפי hidden ו-style inline בלבד.
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+_NOT_RENDERED = {"head", "script", "style", "template", "noscript"}
+# אלמנטים שמתחילים ומסיימים שורה ב-text (כמו הטקסט המוצג ב-WebDriver); תאי טבלה מופרדים ברווח
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "caption", "dd", "details", "dialog", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr",
+    "li", "main", "nav", "ol", "p", "pre", "section", "summary", "table", "tbody", "thead", "tfoot", "tr", "ul",
+}
+_CELL_TAGS = {"td", "th"}
+_HIDDEN_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden")
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AutomationTests/1.0 (http backend)"
+
+
+# ===================== DOM =====================
+
+class HttpElement:
+    """אלמנט HTML שנבנה מה-parser, עם תת-קבוצה של ה-API של WebElement."""
+
+    def __init__(self, tag: str, attrs: dict, parent: "HttpElement" = None, base_url: str = ""):
+        self.tag_name = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []
+        self.base_url = base_url
+
+    def iter(self):
+        """כל הצאצאים בסדר המסמך."""
+        for child in self.children:
+            if isinstance(child, HttpElement):
+                yield child
+                yield from child.iter()
+
+    @property
+    def text(self) -> str:
+        """הטקסט כפי ש-WebDriver מחזיר אותו: רווחים מצומצמים בתוך שורה, ושורה חדשה בגבולות
+        של אלמנטי block ו-<br> (כך ש-<p>a</p><p>b</p> הוא "a\nb" ולא "ab")."""
+        lines, parts = [], []
+
+        def end_line():
+            lines.append(" ".join("".join(parts).split()))
+            parts.clear()
+
+        def collect(node):
+            for child in node.children:
+                if isinstance(child, str):
+                    parts.append(child)
+                elif child.tag_name == "br":
+                    end_line()
+                elif child.tag_name not in _NOT_RENDERED:
+                    block = child.tag_name in _BLOCK_TAGS
+                    if block:
+                        end_line()
+                    elif child.tag_name in _CELL_TAGS:
+                        parts.append(" ")
+                    collect(child)
+                    if block:
+                        end_line()
+
+        collect(self)
+        end_line()
+        return "\n".join(line for line in lines if line)
+
+    def get_attribute(self, name: str):
+        value = self.attrs.get(name)
+        if name in ("href", "src") and value is not None:
+            return urljoin(self.base_url, value)
+        return value
+
+    def is_displayed(self) -> bool:
+        node = self
+        while node is not None:
+            if (node.tag_name in _NOT_RENDERED or "hidden" in node.attrs
+                    or _HIDDEN_STYLE.search(node.attrs.get("style") or "")):
+                return False
+            node = node.parent
+        return self.attrs.get("type") != "hidden"
+
+    def is_enabled(self) -> bool:
+        return "disabled" not in self.attrs
+
+    def click(self):
+        raise WebDriverException("ה-backend מסוג http אינו תומך בלחיצות - יש להצהיר על capability 'interaction'")
+
+    def find_elements(self, by: str = By.CSS_SELECTOR, value: str = None) -> list:
+        selector = _to_css(by, value)
+        if selector is None:
+            return [el for el in self.iter() if el.tag_name == "a" and _match_link_text(el, by, value)]
+        groups = _parse_selector_list(selector)
+        return [el for el in self.iter() if any(_matches(el, group) for group in groups)]
+
+    def find_element(self, by: str = By.CSS_SELECTOR, value: str = None) -> "HttpElement":
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"לא נמצא אלמנט: {by}={value}")
+        return elements[0]
+
+    def __repr__(self):
+        return f"<HttpElement {self.tag_name} {self.attrs}>"
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self, base_url: str):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.root = HttpElement("#document", {}, base_url=base_url)
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        element = HttpElement(tag, {name: value if value is not None else "" for name, value in attrs},
+                              self.stack[-1], self.base_url)
+        self.stack[-1].children.append(element)
+        if tag not in VOID_TAGS:
+            self.stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        # סגירה סלחנית: תגית סגירה בלי פתיחה תואמת מתעלמת
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag_name == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+
+def parse_html(source: str, base_url: str = "") -> HttpElement:
+    builder = _TreeBuilder(base_url)
+    builder.feed(source)
+    builder.close()
+    return builder.root
+
+
+# ===================== CSS Selectors =====================
+# תת-קבוצה של CSS: tag, *, #id, .class, [attr], [attr=|~=|^=|$=|*=value], צאצא (רווח) ובן ישיר (>)
+
+_SIMPLE = re.compile(
+    r"""\s*(?:
+        (?P<tag>\*|[\w-]+)
+      | \#(?P<id>[\w-]+)
+      | \.(?P<cls>[\w-]+)
+      | \[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[~^$*|]?=)\s*(?:'(?P<sq>[^']*)'|"(?P<dq>[^"]*)"|(?P<bare>[^\]\s]+)))?\s*\]
+    )""",
+    re.VERBOSE,
+)
+
+_selector_cache = {}
+
+
+def _split_outside_quotes(text: str, separators: str):
+    """מפצל לפי תווים מפרידים שמחוץ למרכאות ולסוגריים מרובעים; מחזיר (חלק, המפריד שאחריו)."""
+    parts, current, quote, depth = [], [], None, 0
+    for char in text:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "'\"":
+            quote = char
+        elif char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif depth == 0 and char in separators:
+            parts.append(("".join(current), char))
+            current = []
+            continue
+        current.append(char)
+    parts.append(("".join(current), None))
+    return parts
+
+
+def _parse_compound(text: str) -> list:
+    conditions, position = [], 0
+    while position < len(text):
+        match = _SIMPLE.match(text, position)
+        if not match or match.end() == position:
+            raise InvalidSelectorException(f"selector לא נתמך ב-backend מסוג http: {text!r}")
+        position = match.end()
+        if match["tag"] and match["tag"] != "*":
+            conditions.append(("tag", match["tag"].lower()))
+        elif match["id"]:
+            conditions.append(("attr", "id", "=", match["id"]))
+        elif match["cls"]:
+            conditions.append(("attr", "class", "~=", match["cls"]))
+        elif match["attr"]:
+            value = next((v for v in (match["sq"], match["dq"], match["bare"]) if v is not None), None)
+            conditions.append(("attr", match["attr"], match["op"], value))
+    return conditions
+
+
+def _parse_selector_list(selector: str) -> list:
+    """מחזיר לכל selector ברשימה את שרשרת ה-compounds (מימין לשמאל) עם ה-combinator שלפני כל אחד."""
+    if selector in _selector_cache:
+        return _selector_cache[selector]
+    groups = []
+    for part, _ in _split_outside_quotes(selector, ","):
+        spaced = re.sub(r"\s*>\s*", " > ", part.strip())
+        chain, combinator = [], " "
+        for token, _ in _split_outside_quotes(spaced, " "):
+            if not token:
+                continue
+            if token == ">":
+                combinator = ">"
+                continue
+            chain.append((combinator, _parse_compound(token)))
+            combinator = " "
+        if not chain:
+            raise InvalidSelectorException(f"selector ריק: {selector!r}")
+        groups.append(list(reversed(chain)))
+    _selector_cache[selector] = groups
+    return groups
+
+
+def _matches_compound(element: HttpElement, conditions: list) -> bool:
+    for condition in conditions:
+        if condition[0] == "tag":
+            if element.tag_name != condition[1]:
+                return False
+            continue
+        _, name, op, expected = condition
+        actual = element.attrs.get(name)
+        if actual is None:
+            return False
+        if op is None:
+            continue
+        if not ((op == "=" and actual == expected)
+                or (op == "~=" and expected in actual.split())
+                or (op == "^=" and actual.startswith(expected))
+                or (op == "$=" and actual.endswith(expected))
+                or (op == "*=" and expected in actual)
+                or (op == "|=" and (actual == expected or actual.startswith(expected + "-")))):
+            return False
+    return True
+
+
+def _matches(element: HttpElement, chain: list, index: int = 0) -> bool:
+    combinator, conditions = chain[index]
+    if not _matches_compound(element, conditions):
+        return False
+    if index == len(chain) - 1:
+        return True
+    parent = element.parent
+    if combinator == ">":
+        return parent is not None and parent.tag_name != "#document" and _matches(parent, chain, index + 1)
+    while parent is not None and parent.tag_name != "#document":
+        if _matches(parent, chain, index + 1):
+            return True
+        parent = parent.parent
+    return False
+
+
+def _to_css(by: str, value: str):
+    """ממיר locator של Selenium ל-CSS; None עבור link text (מטופל בנפרד)."""
+    if by == By.CSS_SELECTOR:
+        return value
+    if by == By.TAG_NAME:
+        return value
+    if by == By.ID:
+        return f"[id='{value}']"
+    if by == By.CLASS_NAME:
+        return f".{value}"
+    if by == By.NAME:
+        return f"[name='{value}']"
+    if by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+        return None
+    raise InvalidSelectorException(f"ה-backend מסוג http אינו תומך ב-{by} - יש להשתמש ב-CSS")
+
+
+def _match_link_text(element: HttpElement, by: str, value: str) -> bool:
+    text = element.text
+    return text == value if by == By.LINK_TEXT else value in text
+
+
+# ===================== Browser =====================
+
+class HttpBrowser:
+    """"דפדפן" בלי JavaScript: טוען דפים ב-HTTP (עם cookies) ומאפשר חיפוש אלמנטים ב-HTML."""
+
+    name = "http"
+
+    def __init__(self, timeout: float = 30):
+        self.timeout = timeout
+        self.cookies = CookieJar()
+        self._opener = build_opener(HTTPCookieProcessor(self.cookies))
+        self.capabilities = {"browserName": "http", "pageLoadStrategy": "normal"}
+        self.current_url = "about:blank"
+        self.page_source = ""
+        self.status = None
+        self.last_timing = None
+        self.document = parse_html("")
+
+    def get(self, url: str):
+        started = time.perf_counter()
+        request = Request(url, headers={"User-Agent": USER_AGENT})
+        try:
+            response = self._opener.open(request, timeout=self.timeout)
+        except HTTPError as error:
+            # דף שגיאה הוא עדיין דף - כמו בדפדפן
+            response = error
+        with response:
+            first_byte = time.perf_counter()
+            charset = response.headers.get_content_charset() or "utf-8"
+            self.page_source = response.read().decode(charset, errors="replace")
+            self.status = response.status
+            self.current_url = response.geturl()
+        self.document = parse_html(self.page_source, self.current_url)
+        self.last_timing = {
+            "ttfb_ms": round((first_byte - started) * 1000),
+            "load_ms": round((time.perf_counter() - started) * 1000),
+        }
+
+    @property
+    def title(self) -> str:
+        titles = self.document.find_elements(By.TAG_NAME, "title")
+        return titles[0].text if titles else ""
+
+    def find_elements(self, by: str = By.CSS_SELECTOR, value: str = None) -> list:
+        return self.document.find_elements(by, value)
+
+    def find_element(self, by: str = By.CSS_SELECTOR, value: str = None) -> HttpElement:
+        return self.document.find_element(by, value)
+
+    def execute_script(self, script, *args):
+        raise WebDriverException("ה-backend מסוג http אינו מריץ JavaScript - יש להצהיר על capability 'js'")
+
+    execute_async_script = execute_script
+
+    def delete_all_cookies(self):
+        self.cookies.clear()
+
+    def reset(self):
+        """מצב נקי לבדיקה הבאה (המקבילה של reset_browser_state)."""
+        self.cookies.clear()
+        self.current_url = "about:blank"
+        self.page_source = ""
+        self.document = parse_html("")
+
+    def quit(self):
+        self._opener.close()
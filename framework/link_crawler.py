@@ -0,0 +1,289 @@
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection, HTTPException, HTTPSConnection, RemoteDisconnected
+from statistics import median
+from typing import NamedTuple
+from urllib.parse import urldefrag, urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass
+from selenium.webdriver.common.by import By
+from .http_backend import USER_AGENT, parse_html
+from .logger import log_debug
+
+# 💡 בדיקת תקינות קישורים: asyncio מתזמן את הבקשות (מגבלת מקביליות כוללת, מגבלת חיבורים ו-rate limit
+#    לכל host), והבקשות עצמן נשלחות ב-http.client מ-thread pool על חיבורי keep-alive שנשמרים לכל host -
+#    כך ש-TCP/TLS נפתח פעם אחת לכל חיבור ולא לכל קישור. כל URL נבדק פעם אחת בריצה.
+#    HEAD לא נתמך בכל שרת (גם לא בשרת המקומי), ולכן GET; הגוף נקרא רק בדפי HTML ועד MAX_BODY_BYTES.
+
+MAX_CONCURRENCY = 10
+MAX_CONNECTIONS_PER_HOST = 4
+PER_HOST_RATE = 5.0  # בקשות לשנייה לכל host (0 = ללא הגבלה)
+TIMEOUT = 10.0
+MAX_REDIRECTS = 5
+MAX_BODY_BYTES = 2 * 1024 * 1024
+# גוף קטן מזה (שאינו HTML) נקרא ונזרק כדי שהחיבור יחזור למאגר; גדול ממנו - החיבור נסגר
+MAX_DRAIN_BYTES = 64 * 1024
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+class LinkResult(NamedTuple):
+    """תוצאת בדיקה של קישור אחד. status 0 = שגיאת חיבור או timeout; status של הפניה = יותר מדי הפניות."""
+    url: str
+    status: int
+    latency_ms: int
+    depth: int
+    referrer: str
+    final_url: str
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error and 200 <= self.status < 400 and self.status not in REDIRECT_STATUSES
+
+
+# {url: (LinkResult, קישורים בדף)} - משותף לכל הסריקות בתהליך, כך שכל URL נבדק פעם אחת בריצה
+_run_cache = {}
+
+
+def normalize_url(url: str, base: str = "") -> str:
+    """URL מוחלט בלי fragment, או None לקישורים שאינם http(s) (mailto:, javascript:, '#')."""
+    if not url:
+        return None
+    url = urldefrag(urljoin(base, url.strip()))[0]
+    return url if urlsplit(url).scheme in ("http", "https") else None
+
+
+# ===================== HTTP Client =====================
+
+class _ConnectionPool:
+    """חיבורי keep-alive פנויים לכל (scheme, host). מספר החיבורים לכל host חסום על ידי ה-Semaphore
+    של ה-host ב-LinkCrawler.fetch, ולכן המאגר עצמו לא מגביל. proxy נלקח מ-HTTP_PROXY / HTTPS_PROXY."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._proxies = getproxies()
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def acquire(self, scheme: str, netloc: str) -> tuple:
+        """(connection, absolute_target): חיבור פנוי ל-host, או חיבור חדש (ה-socket נפתח בבקשה הראשונה).
+        absolute_target = הבקשה נשלחת ל-proxy ולכן עם URL מלא."""
+        idle = self._idle.get((scheme, netloc))
+        if idle:
+            return idle.pop()
+        connection_class = HTTPSConnection if scheme == "https" else HTTPConnection
+        proxy = self._proxies.get(scheme)
+        if not proxy or proxy_bypass(urlsplit(f"//{netloc}").hostname):
+            return connection_class(netloc, timeout=self.timeout), False
+        proxy_netloc = urlsplit(proxy if "//" in proxy else f"//{proxy}").netloc
+        if scheme == "https":
+            connection = HTTPSConnection(proxy_netloc, timeout=self.timeout)
+            connection.set_tunnel(netloc)
+            return connection, False
+        return HTTPConnection(proxy_netloc, timeout=self.timeout), True
+
+    def release(self, scheme: str, netloc: str, pooled: tuple):
+        self._idle.setdefault((scheme, netloc), []).append(pooled)
+
+    def count_opened(self):
+        """נקרא מה-thread של הבקשה כשנפתח חיבור TCP חדש."""
+        with self._lock:
+            self.opened += 1
+
+    def close(self):
+        for idle in self._idle.values():
+            for connection, _ in idle:
+                connection.close()
+        self._idle = {}
+
+
+class _HostRateLimiter:
+    """מרווח מינימלי בין תחילת בקשות לאותו host."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0
+        self._next_slot = {}
+
+    async def wait(self, host: str):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        start = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class LinkCrawler:
+    """בודק קישורים במקביל, ועד max_depth רמות פנימה בקישורים של אותו host."""
+
+    def __init__(self, max_depth: int = 0, max_concurrency: int = MAX_CONCURRENCY,
+                 per_host_rate: float = PER_HOST_RATE, per_host_connections: int = MAX_CONNECTIONS_PER_HOST,
+                 timeout: float = TIMEOUT, use_cache: bool = True):
+        self.max_depth = max_depth
+        self.timeout = timeout
+        self.use_cache = use_cache
+        self.per_host_connections = per_host_connections
+        self._pool = None
+        self._limiter = _HostRateLimiter(per_host_rate)
+        self._concurrency = max_concurrency
+        self._semaphore = None
+        self._host_slots = {}
+        self._executor = None
+        self._crawl_hosts = set()
+        self.cache_hits = 0
+        self.connections_opened = 0
+
+    def _fetch_once(self, connection: HTTPConnection, absolute_target: bool, url: str) -> tuple:
+        """בקשת GET אחת (רצה ב-thread) על חיבור מהמאגר: (status, headers, body). הגוף נשמר רק בדפי HTML.
+        הפניות לא נעקבות כאן אלא ב-fetch (ספירה, rate limit וזמן לכל hop)."""
+        parts = urlsplit(url)
+        target = url if absolute_target else (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        request_headers = {"User-Agent": USER_AGENT, "Accept": "text/html,*/*"}
+        while True:
+            reused = connection.sock is not None
+            if not reused:
+                self._pool.count_opened()
+            try:
+                connection.request("GET", target, headers=request_headers)
+                response = connection.getresponse()
+                break
+            except (RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # 💡 השרת סגר חיבור keep-alive שהמתין במאגר - ניסיון אחד נוסף על חיבור חדש
+                connection.close()
+                if not reused:
+                    raise
+
+        headers = {name.lower(): value for name, value in response.getheaders()}
+        is_html = "text/html" in headers.get("content-type", "")
+        length = headers.get("content-length", "")
+        body = b""
+        if is_html:
+            body = response.read(MAX_BODY_BYTES)
+        elif length.isdigit() and int(length) <= MAX_DRAIN_BYTES:
+            response.read()
+        if not response.isclosed():
+            # הגוף לא נקרא עד הסוף - החיבור לא יכול לשמש לבקשה הבאה
+            connection.close()
+        return response.status, headers, body
+
+    async def fetch(self, url: str) -> tuple:
+        """GET עם מעקב אחרי עד MAX_REDIRECTS הפניות; מחזיר (status, final_url, headers, body, latency_ms).
+        זמן התגובה לא כולל המתנה ל-rate limit. אחרי יותר מדי הפניות מוחזרת ההפניה האחרונה."""
+        loop = asyncio.get_running_loop()
+        elapsed = 0.0
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            scheme, host = parts.scheme, parts.netloc.lower()
+            # 💡 קודם ה-rate limit והחיבורים של ה-host, ורק אז מקום במגבלה הכוללת - host איטי לא חוסם את השאר
+            await self._limiter.wait(host)
+            host_slot = self._host_slots.setdefault(host, asyncio.Semaphore(self.per_host_connections))
+            async with host_slot, self._semaphore:
+                pooled = self._pool.acquire(scheme, host)
+                started = time.perf_counter()
+                try:
+                    status, headers, body = await asyncio.wait_for(
+                        loop.run_in_executor(self._executor, self._fetch_once, *pooled, url), self.timeout)
+                except BaseException:
+                    # החיבור במצב לא ידוע (ואחרי timeout עדיין בשימוש ב-thread) - לא חוזר למאגר
+                    pooled[0].close()
+                    raise
+                finally:
+                    elapsed += time.perf_counter() - started
+                self._pool.release(scheme, host, pooled)
+            if status not in REDIRECT_STATUSES or "location" not in headers:
+                break
+            url = urljoin(url, headers["location"])
+        return status, url, headers, body, round(elapsed * 1000)
+
+    async def _check(self, url: str, depth: int, referrer: str) -> tuple:
+        if self.use_cache and url in _run_cache:
+            self.cache_hits += 1
+            result, links = _run_cache[url]
+            return result._replace(depth=depth, referrer=referrer), links
+
+        started = time.perf_counter()
+        try:
+            status, final_url, headers, body, latency_ms = await self.fetch(url)
+            # 💡 הפניה שנשארה בסוף השרשרת = לולאת הפניות או שרשרת ארוכה מדי, לא קישור תקין
+            error = f"יותר מ-{MAX_REDIRECTS} הפניות" if status in REDIRECT_STATUSES and "location" in headers else ""
+        except (OSError, asyncio.TimeoutError, HTTPException, ValueError) as e:
+            status, final_url, headers, body, error = 0, url, {}, b"", f"{type(e).__name__}: {e}"
+            latency_ms = round((time.perf_counter() - started) * 1000)
+        result = LinkResult(url, status, latency_ms, depth, referrer, final_url, error)
+
+        links = []
+        if "text/html" in headers.get("content-type", "") and urlsplit(final_url).netloc in self._crawl_hosts:
+            document = parse_html(body.decode("utf-8", errors="replace"), final_url)
+            links = [el.get_attribute("href") for el in document.find_elements(By.CSS_SELECTOR, "a[href]")]
+        _run_cache[url] = (result, links)
+        log_debug(f"🔗 {status or 'ERR'} {result.latency_ms}ms {url}")
+        return result, links
+
+    async def crawl(self, urls, referrer: str = "") -> dict:
+        """בודק את כל הקישורים ומחזיר {url: LinkResult}. קישורים פנימיים (אותו host כמו referrer או
+        הקישורים ההתחלתיים) נסרקים עד max_depth רמות; קישורים חיצוניים רק נבדקים."""
+        self._semaphore = asyncio.Semaphore(self._concurrency)
+        self._host_slots = {}
+        self._executor = ThreadPoolExecutor(max_workers=self._concurrency, thread_name_prefix="link-crawler")
+        self._pool = _ConnectionPool(self.timeout)
+        self._crawl_hosts = {urlsplit(referrer).netloc} if referrer else {urlsplit(u).netloc for u in urls if u}
+        results, seen = {}, set()
+        frontier = [(url, 0, referrer) for url in urls]
+        try:
+            while frontier:
+                batch = []
+                for url, depth, source in frontier:
+                    url = normalize_url(url, source)
+                    if url and url not in seen:
+                        seen.add(url)
+                        batch.append((url, depth, source))
+                checked = await asyncio.gather(*(self._check(*entry) for entry in batch))
+                frontier = []
+                for result, links in checked:
+                    results[result.url] = result
+                    if result.depth < self.max_depth:
+                        frontier.extend((link, result.depth + 1, result.url) for link in links)
+        finally:
+            # בקשה שחרגה מה-timeout עדיין רצה ב-thread שלה - לא מחכים לה
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._pool.close()
+            self.connections_opened = self._pool.opened
+        log_debug(f"🔗 {len(results)} קישורים נבדקו על {self.connections_opened} חיבורים")
+        return results
+
+
+def check_links(urls, referrer: str = "", **options) -> list:
+    """עטיפה סינכרונית ל-LinkCrawler.crawl - מחזירה את התוצאות לפי סדר הבדיקה."""
+    crawler = LinkCrawler(**options)
+    return list(asyncio.run(crawler.crawl(list(urls), referrer)).values())
+
+
+def format_link_report(results: list) -> str:
+    """טבלה: קישורים שבורים קודם, ואז מהאיטי למהיר."""
+    lines = [f"{'status':>6}{'ms':>7}{'depth':>7}  url"]
+    for result in sorted(results, key=lambda r: (r.ok, -r.latency_ms)):
+        status = str(result.status) if result.status else "ERR"
+        source = f" (מ-{result.referrer})" if result.referrer else ""
+        flag = "" if result.ok else f" ❌ {result.error}{source}"
+        lines.append(f"{status:>6}{result.latency_ms:>7}{result.depth:>7}  {result.url}{flag}")
+    broken = sum(not r.ok for r in results)
+    latency = median(r.latency_ms for r in results) if results else 0
+    lines.append(f"{len(results)} קישורים, {broken} שבורים, חציון זמן תגובה {latency:.0f}ms")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m framework.link_crawler")
+    parser.add_argument("url", help="הדף שממנו מתחילים (למשל http://127.0.0.1:8000/)")
+    parser.add_argument("--depth", type=int, default=1, help="כמה רמות לסרוק מעבר לדף ההתחלה")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=PER_HOST_RATE, help="בקשות לשנייה לכל host")
+    args = parser.parse_args()
+
+    report = check_links([args.url], max_depth=args.depth, max_concurrency=args.concurrency,
+                         per_host_rate=args.rate)
+    print(format_link_report(report))
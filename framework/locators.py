@@ -0,0 +1,215 @@
+import time
+import weakref
+from typing import NamedTuple
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+# 💡 מרשם locators מרכזי לפי עמוד. CSS עדיף על XPath כשהם שקולים (הדפדפן מריץ querySelector
+#    ישירות, בלי מנוע XPath); XPath נשאר רק להתאמה לפי טקסט, שאין לה מקבילה ב-CSS.
+
+
+class Locator(NamedTuple):
+    """זוג (by, value) שאפשר להעביר ישירות ל-find_element / EC, או לפרוס: wait_for_clickable(driver, *loc)."""
+    by: str
+    value: str
+
+    def __call__(self, **params) -> "Locator":
+        """locator עם פרמטרים, למשל ProductsPage.VIEW_PRODUCT(product_id=1)."""
+        return Locator(self.by, self.value.format(**params))
+
+
+def css(selector: str) -> Locator:
+    return Locator(By.CSS_SELECTOR, selector)
+
+
+def xpath(expression: str) -> Locator:
+    return Locator(By.XPATH, expression)
+
+
+# ===================== Page Locators =====================
+
+class Header:
+    HOME = css(".shop-menu a[href='/']")
+    PRODUCTS = css(".shop-menu a[href='/products']")
+    CART = css(".shop-menu a[href='/view_cart']")
+    SIGNUP_LOGIN = css(".shop-menu a[href='/login']")
+    LOGOUT = css(".shop-menu a[href='/logout']")
+    TEST_CASES = css("a[href='/test_cases']")
+    LOGGED_IN_AS = xpath("//a[contains(., 'Logged in as')]")
+
+
+class HomePage:
+    CLICKABLES = css("a, button")
+
+
+class ProductsPage:
+    WOMEN_CATEGORY = css("a[href='#Women']")
+    PRODUCT_NAME = xpath("//div[@class='product-image-wrapper']//p[text()='{name}']")
+    VIEW_PRODUCT = css(".product-image-wrapper a[href='/product_details/{product_id}']")
+    ADD_TO_CART = css("a[data-product-id='{product_id}']")
+    FIRST_PRODUCT_NAME = css(".productinfo.text-center p")
+    CARDS = css(".productinfo")
+    CARD_NAME = css("p")
+    CARD_PRICE = css("h2")
+    CARD_ADD_TO_CART = css("a[data-product-id]")
+
+
+class ProductDetailsPage:
+    ADD_TO_CART = css("button.cart")
+    NAME = css(".product-information h2")
+    PRICE = css(".product-information span span")
+    INFO_LINES = css(".product-information p")  # "Category: Women > Tops", "Availability: ..."
+
+
+class CartModal:
+    CONTENT = css(".modal-content")
+    VIEW_CART = css(".modal-content a[href='/view_cart']")
+
+
+class CartPage:
+    ROW = css("tr#product-{product_id}")
+    ROWS = css("#cart_info_table tbody tr[id^='product-']")
+    ROW_NAME = css(".cart_description h4 a")
+    ROW_PRICE = css(".cart_price p")
+    ROW_QUANTITY = css(".cart_quantity button")
+    ROW_TOTAL = css(".cart_total_price")
+
+
+class LoginPage:
+    SIGNUP_NAME = Locator(By.NAME, "name")
+    SIGNUP_EMAIL = css("input[data-qa='signup-email']")
+    SIGNUP_BUTTON = css("button[data-qa='signup-button']")
+    LOGIN_EMAIL = css("input[data-qa='login-email']")
+    LOGIN_PASSWORD = css("input[data-qa='login-password']")
+    LOGIN_BUTTON = css("button[data-qa='login-button']")
+    LOGIN_ERROR = xpath("//p[contains(text(),'Your email or password is incorrect')]")
+
+
+class TestCasesPage:
+    __test__ = False  # לא מחלקת בדיקה של pytest
+
+    PANELS = Locator(By.CLASS_NAME, "panel-group")
+    ACCORDION_HEADERS = css("#form h4 a")
+    PANEL_BODY = css("#form div#collapse{number}")
+
+
+# ===================== Element Cache =====================
+# אלמנטים שנמצאו בעמוד הנוכחי, לכל driver. המטמון מתאפס בכל ניווט (navigate / wait_for_navigation).
+# ניווט שלא עבר דרך ה-helpers (לחיצה על קישור, redirect) מתגלה בבדיקת הלחיצות על האלמנט השמור:
+# אלמנט מהמסמך הקודם הוא stale, והוא מוסר ונמצא מחדש - בלי round trip נוסף בשליפה מהמטמון.
+
+_cache = weakref.WeakKeyDictionary()
+# {element: locator} - לפיו retry_on_stale מאתר מחדש אלמנט שנעשה stale
+_element_locators = weakref.WeakKeyDictionary()
+_cache_stats = {"hits": 0, "misses": 0, "stale": 0}
+
+
+def get_cached(driver: WebDriver, locator: tuple):
+    elements = _cache.get(driver)
+    element = elements.get(tuple(locator)) if elements else None
+    _cache_stats["hits" if element is not None else "misses"] += 1
+    return element
+
+
+def remember(driver: WebDriver, locator: tuple, element: WebElement):
+    _cache.setdefault(driver, {})[tuple(locator)] = element
+    track(element, locator)
+
+
+def track(element: WebElement, locator: tuple):
+    """רושם את ה-locator שדרכו נמצא האלמנט (בלי לשמור את האלמנט במטמון)."""
+    _element_locators[element] = tuple(locator)
+
+
+def locator_of(element: WebElement):
+    """ה-locator שדרכו נמצא האלמנט, או None אם לא נמצא דרך ה-helpers."""
+    try:
+        return _element_locators.get(element)
+    except TypeError:  # אובייקט שלא ניתן ל-weakref / hash
+        return None
+
+
+def forget(driver: WebDriver, locator: tuple):
+    """מסיר אלמנט שנעשה stale מהמטמון (נספר רק אם באמת היה שמור בו)."""
+    if _cache.get(driver, {}).pop(tuple(locator), None) is not None:
+        _cache_stats["stale"] += 1
+
+
+def invalidate(driver: WebDriver):
+    """מנקה את כל האלמנטים של ה-driver - נקרא אחרי כל ניווט."""
+    _cache.pop(driver, None)
+
+
+def get_cache_stats() -> dict:
+    return dict(_cache_stats)
+
+
+# ===================== Benchmark =====================
+# ה-XPaths הישנים מגוף הבדיקות מול ה-locators של המרשם, על אותו עמוד
+
+BENCHMARK_CASES = [
+    ("/", "clickables", (By.XPATH, "//a | //button"), HomePage.CLICKABLES),
+    ("/", "products link", (By.XPATH, "//a[contains(text(),'Products')]"), Header.PRODUCTS),
+    ("/products", "women category", (By.XPATH, "//a[@href='#Women']"), ProductsPage.WOMEN_CATEGORY),
+    ("/products", "add to cart (card)", (By.XPATH, "//a[@data-product-id='1']"), ProductsPage.ADD_TO_CART(product_id=1)),
+    ("/products", "first product name", (By.XPATH, "(//div[@class='productinfo text-center']/p)[1]"),
+     ProductsPage.FIRST_PRODUCT_NAME),
+    ("/product_details/1", "add to cart (details)",
+     (By.XPATH, "//button[contains(., 'Add to cart') and i[@class='fa fa-shopping-cart']]"),
+     ProductDetailsPage.ADD_TO_CART),
+    ("/login", "login email", (By.XPATH, "//input[@data-qa='login-email']"), LoginPage.LOGIN_EMAIL),
+    ("/test_cases", "accordion headers", (By.XPATH, "//*[@id='form']//h4/a"), TestCasesPage.ACCORDION_HEADERS),
+]
+
+_EVALUATION_COST_JS = """
+const [by, selector, iterations] = arguments;
+const started = performance.now();
+for (let i = 0; i < iterations; i++) {
+    if (by === 'xpath') {
+        document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    } else {
+        document.querySelectorAll(selector);
+    }
+}
+return (performance.now() - started) * 1000 / iterations;
+"""
+
+
+def measure_lookup_cost(driver: WebDriver, base_url: str, iterations: int = 2000, repeats: int = 20) -> str:
+    """משווה את עלות החיפוש: הערכת ה-selector בדפדפן (מיקרו-שניות), ו-wait_for_clickable בלי מטמון
+    מול עם מטמון (מילי-שניות, כולל round trips)."""
+    from .actions import wait_for_clickable
+
+    lines = [f"{'lookup':<24}{'xpath (us)':>12}{'registry (us)':>15}{'uncached (ms)':>15}{'cached (ms)':>13}"]
+    for path, label, legacy, locator in BENCHMARK_CASES:
+        driver.get(base_url + path)
+        invalidate(driver)
+        legacy_cost = driver.execute_script(_EVALUATION_COST_JS, legacy[0], legacy[1], iterations)
+        registry_cost = driver.execute_script(_EVALUATION_COST_JS, locator.by, locator.value, iterations)
+
+        timings = {}
+        for use_cache in (False, True):
+            wait_for_clickable(driver, *locator, cache=use_cache)
+            started = time.perf_counter()
+            for _ in range(repeats):
+                wait_for_clickable(driver, *locator, cache=use_cache)
+            timings[use_cache] = (time.perf_counter() - started) * 1000 / repeats
+        lines.append(f"{label:<24}{legacy_cost:>12.1f}{registry_cost:>15.1f}{timings[False]:>15.2f}{timings[True]:>13.2f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    from selenium import webdriver
+    from .stand_in_server import StandInServer
+
+    server = StandInServer()
+    server.start()
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=options)
+    try:
+        print(measure_lookup_cost(driver, server.base_url))
+    finally:
+        driver.quit()
+        server.stop()
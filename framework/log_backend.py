@@ -0,0 +1,285 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import pickle
+import queue
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from colorama import init, Fore, Style
+from .logger import SUCCESS
+
+# 💡 מודול זה נטען רק בקריאת הלוג הראשונה (ראה framework/logger.py), כך ש-import של framework זול וללא תופעות לוואי
+
+# --- הגדרות (ניתנות לשינוי דרך משתני סביבה) ---
+# רמת הקובץ ורמת הקונסול נפרדות: אפשר לכתוב הכל לקובץ ולהציג בקונסול רק אזהרות ומעלה
+FILE_LEVEL = os.environ.get("LOG_FILE_LEVEL", "INFO").upper()
+CONSOLE_LEVEL = os.environ.get("LOG_CONSOLE_LEVEL", "DEBUG").upper()
+# דגימת הודעות SUCCESS בקונסול: 1 = כולן, N = אחת מכל N, 0 = אף אחת (בקובץ נכתבות כולן)
+CONSOLE_SUCCESS_SAMPLE = int(os.environ.get("LOG_CONSOLE_SUCCESS_SAMPLE", "1"))
+# כתיבה לקובץ במנות: עד BATCH_SIZE רשומות או FLUSH_INTERVAL שניות, המוקדם מביניהם
+BATCH_SIZE = int(os.environ.get("LOG_BATCH_SIZE", "50"))
+FLUSH_INTERVAL = float(os.environ.get("LOG_FLUSH_INTERVAL", "1.0"))
+
+# מזהה הריצה (שם קובץ הלוג) ופורט שרת הלוגים עוברים לתהליכי ה-workers דרך משתני סביבה
+RUN_ID_ENV = "TEST_RUN_ID"
+LOG_SERVER_PORT_ENV = "LOG_SERVER_PORT"
+LOG_DIR = "logs"
+
+FILE_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# עיצוב קונסול לפי סוג ההודעה: (צבע, תבנית)
+CONSOLE_STYLES = {
+    "DEBUG": (Fore.BLUE, "🐞 DEBUG: {}"),
+    "INFO": (Fore.CYAN, "ℹ️  INFO: {}"),
+    "SUCCESS": (Fore.GREEN, "✅ SUCCESS: {}"),
+    "WARNING": (Fore.YELLOW, "⚠️  WARNING: {}"),
+    "ERROR": (Fore.RED, "❌ ERROR: {}"),
+    "test_start": (Fore.MAGENTA, "🚀 {}"),
+    "test_passed": (Fore.GREEN, "✅ {}"),
+    "test_failed": (Fore.RED, "❌ {}"),
+}
+
+
+# ===================== Handlers (רצים ב-thread הרקע) =====================
+
+class ColorConsoleHandler(logging.Handler):
+    """מדפיס הודעות צבעוניות לקונסול. הצביעה והפורמט מתבצעים ב-thread של ה-listener."""
+
+    def emit(self, record):
+        try:
+            color, template = CONSOLE_STYLES.get(getattr(record, "style", None) or record.levelname,
+                                                 CONSOLE_STYLES["INFO"])
+            print(f"{color}{template.format(record.getMessage())}{Style.RESET_ALL}")
+        except Exception:
+            self.handleError(record)
+
+
+class FastQueueHandler(logging.handlers.QueueHandler):
+    """מכניס את הרשומה לתור כמות שהיא - בלי format ו-copy ב-thread הבדיקה (ההודעות כבר מחרוזות מוכנות)."""
+
+    def prepare(self, record):
+        return record
+
+
+class SuccessSampler(logging.Filter):
+    """מעביר לקונסול רק הודעת SUCCESS אחת מכל `rate` (0 = אף אחת)."""
+
+    def __init__(self, rate: int):
+        super().__init__()
+        self.rate = rate
+        self._count = 0
+
+    def filter(self, record):
+        if record.levelno != SUCCESS:
+            return True
+        if self.rate <= 0:
+            return False
+        self._count += 1
+        return (self._count - 1) % self.rate == 0
+
+
+class LocalOnlyFilter(logging.Filter):
+    """מסנן רשומות שהגיעו מ-workers אחרים - הן כבר הודפסו בקונסול של ה-worker."""
+
+    def filter(self, record):
+        return not getattr(record, "remote", False)
+
+
+class FileOnlyFilter(logging.Filter):
+    """מסנן רשומות שנכתבו דרך log_to_file - הן כבר מודפסות בקונסול על ידי pytest."""
+
+    def filter(self, record):
+        return not getattr(record, "file_only", False)
+
+
+class BatchingHandler(logging.handlers.MemoryHandler):
+    """צובר רשומות וכותב אותן ליעד במנות - לפי גודל, זמן, או מיד עבור ERROR."""
+
+    def __init__(self, capacity, target, flush_interval):
+        super().__init__(capacity, flushLevel=logging.ERROR, target=target, flushOnClose=True)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def shouldFlush(self, record):
+        return (super().shouldFlush(record)
+                or time.monotonic() - self._last_flush >= self.flush_interval)
+
+    def flush(self):
+        super().flush()
+        self._last_flush = time.monotonic()
+
+
+class FlushingQueueListener(logging.handlers.QueueListener):
+    """QueueListener שכותב את המנה שנצברה גם כשלא מגיעות רשומות חדשות: בדיקה תקועה או שקטה
+    לא משאירה את השורות האחרונות שלה בזיכרון - FLUSH_INTERVAL חוסם את העיכוב בקובץ."""
+
+    def __init__(self, log_queue, *handlers, flush_interval: float, respect_handler_level: bool = False):
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block):
+        if not block:
+            return super().dequeue(block)
+        while True:
+            try:
+                return self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                for handler in self.handlers:
+                    if isinstance(handler, BatchingHandler) and handler.buffer:
+                        handler.flush()
+
+
+def _build_console_handler():
+    console_handler = ColorConsoleHandler()
+    console_handler.setLevel(CONSOLE_LEVEL)
+    console_handler.addFilter(LocalOnlyFilter())
+    console_handler.addFilter(FileOnlyFilter())
+    console_handler.addFilter(SuccessSampler(CONSOLE_SUCCESS_SAMPLE))
+    return console_handler
+
+
+def _build_handlers(log_file_path):
+    """יוצר את ה-handlers של הקובץ והקונסול לפי ההגדרות."""
+    file_handler = logging.FileHandler(log_file_path, mode="a", encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+    file_handler.setLevel(FILE_LEVEL)
+    batching_handler = BatchingHandler(BATCH_SIZE, file_handler, FLUSH_INTERVAL)
+    batching_handler.setLevel(FILE_LEVEL)
+    return [batching_handler, _build_console_handler()]
+
+
+# ===================== אתחול =====================
+
+_log_queue = queue.SimpleQueue()
+_handlers = []
+_listener = None
+_log_server = None
+
+
+def get_log_file_path() -> str:
+    """קובץ לוג אחד לכל ריצה: המזהה נקבע בתהליך הראשי ועובר בירושה ל-workers."""
+    run_id = os.environ.setdefault(RUN_ID_ENV, datetime.now().strftime("%Y%m%d_%H%M%S"))
+    return os.path.join(LOG_DIR, f"test_run_{run_id}.log")
+
+
+def configure(logger: logging.Logger, to_file: bool = True):
+    """מחבר את ה-logger לתור ומפעיל את ה-listener ברקע.
+    ב-worker של pytest-xdist הרשומות נשלחות בסוקט לכותב היחיד בתהליך הראשי במקום לפתוח קובץ נוסף.
+    עם to_file=False הלוג נכתב לקונסול בלבד."""
+    global _handlers, _listener
+    init(autoreset=True)
+
+    server_port = os.environ.get(LOG_SERVER_PORT_ENV)
+    if server_port and _log_server is None:
+        socket_handler = logging.handlers.SocketHandler("127.0.0.1", int(server_port))
+        socket_handler.setLevel(FILE_LEVEL)
+        _handlers = [socket_handler, _build_console_handler()]
+    elif to_file:
+        os.makedirs(LOG_DIR, exist_ok=True)
+        _handlers = _build_handlers(get_log_file_path())
+    else:
+        _handlers = [_build_console_handler()]
+
+    # 💡 ה-thread שמריץ את הבדיקות רק מכניס רשומה לתור; פורמט, צבע וכתיבה לקובץ נעשים ברקע
+    _listener = FlushingQueueListener(_log_queue, *_handlers, flush_interval=FLUSH_INTERVAL,
+                                      respect_handler_level=True)
+    _listener.start()
+    logger.addHandler(FastQueueHandler(_log_queue))
+    atexit.register(_shutdown)
+
+
+def flush():
+    """מרוקן את התור וכותב לקובץ את כל מה שנצבר."""
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _handlers:
+        handler.flush()
+    _listener.start()
+
+
+def _shutdown():
+    if _listener is not None:
+        _listener.stop()
+    for handler in _handlers:
+        handler.close()
+
+
+# ===================== שרת לוגים (כותב יחיד לכל ה-workers) =====================
+
+class _LogRecordStreamHandler(socketserver.StreamRequestHandler):
+    """מקבל רשומות מ-SocketHandler של worker ומכניס אותן לתור של התהליך הראשי."""
+
+    def handle(self):
+        while True:
+            header = self.rfile.read(4)
+            if len(header) < 4:
+                break
+            length = struct.unpack(">L", header)[0]
+            record = logging.makeLogRecord(pickle.loads(self.rfile.read(length)))
+            record.remote = True
+            _log_queue.put(record)
+
+
+def start_log_server(logger: logging.Logger, to_file: bool = True) -> int:
+    """מפעיל שרת TCP מקומי שמקבל רשומות מה-workers ומחזיר את הפורט שלו.
+    הפורט נשמר במשתנה סביבה כדי שה-workers שיופעלו אחר כך ישלחו אליו."""
+    global _log_server
+    if _log_server is not None:
+        return _log_server.server_address[1]
+
+    _log_server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _LogRecordStreamHandler)
+    _log_server.daemon_threads = True
+    if _listener is None:
+        configure(logger, to_file=to_file)
+    threading.Thread(target=_log_server.serve_forever, name="log-server", daemon=True).start()
+    # נרשם אחרי ה-listener ולכן נסגר לפניו (atexit רץ בסדר הפוך)
+    atexit.register(_log_server.shutdown)
+
+    port = _log_server.server_address[1]
+    os.environ[LOG_SERVER_PORT_ENV] = str(port)
+    return port
+
+
+# ===================== מדידת תקורת הלוגים =====================
+
+def measure_logging_overhead(iterations: int = 2000) -> dict:
+    """מודד את הזמן הממוצע לקריאת log_success ב-thread הבדיקה: סינכרוני (כמו בעבר) מול תור אסינכרוני."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        handlers = _build_handlers(os.path.join(tmp, "overhead.log"))
+
+        bench_logger = logging.getLogger("automation.overhead")
+        bench_logger.propagate = False
+        bench_logger.setLevel(logging.DEBUG)
+
+        # לפני: print צבעוני + כתיבה לקובץ באותו thread
+        sync_file = logging.FileHandler(os.path.join(tmp, "sync.log"), encoding="utf-8")
+        sync_file.setFormatter(logging.Formatter(FILE_FORMAT))
+        bench_logger.handlers = [sync_file, ColorConsoleHandler()]
+        start = time.perf_counter()
+        for i in range(iterations):
+            bench_logger.log(SUCCESS, f"אלמנט {i} גלוי ופעיל.")
+        results["sync"] = (time.perf_counter() - start) / iterations
+        sync_file.close()
+
+        # אחרי: הכנסה לתור בלבד
+        bench_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(bench_queue, *handlers, respect_handler_level=True)
+        bench_logger.handlers = [FastQueueHandler(bench_queue)]
+        listener.start()
+        start = time.perf_counter()
+        for i in range(iterations):
+            bench_logger.log(SUCCESS, f"אלמנט {i} גלוי ופעיל.")
+        results["async"] = (time.perf_counter() - start) / iterations
+        listener.stop()
+        for handler in handlers:
+            handler.close()
+        bench_logger.handlers = []
+    return results
@@ -1,55 +1,96 @@
 import logging
-import os
-from datetime import datetime
-from colorama import init, Fore, Style
+import threading
 
-init(autoreset=True)
+# 💡 ה-import של מודול זה אינו יוצר תיקיות, קבצים או threads.
+# ה-backend (framework/log_backend.py) נטען ומוגדר רק בקריאת הלוג הראשונה.
 
-# יצירת תיקיית logs אם לא קיימת
-os.makedirs("logs", exist_ok=True)
+SUCCESS = 25
+logging.addLevelName(SUCCESS, "SUCCESS")
 
-# יצירת שם קובץ עם תאריך ושעה
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-log_file_path = os.path.join("logs", f"test_run_{timestamp}.log")
+logger = logging.getLogger("automation")
+logger.setLevel(logging.DEBUG)
+# 💡 propagate נשאר פעיל: ה-handlers של pytest (caplog והלוג המצורף לכישלונות בדוח) יושבים על ה-root logger
 
-# הגדרת לוגר בסיסי
-logging.basicConfig(
-    level=logging.INFO,  # שים לב: INFO מופעל
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    filename=log_file_path,
-    filemode="a",
-    encoding="utf-8"
-)
+_configured = False
+_configure_lock = threading.Lock()
+_file_logging = True
+
+
+def _ensure_configured():
+    global _configured
+    if _configured:
+        return
+    with _configure_lock:
+        if not _configured:
+            from . import log_backend
+            log_backend.configure(logger, to_file=_file_logging)
+            _configured = True
+
+
+def start_log_server() -> int:
+    """מפעיל בתהליך הראשי את הכותב היחיד שאליו ישלחו ה-workers של pytest-xdist את הלוגים."""
+    global _configured
+    from . import log_backend
+    with _configure_lock:
+        port = log_backend.start_log_server(logger, to_file=_file_logging)
+        _configured = True
+    return port
+
+
+def disable_file_logging():
+    """לוג לקונסול בלבד, בלי ליצור את logs/ (למשל ב-pytest --collect-only). נקרא לפני הלוג הראשון."""
+    global _file_logging
+    _file_logging = False
+
+
+def flush_logs():
+    """מרוקן את התור וכותב לקובץ את כל מה שנצבר (נקרא אוטומטית ביציאה)."""
+    if _configured:
+        from . import log_backend
+        log_backend.flush()
 
-logger = logging.getLogger()
 
 # --- פונקציות לוג צבעוניות ---
 def log_debug(message):
-    print(f"{Fore.BLUE}🐞 DEBUG: {message}{Style.RESET_ALL}")
+    _ensure_configured()
     logger.debug(message)
 
 def log_info(message):
-    print(f"{Fore.CYAN}ℹ️  INFO: {message}{Style.RESET_ALL}")
+    _ensure_configured()
     logger.info(message)
 
 def log_success(message):
-    print(f"{Fore.GREEN}✅ SUCCESS: {message}{Style.RESET_ALL}")
-    logger.info(f"SUCCESS: {message}")
+    _ensure_configured()
+    logger.log(SUCCESS, message)
 
 def log_warning(message):
-    print(f"{Fore.YELLOW}⚠️  WARNING: {message}{Style.RESET_ALL}")
+    _ensure_configured()
     logger.warning(message)
 
 def log_error(message):
-    print(f"{Fore.RED}❌ ERROR: {message}{Style.RESET_ALL}")
+    _ensure_configured()
     logger.error(message)
 
+def log_to_file(message):
+    """כותב לקובץ הלוג בלבד - לטבלאות שכבר מודפסות בקונסול דרך ה-terminal reporter של pytest."""
+    _ensure_configured()
+    logger.info(message, extra={"file_only": True})
+
 def log_test_start(test_name):
-    print(f"{Fore.MAGENTA}🚀 STARTING TEST: {test_name}{Style.RESET_ALL}")
-    logger.info(f"STARTING TEST: {test_name}")
+    _ensure_configured()
+    logger.info(f"STARTING TEST: {test_name}", extra={"style": "test_start"})
 
 def log_test_end(test_name, status):
-    status_icon = "✅" if status.lower() == "passed" else "❌"
-    color = Fore.GREEN if status.lower() == "passed" else Fore.RED
-    print(f"{color}{status_icon} ENDING TEST: {test_name} - {status.upper()}{Style.RESET_ALL}")
-    logger.info(f"ENDING TEST: {test_name} - {status.upper()}")
+    _ensure_configured()
+    passed = status.lower() == "passed"
+    logger.info(f"ENDING TEST: {test_name} - {status.upper()}",
+                extra={"style": "test_passed" if passed else "test_failed"})
+
+
+if __name__ == "__main__":
+    from .log_backend import measure_logging_overhead
+
+    overhead = measure_logging_overhead()
+    print(f"⏱️ תקורת log_success לקריאה: סינכרוני {overhead['sync'] * 1e6:.1f}µs | "
+          f"אסינכרוני {overhead['async'] * 1e6:.1f}µs "
+          f"(פי {overhead['sync'] / overhead['async']:.1f})")
@@ -0,0 +1,35 @@
+from selenium.webdriver.remote.webdriver import WebDriver
+from .logger import log_info
+
+# 💡 דומיינים של פרסומות, אנליטיקס ופונטים - נחסמים ברמת הרשת לפני שהם נטענים ומעכבים את הדף
+DEFAULT_BLOCKLIST = (
+    "*googlesyndication.com*",
+    "*doubleclick.net*",
+    "*googleadservices.com*",
+    "*adservice.google.*",
+    "*fundingchoicesmessages.google.com*",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*amazon-adsystem.com*",
+    "*facebook.net*",
+    "*fonts.googleapis.com*",
+    "*fonts.gstatic.com*",
+)
+
+# לבדיקות שאינן בודקות תצוגה
+IMAGE_PATTERNS = ("*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*")
+
+
+def set_blocked_urls(driver: WebDriver, patterns):
+    """חוסם בקשות רשת לפי תבניות (עם *) דרך CDP. רשימה ריקה מבטלת את החסימה."""
+    patterns = list(patterns)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    # remove_all_overlays בודק את זה כדי לדלג על ניקוי מיותר
+    driver.blocked_url_patterns = patterns
+    if patterns:
+        log_info(f"🛡️ חסימת {len(patterns)} תבניות URL פעילה")
+
+
+def is_request_blocking_enabled(driver: WebDriver) -> bool:
+    return bool(getattr(driver, "blocked_url_patterns", None))
@@ -0,0 +1,271 @@
+import argparse
+import json
+import math
+import os
+import sqlite3
+import subprocess
+import time
+from contextlib import closing
+from statistics import mean, stdev
+
+# 💡 היסטוריית ביצועים מקומית: כל ריצה נשמרת עם ה-commit והתצורה שלה, כך שאפשר להשוות זמני בדיקות
+#    ופעולות מול baseline ולתפוס helper או שינוי באתר שמוסיפים שניות לריצה הלילית.
+
+DB_PATH = os.environ.get("PERF_HISTORY_DB", os.path.join("reports", "perf_history.sqlite"))
+
+# האטה מסומנת רק אם היא גם מובהקת (t >= SIGNIFICANCE_T) וגם משמעותית בפועל
+SIGNIFICANCE_T = 2.0
+MIN_RELATIVE_SLOWDOWN = 0.10
+MIN_ABSOLUTE_SLOWDOWN = 0.25  # שניות
+
+# בדיקה עוברת להסגר כשהיא flaky (נכשלה ועברה בריצה חוזרת) בלפחות MIN_FLAKY_RUNS מתוך FLAKY_WINDOW
+# הריצות האחרונות שלה, ובשיעור של FLAKY_THRESHOLD ומעלה; היא יוצאת מההסגר כשהשיעור יורד
+FLAKY_WINDOW = 20
+FLAKY_THRESHOLD = float(os.environ.get("FLAKY_THRESHOLD", 0.2))
+MIN_FLAKY_RUNS = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT,
+    commit_sha TEXT,
+    config_key TEXT,
+    config TEXT,
+    started REAL,
+    duration REAL,
+    exitstatus INTEGER
+);
+CREATE TABLE IF NOT EXISTS test_timings (
+    run INTEGER REFERENCES runs(id),
+    nodeid TEXT,
+    outcome TEXT,
+    duration REAL
+);
+CREATE TABLE IF NOT EXISTS action_timings (
+    run INTEGER REFERENCES runs(id),
+    nodeid TEXT,
+    action TEXT,
+    calls INTEGER,
+    total REAL
+);
+CREATE INDEX IF NOT EXISTS runs_by_config ON runs (config_key, started);
+CREATE INDEX IF NOT EXISTS tests_by_run ON test_timings (run);
+CREATE INDEX IF NOT EXISTS actions_by_run ON action_timings (run);
+"""
+
+
+def connect(path: str = None) -> sqlite3.Connection:
+    path = path or DB_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.executescript(_SCHEMA)
+    return connection
+
+
+def current_commit() -> str:
+    """ה-commit הנוכחי (GIT_COMMIT גובר), עם '+dirty' כשיש שינויים שלא נשמרו."""
+    if os.environ.get("GIT_COMMIT"):
+        return os.environ["GIT_COMMIT"]
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                               text=True).stdout.strip()
+        return sha + ("+dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def config_key(config: dict) -> str:
+    """מפתח יציב לתצורה: ריצות מושוות רק מול ריצות עם אותה תצורה."""
+    return "|".join(f"{key}={config[key]}" for key in sorted(config))
+
+
+# ===================== Recording =====================
+
+def record_run(run_id: str, config: dict, started: float, exitstatus: int, tests: dict, actions: list,
+               path: str = None) -> int:
+    """שומר ריצה: tests = {nodeid: (outcome, duration)}, actions = [(nodeid, action, calls, total)]."""
+    with closing(connect(path)) as connection, connection:
+        cursor = connection.execute(
+            "INSERT INTO runs (run_id, commit_sha, config_key, config, started, duration, exitstatus) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (run_id, current_commit(), config_key(config), json.dumps(config, sort_keys=True), started,
+             time.time() - started, exitstatus),
+        )
+        run = cursor.lastrowid
+        connection.executemany("INSERT INTO test_timings VALUES (?, ?, ?, ?)",
+                               [(run, nodeid, outcome, duration) for nodeid, (outcome, duration) in tests.items()])
+        connection.executemany("INSERT INTO action_timings VALUES (?, ?, ?, ?, ?)",
+                               [(run,) + tuple(action) for action in actions])
+    return run
+
+
+# ===================== Comparison =====================
+
+def _runs(connection, key: str, commit: str = None, before: int = None, limit: int = 5) -> list:
+    query = "SELECT id FROM runs WHERE config_key = ?"
+    params = [key]
+    if commit:
+        query += " AND commit_sha LIKE ?"
+        params.append(commit + "%")
+    if before:
+        query += " AND id < ?"
+        params.append(before)
+    query += " ORDER BY id DESC LIMIT ?"
+    params.append(limit)
+    return [row[0] for row in connection.execute(query, params)]
+
+
+def _samples(connection, runs: list, table: str, name_column: str, value_column: str) -> dict:
+    if not runs:
+        return {}
+    placeholders = ",".join("?" * len(runs))
+    samples = {}
+    for name, value in connection.execute(
+            f"SELECT {name_column}, SUM({value_column}) FROM {table} WHERE run IN ({placeholders}) "
+            f"GROUP BY run, {name_column}", runs):
+        samples.setdefault(name, []).append(value)
+    return samples
+
+
+def _t_statistic(baseline: list, current: list):
+    """Welch t; עם דגימה נוכחית אחת - מרחק ממוצע ה-baseline ביחידות של prediction interval."""
+    if len(baseline) < 2:
+        return None
+    base_mean, base_sd = mean(baseline), stdev(baseline)
+    if len(current) < 2:
+        spread = base_sd * math.sqrt(1 + 1 / len(baseline))
+    else:
+        spread = math.sqrt(base_sd ** 2 / len(baseline) + stdev(current) ** 2 / len(current))
+    delta = mean(current) - base_mean
+    if spread == 0:
+        return math.inf if delta > 0 else (-math.inf if delta < 0 else 0.0)
+    return delta / spread
+
+
+def compare(key: str = None, current_commit_sha: str = None, baseline_commit: str = None,
+            current_runs: int = 1, baseline_runs: int = 5, actions: bool = False, path: str = None) -> dict:
+    """משווה את הריצות האחרונות (current_runs) מול baseline: ריצות של baseline_commit, או ברירת מחדל -
+    הריצות שקדמו להן באותה תצורה. מחזיר {"current", "baseline", "rows"} כשכל שורה מסומנת אם ההאטה מובהקת."""
+    with closing(connect(path)) as connection, connection:
+        if key is None:
+            row = connection.execute("SELECT config_key FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+            if row is None:
+                return {"current": [], "baseline": [], "rows": []}
+            key = row[0]
+        current = _runs(connection, key, commit=current_commit_sha, limit=current_runs)
+        if baseline_commit:
+            baseline = _runs(connection, key, commit=baseline_commit, limit=baseline_runs)
+        else:
+            baseline = _runs(connection, key, before=min(current) if current else None, limit=baseline_runs)
+
+        table, name = ("action_timings", "action") if actions else ("test_timings", "nodeid")
+        value = "total" if actions else "duration"
+        current_samples = _samples(connection, current, table, name, value)
+        baseline_samples = _samples(connection, baseline, table, name, value)
+
+    rows = []
+    for item, samples in current_samples.items():
+        base = baseline_samples.get(item)
+        if not base:
+            rows.append({"name": item, "current": mean(samples), "baseline": None, "delta": None,
+                         "t": None, "slower": False})
+            continue
+        delta = mean(samples) - mean(base)
+        t = _t_statistic(base, samples)
+        slower = (t is not None and t >= SIGNIFICANCE_T and delta >= MIN_ABSOLUTE_SLOWDOWN
+                  and delta >= MIN_RELATIVE_SLOWDOWN * mean(base))
+        rows.append({"name": item, "current": mean(samples), "baseline": mean(base), "delta": delta,
+                     "t": t, "slower": slower})
+    rows.sort(key=lambda row: -(row["delta"] or 0))
+    return {"config_key": key, "current": current, "baseline": baseline, "rows": rows}
+
+
+# ===================== Flaky Tests =====================
+
+def flake_rates(window: int = FLAKY_WINDOW, path: str = None) -> dict:
+    """{nodeid: (flaky, runs)} על פני window הריצות האחרונות של כל בדיקה (ריצות שבהן דילגה לא נספרות)."""
+    rates = {}
+    with closing(connect(path)) as connection, connection:
+        for nodeid, outcome in connection.execute(
+                "SELECT nodeid, outcome FROM test_timings WHERE outcome IN ('passed', 'flaky', 'failed') "
+                "ORDER BY run DESC"):
+            flaky, runs = rates.get(nodeid, (0, 0))
+            if runs < window:
+                rates[nodeid] = (flaky + (outcome == "flaky"), runs + 1)
+    return rates
+
+
+def quarantined_tests(threshold: float = FLAKY_THRESHOLD, window: int = FLAKY_WINDOW, path: str = None) -> dict:
+    """הבדיקות שבהסגר לפי ההיסטוריה: {nodeid: שיעור flaky}."""
+    return {nodeid: flaky / runs for nodeid, (flaky, runs) in flake_rates(window, path).items()
+            if flaky >= MIN_FLAKY_RUNS and flaky / runs >= threshold}
+
+
+def format_flaky(threshold: float = FLAKY_THRESHOLD, window: int = FLAKY_WINDOW, path: str = None) -> str:
+    rates = {nodeid: counts for nodeid, counts in flake_rates(window, path).items() if counts[0]}
+    if not rates:
+        return f"אין בדיקות flaky ב-{window} הריצות האחרונות."
+    quarantined = quarantined_tests(threshold, window, path)
+    lines = [f"{'':<3}{'test':<80}{'flaky':>7}{'runs':>6}{'rate':>7}"]
+    for nodeid, (flaky, runs) in sorted(rates.items(), key=lambda item: -item[1][0] / item[1][1]):
+        flag = "🚧" if nodeid in quarantined else ""
+        lines.append(f"{flag:<3}{nodeid[-80:]:<80}{flaky:>7}{runs:>6}{flaky / runs:>7.0%}")
+    lines.append(f"🚧 {len(quarantined)} בדיקות בהסגר (שיעור flaky ≥ {threshold:.0%}, לפחות {MIN_FLAKY_RUNS} ריצות flaky)")
+    return "\n".join(lines)
+
+
+def format_comparison(result: dict) -> str:
+    if not result["rows"]:
+        return "אין ריצות להשוואה בהיסטוריה."
+    if not result["baseline"]:
+        return f"אין עדיין ריצות baseline לתצורה: {result['config_key']}"
+    lines = [f"תצורה: {result['config_key']} | ריצות נוכחיות: {result['current']} | baseline: {result['baseline']}",
+             f"{'':<3}{'name':<70}{'baseline (s)':>13}{'current (s)':>12}{'delta (s)':>10}{'t':>7}"]
+    for row in result["rows"]:
+        flag = "🔺" if row["slower"] else ""
+        baseline = f"{row['baseline']:.2f}" if row["baseline"] is not None else "-"
+        delta = f"{row['delta']:+.2f}" if row["delta"] is not None else "new"
+        t = f"{row['t']:.1f}" if row["t"] is not None and math.isfinite(row["t"]) else "-"
+        lines.append(f"{flag:<3}{row['name'][-70:]:<70}{baseline:>13}{row['current']:>12.2f}{delta:>10}{t:>7}")
+    slower = sum(row["slower"] for row in result["rows"])
+    lines.append(f"🔺 {slower} האטות מובהקות" if slower else "✅ אין האטות מובהקות")
+    return "\n".join(lines)
+
+
+def format_runs(limit: int = 20, path: str = None) -> str:
+    with closing(connect(path)) as connection, connection:
+        rows = connection.execute(
+            "SELECT id, run_id, commit_sha, config_key, duration, exitstatus FROM runs ORDER BY id DESC LIMIT ?",
+            (limit,)).fetchall()
+    lines = [f"{'id':>5}  {'run':<17}{'commit':<16}{'duration (s)':>13}{'exit':>6}  config"]
+    for run, run_id, commit, key, duration, exitstatus in rows:
+        lines.append(f"{run:>5}  {run_id or '':<17}{commit:<16}{duration:>13.1f}{exitstatus:>6}  {key}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m framework.perf_history")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compare_parser = commands.add_parser("compare", help="השוואת הריצות האחרונות מול baseline")
+    compare_parser.add_argument("--baseline", help="commit של ה-baseline (ברירת מחדל: הריצות הקודמות)")
+    compare_parser.add_argument("--commit", help="commit של הריצות הנוכחיות (ברירת מחדל: האחרונות)")
+    compare_parser.add_argument("--config", help="מפתח תצורה (ברירת מחדל: של הריצה האחרונה)")
+    compare_parser.add_argument("--runs", type=int, default=1, help="מספר ריצות נוכחיות")
+    compare_parser.add_argument("--baseline-runs", type=int, default=5, help="מספר ריצות baseline")
+    compare_parser.add_argument("--actions", action="store_true", help="השוואה לפי פעולה במקום לפי בדיקה")
+    runs_parser = commands.add_parser("runs", help="רשימת הריצות האחרונות")
+    runs_parser.add_argument("--limit", type=int, default=20)
+    flaky_parser = commands.add_parser("flaky", help="שיעור ה-flaky של כל בדיקה והבדיקות שבהסגר")
+    flaky_parser.add_argument("--threshold", type=float, default=FLAKY_THRESHOLD)
+    flaky_parser.add_argument("--window", type=int, default=FLAKY_WINDOW)
+    args = parser.parse_args()
+
+    if args.command == "runs":
+        print(format_runs(args.limit))
+    elif args.command == "flaky":
+        print(format_flaky(args.threshold, args.window))
+    else:
+        print(format_comparison(compare(args.config, args.commit, args.baseline, args.runs, args.baseline_runs,
+                                        args.actions)))
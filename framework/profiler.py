@@ -0,0 +1,189 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.wait import WebDriverWait
+
+# 💡 פרופיילר אופציונלי (--profile-actions): כשהוא כבוי, עטיפת ה-helpers עולה בדיקת דגל אחת בלבד.
+
+_enabled = False
+_local = threading.local()
+_lock = threading.Lock()
+
+# {test: {name: {"calls", "total", "self", "round_trips", "polls"}}}
+_stats = {}
+# {"test;safe_click;webdriver:clickElement": self-time במיקרו-שניות} - פורמט folded של flame graph
+_folded = {}
+_current_test = "session"
+
+_original_execute = WebDriver.execute
+_original_until = WebDriverWait.until
+
+
+class _Frame:
+    __slots__ = ("name", "started", "children", "round_trips", "polls")
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.children = 0.0
+        self.round_trips = 0
+        self.polls = 0
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def _run_profiled(name, func, *args, **kwargs):
+    return _run_frame(_Frame(name), func, args, kwargs)
+
+
+def _run_frame(frame, func, args, kwargs):
+    stack = _stack()
+    stack.append(frame)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        stack.pop()
+        elapsed = time.perf_counter() - frame.started
+        if stack:
+            stack[-1].children += elapsed
+        _record(stack, frame, elapsed)
+
+
+def _record(stack, frame, elapsed):
+    self_time = elapsed - frame.children
+    folded_key = ";".join([_current_test] + [f.name for f in stack] + [frame.name])
+    with _lock:
+        entry = _stats.setdefault(_current_test, {}).setdefault(
+            frame.name, {"calls": 0, "total": 0.0, "self": 0.0, "round_trips": 0, "polls": 0}
+        )
+        entry["calls"] += 1
+        entry["total"] += elapsed
+        entry["self"] += self_time
+        entry["round_trips"] += frame.round_trips
+        entry["polls"] += frame.polls
+        _folded[folded_key] = _folded.get(folded_key, 0) + int(self_time * 1_000_000)
+
+
+def profiled(func):
+    """עוטף helper של framework כך שכל קריאה נמדדת כשהפרופיילר פעיל."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        return _run_profiled(func.__name__, func, *args, **kwargs)
+
+    return wrapper
+
+
+# ===================== Raw WebDriver commands & polls =====================
+
+def _profiled_execute(self, driver_command, params=None):
+    # כל פקודת WebDriver היא round trip אחד - נספר לכל ה-helpers שבמחסנית ולשורה של הפקודה עצמה
+    for frame in _stack():
+        frame.round_trips += 1
+    command = _Frame(f"webdriver:{driver_command}")
+    command.round_trips = 1
+    return _run_frame(command, _original_execute, (self, driver_command, params), {})
+
+
+def count_poll():
+    """נקרא בכל בדיקת תנאי של המתנה - נספר לכל ה-helpers שבמחסנית."""
+    if _enabled:
+        for frame in _stack():
+            frame.polls += 1
+
+
+def _profiled_until(self, method, message=""):
+    def counting_method(driver):
+        count_poll()
+        return method(driver)
+
+    return _original_until(self, counting_method, message)
+
+
+@contextmanager
+def count_round_trips():
+    """סופר את פקודות ה-WebDriver וה-polls בתוך הבלוק (ב-thread הנוכחי):
+    `with count_round_trips() as counter: ...` ואז counter.round_trips / counter.polls.
+    הפרופיילר מופעל לזמן הבלוק אם היה כבוי; הבלוק עצמו לא נרשם כשורה בסטטיסטיקה."""
+    was_enabled = _enabled
+    enable()
+    frame = _Frame("round_trips")
+    stack = _stack()
+    stack.append(frame)
+    try:
+        yield frame
+    finally:
+        stack.remove(frame)
+        if not was_enabled:
+            disable()
+
+
+def enable():
+    """מפעיל את הפרופיילר ועוטף את פקודות ה-WebDriver ואת ה-polling של WebDriverWait."""
+    global _enabled
+    _enabled = True
+    WebDriver.execute = _profiled_execute
+    WebDriverWait.until = _profiled_until
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    WebDriver.execute = _original_execute
+    WebDriverWait.until = _original_until
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_current_test(test_id: str):
+    """כל המדידות מכאן ואילך משויכות לבדיקה זו (שורש ה-flame graph)."""
+    global _current_test
+    _current_test = test_id
+
+
+# ===================== Reports =====================
+
+def get_test_stats(test_id: str) -> dict:
+    with _lock:
+        return {name: dict(entry) for name, entry in _stats.get(test_id, {}).items()}
+
+
+def format_ranked_table(stats: dict, limit: int = 20) -> str:
+    """טבלת hot-path: הפעולות מסודרות לפי זמן כולל."""
+    lines = [f"{'action':<40}{'calls':>7}{'total (s)':>11}{'self (s)':>10}{'round trips':>13}{'polls':>7}"]
+    ranked = sorted(stats.items(), key=lambda item: -item[1]["total"])[:limit]
+    for name, entry in ranked:
+        lines.append(f"{name[:40]:<40}{entry['calls']:>7}{entry['total']:>11.3f}{entry['self']:>10.3f}"
+                     f"{entry['round_trips']:>13}{entry['polls']:>7}")
+    return "\n".join(lines)
+
+
+def get_folded_stacks() -> dict:
+    with _lock:
+        return dict(_folded)
+
+
+def merge_folded_stacks(folded: dict):
+    """ממזג stacks שהגיעו מ-worker אחר (pytest-xdist)."""
+    with _lock:
+        for key, value in folded.items():
+            _folded[key] = _folded.get(key, 0) + value
+
+
+def write_folded_stacks(path: str):
+    """כותב קובץ folded stacks (שורה לכל stack: `frame;frame;frame מיקרו-שניות`),
+    שאפשר לפתוח ב-speedscope או ב-flamegraph.pl."""
+    with _lock:
+        lines = [f"{key.replace(' ', '_')} {value}" for key, value in sorted(_folded.items()) if value > 0]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
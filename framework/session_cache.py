@@ -0,0 +1,85 @@
+import json
+import time
+from typing import Callable
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from .logger import log_info, log_success, log_warning
+
+DEFAULT_ORIGIN = "https://automationexercise.com"
+
+# שדות שמותר להעביר ל-Network.setCookies (getCookies מחזיר שדות נוספים)
+_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+
+def is_logged_in(driver: WebDriver) -> bool:
+    """בדיקה זולה: האם מופיע קישור Logout בדף הנוכחי (בלי המתנה)."""
+    return bool(driver.find_elements(By.PARTIAL_LINK_TEXT, "Logout"))
+
+
+class SessionCache:
+    """שומר cookies ו-localStorage אחרי התחברות אחת ומשחזר אותם לדפדפן נקי, במקום לעבור שוב ב-UI."""
+
+    def __init__(self, origin: str = DEFAULT_ORIGIN):
+        self.origin = origin.rstrip("/")
+        self._snapshots = {}
+
+    def save(self, driver: WebDriver, key: str):
+        """שומר את מצב ההתחברות הנוכחי של הדפדפן תחת המפתח `key`."""
+        cookies = driver.execute_cdp_cmd("Network.getCookies", {"urls": [self.origin + "/"]})["cookies"]
+        local_storage = driver.execute_script(
+            "return location.origin === arguments[0] ? Object.assign({}, localStorage) : {};", self.origin
+        )
+        self._snapshots[key] = {
+            "cookies": [{k: c[k] for k in _COOKIE_FIELDS if k in c} for c in cookies],
+            "local_storage": local_storage,
+        }
+        log_info(f"💾 נשמר snapshot של session '{key}' ({len(cookies)} cookies)")
+
+    def invalidate(self, key: str):
+        self._snapshots.pop(key, None)
+
+    def restore(self, driver: WebDriver, key: str, probe: Callable[[WebDriver], bool] = is_logged_in) -> bool:
+        """משחזר snapshot לדפדפן ומאמת אותו בטעינת דף אחת. מחזיר False אם אין snapshot או שה-session פג."""
+        snapshot = self._snapshots.get(key)
+        if not snapshot:
+            return False
+
+        # 💡 cookies דרך CDP - בלי ניווט מקדים לדומיין
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": snapshot["cookies"]})
+
+        # localStorage נכתב לפני שהסקריפטים של הדף רצים, בטעינה הראשונה של ה-origin
+        script_id = None
+        if snapshot["local_storage"]:
+            script = (
+                f"if (location.origin === {json.dumps(self.origin)}) {{"
+                f" const items = {json.dumps(snapshot['local_storage'])};"
+                " for (const [k, v] of Object.entries(items)) localStorage.setItem(k, v); }"
+            )
+            script_id = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": script})["identifier"]
+        try:
+            driver.get(self.origin + "/")
+        finally:
+            if script_id:
+                driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id})
+
+        if probe(driver):
+            return True
+        log_warning(f"ה-session '{key}' פג תוקף - נדרשת התחברות מחדש")
+        self.invalidate(key)
+        return False
+
+    def login(self, driver: WebDriver, key: str, ui_login: Callable[[WebDriver], None],
+              probe: Callable[[WebDriver], bool] = is_logged_in) -> bool:
+        """מחבר את הדפדפן: משחזר מה-cache אם אפשר, אחרת מריץ את זרימת ה-UI ושומר snapshot.
+        מחזיר True אם ה-session שוחזר מה-cache."""
+        start = time.perf_counter()
+        if self.restore(driver, key, probe):
+            log_success(f"⚡ session '{key}' שוחזר מה-cache ({time.perf_counter() - start:.2f} שניות)")
+            return True
+
+        ui_login(driver)
+        if not probe(driver):
+            raise AssertionError(f"ההתחברות דרך ה-UI עבור '{key}' נכשלה")
+        self.save(driver, key)
+        log_info(f"🔐 התחברות דרך ה-UI עבור '{key}' ({time.perf_counter() - start:.2f} שניות)")
+        return False
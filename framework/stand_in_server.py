@@ -0,0 +1,265 @@
+import json
+import os
+import re
+import secrets
+import threading
+from html import escape
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from urllib.parse import parse_qs, urlsplit
+from .logger import log_info
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), "stand_in_pages")
+SESSION_COOKIE = "sessionid"
+
+# משתמש קיים מראש, לבדיקות התחברות מול השרת המקומי
+DEFAULT_USER = {"name": "QA User", "email": "qa@example.test", "password": "P@ssw0rd"}
+
+# /category_products/<id> כמו באתר האמיתי
+CATEGORIES = {1: "Women > Dress", 2: "Women > Tops", 3: "Men > Tshirts"}
+
+
+def _load_template(name: str) -> Template:
+    with open(os.path.join(PAGES_DIR, name), encoding="utf-8") as f:
+        return Template(f.read())
+
+
+def _load_json(name: str):
+    with open(os.path.join(PAGES_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ===================== Site State =====================
+
+class StandInSite:
+    """המצב המדומה של האתר: קטלוג, משתמשים רשומים, ועגלה + משתמש מחובר לכל session."""
+
+    def __init__(self):
+        self.products = {p["id"]: p for p in _load_json("products.json")}
+        self.test_cases = _load_json("test_cases.json")
+        self.templates = {name[:-5]: _load_template(name) for name in os.listdir(PAGES_DIR) if name.endswith(".html")}
+        self.users = {DEFAULT_USER["email"]: dict(DEFAULT_USER)}
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def session(self, session_id: str) -> dict:
+        with self.lock:
+            return self.sessions.setdefault(session_id, {"cart": {}, "user": None})
+
+    def render(self, session: dict, title: str, page: str, **values) -> str:
+        """מרכיב דף מלא: תבנית הדף בתוך ה-layout המשותף, עם קישורי החשבון לפי מצב ההתחברות."""
+        user = session["user"]
+        if user:
+            account_links = (
+                '<li><a href="/logout"><i class="fa fa-lock"></i> Logout</a></li>\n'
+                f'<li><a><i class="fa fa-user"></i> Logged in as <b>{escape(user["name"])}</b></a></li>'
+            )
+        else:
+            account_links = '<li><a href="/login"><i class="fa fa-lock"></i> Signup / Login</a></li>'
+        content = self.templates[page].safe_substitute(**values)
+        return self.templates["base"].safe_substitute(title=title, account_links=account_links, content=content)
+
+    def product_cards(self, category: str = None) -> str:
+        card = self.templates["product_card"]
+        return "\n".join(card.safe_substitute({k: escape(str(v)) for k, v in p.items()})
+                         for p in self.products.values() if category in (None, p["category"]))
+
+    def cart_rows(self, session: dict) -> str:
+        row = self.templates["cart_row"]
+        rows = []
+        for product_id, quantity in session["cart"].items():
+            product = self.products[product_id]
+            unit_price = int(re.sub(r"\D", "", product["price"]))
+            values = {k: escape(str(v)) for k, v in product.items()}
+            rows.append(row.safe_substitute(values, quantity=quantity, total=f"Rs. {unit_price * quantity}"))
+        return "\n".join(rows)
+
+    def test_case_panels(self) -> str:
+        panel = self.templates["test_case"]
+        return "\n".join(
+            panel.safe_substitute(
+                number=number,
+                title=escape(case["title"]),
+                steps="\n".join(f'<li class="list-group-item">{i}. {escape(step)}</li>'
+                                for i, step in enumerate(case["steps"], start=1)),
+            )
+            for number, case in enumerate(self.test_cases, start=1)
+        )
+
+
+# ===================== Request Handler =====================
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """מגיש את הדפים שהחבילה משתמשת בהם ומדמה עגלה והתחברות."""
+
+    site: StandInSite = None
+    # 💡 keep-alive: דפדפנים משתמשים שוב באותו חיבור (כל תשובה נשלחת עם Content-Length)
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # 💡 בלי הדפסה לכל בקשה - מאט ומציף את הקונסול
+        pass
+
+    # --- עזרים ---
+    def _session(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        session_id = cookie[SESSION_COOKIE].value if SESSION_COOKIE in cookie else None
+        new_cookie = session_id is None
+        if new_cookie:
+            session_id = secrets.token_hex(16)
+        return session_id, self.site.session(session_id), new_cookie
+
+    def _send(self, status: int, body: str = "", content_type: str = "text/html; charset=utf-8",
+              location: str = None, session_id: str = None, clear_session: bool = False):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if location:
+            self.send_header("Location", location)
+        if session_id:
+            self.send_header("Set-Cookie", f"{SESSION_COOKIE}={session_id}; Path=/; HttpOnly; SameSite=Lax")
+        if clear_session:
+            self.send_header("Set-Cookie", f"{SESSION_COOKIE}=; Path=/; Max-Age=0")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _form(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        fields = parse_qs(self.rfile.read(length).decode("utf-8"))
+        return {key: values[-1] for key, values in fields.items()}
+
+    # --- GET ---
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/") or "/"
+        session_id, session, new_cookie = self._session()
+        cookie = session_id if new_cookie else None
+        site = self.site
+
+        if path == "/":
+            self._send(200, site.render(session, "Home", "home", products=site.product_cards()), session_id=cookie)
+        elif path == "/products":
+            self._send(200, site.render(session, "All Products", "products", products=site.product_cards()),
+                       session_id=cookie)
+        elif re.fullmatch(r"/category_products/\d+", path):
+            category = CATEGORIES.get(int(path.rsplit("/", 1)[1]))
+            if not category:
+                self._send(404, "Category not found", content_type="text/plain")
+                return
+            self._send(200, site.render(session, f"{category} Products", "products",
+                                        products=site.product_cards(category)), session_id=cookie)
+        elif re.fullmatch(r"/product_details/\d+", path):
+            product = site.products.get(int(path.rsplit("/", 1)[1]))
+            if not product:
+                self._send(404, "Product not found", content_type="text/plain")
+                return
+            values = {k: escape(str(v)) for k, v in product.items()}
+            self._send(200, site.render(session, "Product Details", "product_details", **values), session_id=cookie)
+        elif re.fullmatch(r"/add_to_cart/\d+", path):
+            product_id = int(path.rsplit("/", 1)[1])
+            if product_id not in site.products:
+                self._send(404, "Product not found", content_type="text/plain")
+                return
+            quantity = parse_qs(url.query).get("quantity", ["1"])[0]
+            if not quantity.isdigit() or int(quantity) < 1:
+                self._send(400, "Invalid quantity", content_type="text/plain")
+                return
+            quantity = int(quantity)
+            with site.lock:
+                session["cart"][product_id] = session["cart"].get(product_id, 0) + quantity
+            self._send(200, "Added", content_type="text/plain", session_id=cookie)
+        elif path == "/view_cart":
+            empty = "" if session["cart"] else '<span id="empty_cart"><p class="text-center"><b>Cart is empty!</b></p></span>'
+            self._send(200, site.render(session, "Checkout", "view_cart", rows=site.cart_rows(session), empty=empty),
+                       session_id=cookie)
+        elif path == "/test_cases":
+            self._send(200, site.render(session, "Test Cases", "test_cases", cases=site.test_case_panels()),
+                       session_id=cookie)
+        elif path == "/login":
+            self._send(200, site.render(session, "Signup / Login", "login", login_error="", signup_error=""),
+                       session_id=cookie)
+        elif path in ("/contact_us", "/api_list"):
+            title = "Contact Us" if path == "/contact_us" else "API List"
+            self._send(200, site.render(session, title, path[1:]), session_id=cookie)
+        elif path == "/account_created":
+            self._send(200, site.render(session, "Account Created", "account_created"), session_id=cookie)
+        elif path == "/logout":
+            session["user"] = None
+            self._send(302, location="/login", clear_session=True)
+        else:
+            self._send(404, "Not found (local stand-in)", content_type="text/plain", session_id=cookie)
+
+    # --- POST ---
+    def do_POST(self):
+        path = urlsplit(self.path).path.rstrip("/")
+        session_id, session, new_cookie = self._session()
+        cookie = session_id if new_cookie else None
+        form = self._form()
+        site = self.site
+
+        if path == "/login":
+            user = site.users.get(form.get("email", ""))
+            if user and user["password"] == form.get("password"):
+                session["user"] = user
+                self._send(302, location="/", session_id=cookie)
+            else:
+                error = '<p style="color: red;">Your email or password is incorrect!</p>'
+                self._send(200, site.render(session, "Signup / Login", "login", login_error=error, signup_error=""),
+                           session_id=cookie)
+        elif path == "/signup":
+            email = form.get("email", "")
+            if email in site.users:
+                error = '<p style="color: red;">Email Address already exist!</p>'
+                self._send(200, site.render(session, "Signup / Login", "login", login_error="", signup_error=error),
+                           session_id=cookie)
+            else:
+                self._send(200, site.render(session, "Signup", "signup", name=escape(form.get("name", "")),
+                                            email=escape(email)), session_id=cookie)
+        elif path == "/create_account":
+            user = {"name": form.get("name", ""), "email": form.get("email", ""), "password": form.get("password", "")}
+            with site.lock:
+                site.users[user["email"]] = user
+            session["user"] = user
+            self._send(302, location="/account_created", session_id=cookie)
+        else:
+            self._send(404, "Not found (local stand-in)", content_type="text/plain", session_id=cookie)
+
+
+# ===================== Server =====================
+
+class StandInServer:
+    """שרת HTTP מקומי שמחליף את automationexercise.com - בלי רשת, פרסומות או עיכובים."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, handler_class: type = None):
+        # handler_class: תת-מחלקה של StandInRequestHandler עם נתיבים נוספים (למשל בבדיקות)
+        handler = type("BoundStandInRequestHandler", (handler_class or StandInRequestHandler,),
+                       {"site": StandInSite()})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="stand-in-server", daemon=True)
+        self._thread.start()
+        log_info(f"🏠 שרת מקומי פועל בכתובת {self.base_url}")
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    server = StandInServer(port=int(os.environ.get("STAND_IN_PORT", "8000")))
+    print(f"Serving automationexercise.com stand-in on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,44 @@
+from selenium.webdriver.remote.webdriver import WebDriver
+from .actions import navigate
+from .http_backend import HttpBrowser
+from .logger import log_info
+
+# 💡 הכנת state לבדיקה בלי לעבור ב-UI, כך שכל בדיקה עומדת בפני עצמה ואין תלות בסדר ההרצה.
+
+_ADD_TO_CART_JS = """
+const [ids, done] = [arguments[0], arguments[arguments.length - 1]];
+Promise.all(ids.map(id => fetch('/add_to_cart/' + id, {credentials: 'same-origin'}).then(r => r.status)))
+    .then(done, err => done(String(err)));
+"""
+
+
+def seed_cart(driver: WebDriver, base_url: str, product_ids):
+    """מוסיף מוצרים לעגלה ישירות דרך ה-endpoint של האתר (/add_to_cart/<id>), בלי לחיצות.
+    בדפדפן: כל הבקשות במקביל בקריאת script אחת; ב-backend ה-http: בקשה לכל מוצר עם ה-cookies שלו."""
+    product_ids = list(product_ids)
+    if isinstance(driver, HttpBrowser):
+        statuses = []
+        for product_id in product_ids:
+            driver.get(f"{base_url}/add_to_cart/{product_id}")
+            statuses.append(driver.status)
+    else:
+        if not driver.current_url.startswith(base_url):
+            navigate(driver, f"{base_url}/")
+        statuses = driver.execute_async_script(_ADD_TO_CART_JS, product_ids)
+    if not isinstance(statuses, list) or any(status != 200 for status in statuses):
+        raise RuntimeError(f"הוספת מוצרים {product_ids} לעגלה נכשלה: {statuses}")
+    log_info(f"🛒 העגלה הוכנה מראש עם המוצרים {product_ids}")
+
+
+STATE_PROVIDERS = {
+    "products_in_cart": seed_cart,
+}
+
+
+def prepare_state(driver: WebDriver, base_url: str, **needs):
+    """מכין את כל ה-state שהבדיקה הצהירה עליו ב-@pytest.mark.needs(...)."""
+    for name, value in needs.items():
+        provider = STATE_PROVIDERS.get(name)
+        if provider is None:
+            raise ValueError(f"state לא מוכר ב-needs: {name} (קיימים: {', '.join(STATE_PROVIDERS)})")
+        provider(driver, base_url, value)
@@ -0,0 +1,156 @@
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from datetime import datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+# 💡 דוח זורם: כל תוצאה נכתבת כשורת JSON (NDJSON) ברגע שהבדיקה מסתיימת, ו-viewer סטטי קל מציג את
+#    הקובץ תוך כדי הריצה. קבצים גדולים (צילומי מסך, page source, לוג מלא) נשמרים כקבצים נפרדים
+#    ב-artifacts/ ומקושרים מהרשומה - לא מוטמעים בדוח.
+
+REPORTS_DIR = "reports"
+RUN_ID_ENV = "TEST_RUN_ID"  # אותו מזהה ריצה כמו קובץ הלוג (framework/log_backend.py)
+RESULTS_FILE = "results.ndjson"
+VIEWER_FILE = "index.html"
+ARTIFACTS_DIR = "artifacts"
+LOG_EXCERPT_LINES = 40
+
+_VIEWER_TEMPLATE = os.path.join(os.path.dirname(__file__), "report_viewer.html")
+
+
+def get_run_dir() -> str:
+    """תיקיית הריצה: reports/run_<TEST_RUN_ID> (המזהה עובר ל-workers של xdist דרך משתנה הסביבה)."""
+    run_id = os.environ.setdefault(RUN_ID_ENV, datetime.now().strftime("%Y%m%d_%H%M%S"))
+    return os.path.join(REPORTS_DIR, f"run_{run_id}")
+
+
+def artifact_path(name: str, run_dir: str = None) -> str:
+    """הנתיב היחסי (לתיקיית הריצה) שבו יישמר artifact בשם זה; יוצר את תיקיית ה-artifacts."""
+    run_dir = run_dir or get_run_dir()
+    safe_name = re.sub(r"[^\w.-]+", "_", name).strip("_")
+    os.makedirs(os.path.join(run_dir, ARTIFACTS_DIR), exist_ok=True)
+    return os.path.join(ARTIFACTS_DIR, safe_name)
+
+
+def save_artifact(name: str, data, run_dir: str = None) -> str:
+    """שומר artifact כקובץ בתיקיית הריצה ומחזיר את הנתיב היחסי אליה (לקישור מהדוח)."""
+    run_dir = run_dir or get_run_dir()
+    relative_path = artifact_path(name, run_dir)
+    mode = "wb" if isinstance(data, bytes) else "w"
+    with open(os.path.join(run_dir, relative_path), mode, **({} if mode == "wb" else {"encoding": "utf-8"})) as f:
+        f.write(data)
+    return relative_path
+
+
+# ===================== Per-test Log Excerpt =====================
+
+class TestLogBuffer(logging.Handler):
+    """אוסף את שורות הלוג של הבדיקה הנוכחית (ב-worker שמריץ אותה)."""
+
+    __test__ = False  # לא מחלקת בדיקה של pytest
+
+    def __init__(self):
+        super().__init__(level=logging.DEBUG)
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(f"{record.levelname}: {record.getMessage()}")
+
+    def reset(self):
+        self.lines = []
+
+    def excerpt(self, limit: int = LOG_EXCERPT_LINES):
+        """השורות האחרונות של הבדיקה, והאם נחתכו."""
+        return self.lines[-limit:], len(self.lines) > limit
+
+
+# ===================== NDJSON Writer =====================
+
+class StreamReporter:
+    """כותב רשומה לכל בדיקה שהסתיימה ל-results.ndjson (בתהליך הראשי בלבד)."""
+
+    def __init__(self, run_dir: str = None):
+        self.run_dir = run_dir or get_run_dir()
+        os.makedirs(self.run_dir, exist_ok=True)
+        shutil.copyfile(_VIEWER_TEMPLATE, os.path.join(self.run_dir, VIEWER_FILE))
+        self.path = os.path.join(self.run_dir, RESULTS_FILE)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self.counts = {}
+        self.started = time.time()
+
+    def write(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def write_result(self, report, properties: dict):
+        """רשומה לבדיקה: תוצאה, זמנים, worker, לוג מקוצר וקישורים ל-artifacts."""
+        self.counts[report.outcome] = self.counts.get(report.outcome, 0) + 1
+        properties = dict(properties)
+        node = getattr(report, "node", None)  # ב-xdist: ה-worker שהריץ את הבדיקה
+        record = {
+            "type": "test",
+            "nodeid": report.nodeid,
+            "outcome": report.outcome,
+            "when": report.when,
+            "duration": round(report.duration, 3),
+            "start": getattr(report, "start", None),
+            "stop": getattr(report, "stop", None),
+            "worker": node.gateway.id if node is not None else "main",
+            "log": properties.pop("log_excerpt", []),
+            "artifacts": properties.pop("artifacts", []),
+            "properties": properties,
+        }
+        if report.failed or report.outcome == "rerun" or hasattr(report, "wasxfail"):
+            record["error"] = report.longreprtext[-4000:]
+        self.write(record)
+
+    def close(self, exitstatus: int):
+        self.write({"type": "summary", "finished": time.time(), "duration": time.time() - self.started,
+                    "exitstatus": exitstatus, "counts": self.counts})
+        with self._lock:
+            self._file.close()
+
+
+# ===================== Viewer Server =====================
+
+class _NoCacheHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def end_headers(self):
+        # 💡 ה-viewer מושך את הקובץ שוב ושוב - בלי cache כדי לראות שורות חדשות
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+
+def serve_run_dir(run_dir: str, port: int = 0) -> ThreadingHTTPServer:
+    """מגיש את תיקיית הריצה ב-HTTP (fetch לא עובד מ-file://) ומחזיר את השרת; הכתובת ב-server.url."""
+    os.makedirs(run_dir, exist_ok=True)
+    shutil.copyfile(_VIEWER_TEMPLATE, os.path.join(run_dir, VIEWER_FILE))
+    server = ThreadingHTTPServer(("127.0.0.1", port), partial(_NoCacheHandler, directory=run_dir))
+    server.daemon_threads = True
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/{VIEWER_FILE}"
+    threading.Thread(target=server.serve_forever, name="report-viewer", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    # python -m framework.stream_report reports/run_<id>
+    if len(sys.argv) < 2:
+        print("usage: python -m framework.stream_report <run_dir>")
+        sys.exit(2)
+    viewer = serve_run_dir(sys.argv[1], port=int(os.environ.get("REPORT_VIEWER_PORT", "0")))
+    print(f"Report viewer: {viewer.url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        viewer.shutdown()
@@ -0,0 +1,83 @@
+import time
+import weakref
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.wait import WebDriverWait
+from . import profiler
+
+DEFAULT_TIMEOUT = 10
+
+# 💡 הגדרות ההמתנה לכל הריצה. polling אדפטיבי: מתחילים מהר (initial_poll) ומאטים בהדרגה
+#    (פי backoff בכל סבב) עד max_poll - תנאי שמתקיים מהר נתפס כמעט מיד, ותנאי איטי לא מציף את ה-driver.
+WAIT_SETTINGS = {
+    "timeout": DEFAULT_TIMEOUT,
+    "initial_poll": 0.05,
+    "max_poll": 0.5,
+    "backoff": 1.5,
+}
+
+# דריסות לפי פעולה (למשל timeout קצר יותר ל-safe_click)
+ACTION_WAIT_SETTINGS = {
+    "safe_click": {"timeout": 5},
+}
+
+
+def configure_waits(action: str = None, **settings):
+    """משנה את הגדרות ההמתנה לכל הריצה, או לפעולה מסוימת כשמועבר `action`."""
+    unknown = set(settings) - set(WAIT_SETTINGS)
+    if unknown:
+        raise ValueError(f"הגדרות המתנה לא מוכרות: {', '.join(sorted(unknown))}")
+    if action:
+        ACTION_WAIT_SETTINGS.setdefault(action, {}).update(settings)
+    else:
+        WAIT_SETTINGS.update(settings)
+
+
+def wait_settings(action: str = None, **overrides) -> dict:
+    """ההגדרות האפקטיביות: ריצה ← פעולה ← פרמטרים של הקריאה (ערכי None מתעלמים)."""
+    settings = dict(WAIT_SETTINGS)
+    settings.update(ACTION_WAIT_SETTINGS.get(action, {}))
+    settings.update({key: value for key, value in overrides.items() if value is not None})
+    return settings
+
+
+class AdaptiveWait(WebDriverWait):
+    """WebDriverWait אחד לכל driver, עם timeout ו-polling שנקבעים בכל קריאה ל-until."""
+
+    def __init__(self, driver: WebDriver):
+        super().__init__(driver, WAIT_SETTINGS["timeout"], poll_frequency=WAIT_SETTINGS["initial_poll"])
+
+    def until(self, method, message: str = "", action: str = None, timeout: float = None, poll: float = None,
+              ignored_exceptions=(NoSuchElementException,)):
+        settings = wait_settings(action, timeout=timeout, initial_poll=poll)
+        end_time = time.monotonic() + settings["timeout"]
+        delay = settings["initial_poll"]
+        screen = stacktrace = None
+
+        while True:
+            profiler.count_poll()
+            try:
+                value = method(self._driver)
+                if value:
+                    return value
+            except ignored_exceptions as exc:
+                screen = getattr(exc, "screen", None)
+                stacktrace = getattr(exc, "stacktrace", None)
+
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+            delay = min(delay * settings["backoff"], settings["max_poll"])
+        raise TimeoutException(message, screen, stacktrace)
+
+
+_waits = weakref.WeakKeyDictionary()
+
+
+def get_wait(driver: WebDriver) -> AdaptiveWait:
+    """מחזיר את אובייקט ההמתנה של ה-driver (נוצר פעם אחת לכל driver)."""
+    wait = _waits.get(driver)
+    if wait is None:
+        wait = _waits[driver] = AdaptiveWait(driver)
+    return wait
@@ -15,9 +15,40 @@ import time
 RUN_HEADLESS_MODE = False  # 💡 שינוי: ברירת מחדל לגלוי
 
 # 💡 2. קביעת מצב הרצה:
-#    True: מריץ במקביל באמצעות pytest-xdist (-n auto).
-#    False: מריץ בטור (Sequential) (מומלץ לפרויקטים תלויי-סדר).
-RUN_PARALLEL_MODE = False  # 💡 ברירת מחדל: טור
+#    True: מריץ במקביל באמצעות pytest-xdist (-n auto, --dist=loadgroup).
+#    False: מריץ בטור (Sequential) (מומלץ לניפוי שגיאות).
+RUN_PARALLEL_MODE = True  # 💡 ברירת מחדל: מקביל - הבדיקות אינן תלויות בסדר ההרצה
+
+# 💡 3. גודל מאגר הדפדפנים:
+#    מספר מופעי Chrome מחוממים מראש בכל worker. בדיקות שוכרות דפדפן ומקבלות אותו
+#    עם cookies ו-storage נקיים, בלי הפעלה מחדש של הדפדפן.
+BROWSER_POOL_SIZE = 1
+
+# 💡 4. יעד הבדיקות:
+#    "live": האתר האמיתי automationexercise.com.
+#    "local": שרת מקומי עם דפים מוקלטים ועגלה/התחברות מדומות - מהיר, דטרמיניסטי ועובד בלי רשת.
+RUN_TARGET = "live"
+
+# 💡 5. Page load strategy:
+#    "normal": driver.get ממתין לכל המשאבים. "eager": רק ל-DOM. "none": חוזר מיד.
+#    navigate() ממתין ל-DOM בכל מקרה, וזמני הטעינה של כל דף מופיעים בדוח.
+PAGE_LOAD_STRATEGY = "normal"
+
+# 💡 6. Backend:
+#    "auto": לכל בדיקה ה-backend הזול ביותר שמספק את ה-capabilities שלה (http לבדיקות מבניות).
+#    "chrome" / "headless-shell" / "http": backend קבוע לכל הבדיקות (headless-shell דורש CHROME_HEADLESS_SHELL).
+RUN_BACKEND = "auto"
+
+# 💡 7. דוח חי:
+#    True: כל תוצאה נכתבת ל-reports/run_<id>/results.ndjson ברגע שהבדיקה מסתיימת, וה-viewer נפתח
+#    בדפדפן כבר בתחילת הריצה ומתעדכן תוך כדי.
+LIVE_REPORT_VIEWER = True
+
+# 💡 8. ריצות חוזרות והסגר:
+#    בדיקה שנכשלה רצה שוב (רק היא, בדפדפן חדש) עד FLAKY_RERUNS פעמים; אם עברה - נשמרת כ-flaky בהיסטוריה.
+#    בדיקות שה-flaky שלהן חוזר על עצמו עוברות להסגר: רצות בנתיב נפרד ולא מכשילות את הריצה.
+FLAKY_RERUNS = 1
+QUARANTINE_FLAKY_TESTS = True
 
 
 # ==============================================================================
@@ -40,9 +71,9 @@ def get_run_options():
     options = [
         '-v',
         'tests/',
-        '--self-contained-html',
         '-s',  # מונע קונפליקטים ב-I/O
     ]
+    # 💡 בלי --self-contained-html: צילומי מסך ו-page source נשמרים כקבצים ומקושרים מהדוח במקום להיות מוטמעים בו
 
     # --- 1. קביעת מצב Headless ---
     if RUN_HEADLESS_MODE:
@@ -52,9 +83,18 @@ def get_run_options():
         options.append("--headless=False")
         print("💻 הדפדפן ירוץ במצב: גלוי (Non-Headless).")
 
+    options.append(f"--browser-pool-size={BROWSER_POOL_SIZE}")
+    options.append(f"--target={RUN_TARGET}")
+    options.append(f"--page-load-strategy={PAGE_LOAD_STRATEGY}")
+    options.append(f"--backend={RUN_BACKEND}")
+    options.append(f"--stream-report={LIVE_REPORT_VIEWER}")
+    options.append(f"--flaky-reruns={FLAKY_RERUNS}")
+    options.append(f"--quarantine={QUARANTINE_FLAKY_TESTS}")
+    print(f"🎯 יעד הבדיקות: {RUN_TARGET}")
+
     # --- 2. קביעת מצב הרצה (Parallel/Sequential) ---
     if RUN_PARALLEL_MODE:
-        options.append("--dist=loadfile")
+        options.append("--dist=loadgroup")
         options.append("-n")
         options.append("auto")
         print("🚀 מריץ מבחנים במצב: מקביל (Parallel).")
@@ -77,6 +117,8 @@ if __name__ == "__main__":
 
     # ב. יצירת שם קובץ דינמי
     report_path = generate_report_name()
+    # 💡 אותו מזהה ריצה לדוח, לקובץ הלוג ולתיקיית הדוח הזורם (עובר גם ל-workers)
+    os.environ.setdefault("TEST_RUN_ID", os.path.basename(report_path)[len("report_"):-len(".html")])
 
     # ג. הוספת דגל הדוח לרשימת האופציות
     pytest_options.append(f'--html={report_path}')
@@ -86,7 +128,16 @@ if __name__ == "__main__":
     print(f"⚙️ פקודת Pytest: pytest {' '.join(pytest_options)}")
     print("-" * 50)
 
-    # ד. הרצת Pytest
+    # ד. viewer חי לדוח הזורם
+    if LIVE_REPORT_VIEWER:
+        import webbrowser
+        from framework.stream_report import get_run_dir, serve_run_dir
+
+        viewer = serve_run_dir(get_run_dir())
+        print(f"📡 דוח חי: {viewer.url}")
+        webbrowser.open(viewer.url)
+
+    # ה. הרצת Pytest
     exit_code = pytest.main(pytest_options)
 
     # 💡 מדידת זמן סיום וחישוב משך הריצה
@@ -97,6 +148,14 @@ if __name__ == "__main__":
     print(f"⏱️ זמן ריצה כולל (סשן Pytest): {duration:.2f} שניות")
     print("=" * 50)
 
+    # 💡 השוואה מול הריצות הקודמות באותה תצורה (היסטוריית הביצועים)
+    try:
+        from framework import perf_history
+
+        print(perf_history.format_comparison(perf_history.compare()))
+    except Exception as e:
+        print(f"⚠️ לא ניתן להשוות מול היסטוריית הביצועים: {e}")
+
     # 💡 פתיחת הדוח בדפדפן אוטומטית
     try:
         import webbrowser
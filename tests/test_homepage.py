@@ -1,3 +1,4 @@
+import pytest
 import time
 import threading
 import sys
@@ -7,8 +8,10 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
-from framework.actions import safe_click, wait_for_clickable, retry_on_stale
+from selenium.common.exceptions import TimeoutException
+from framework.actions import inspect_elements, navigate
+from framework.link_crawler import check_links, format_link_report
+from framework.locators import HomePage
 from framework.logger import (
     log_info,
     log_success,
@@ -26,11 +29,14 @@ init(autoreset=True)
 #     ...
 
 
-def test_check_active_buttons_with_live_timer(driver):
+# 💡 בדיקה מבנית (מלאי קישורים וכפתורים) - רצה גם ב-backend מסוג http, בלי דפדפן
+@pytest.mark.capabilities("dom")
+@pytest.mark.block_images
+def test_check_active_buttons_with_live_timer(driver, base_url, request):
     test_name = "בדיקת כפתורים פעילים וגלויים בדף הבית"
     log_test_start(test_name)
 
-    url = "https://automationexercise.com/"
+    url = f"{base_url}/"
     start_time = time.time()
     log_info(f"🌐 טוען את האתר {url}")
 
@@ -38,19 +44,20 @@ def test_check_active_buttons_with_live_timer(driver):
     outcome = "passed"
 
     try:
-        driver.get(url)
+        navigate(driver, url)
 
         try:
             # 💡 נבחר אלמנטים שניתנים ללחיצה (קישורים וכפתורים)
-            all_elements = WebDriverWait(driver, 10).until(
-                EC.presence_of_all_elements_located((By.XPATH, "//a | //button"))
+            # איסוף text/value/href/גלוי/פעיל לכולם בקריאת execute_script אחת במקום כ-5 round trips לאלמנט
+            records = WebDriverWait(driver, 10).until(
+                lambda d: inspect_elements(d, *HomePage.CLICKABLES) or False
             )
         except TimeoutException:
             log_warning("⚠️ לא נמצאו אלמנטים ניתנים ללחיצה בדף")
-            all_elements = []
+            records = []
 
-        stats["total"] = len(all_elements)
-        log_info(f"נמצאו {len(all_elements)} אלמנטים ניתנים לבדיקה.")
+        stats["total"] = len(records)
+        log_info(f"נמצאו {len(records)} אלמנטים ניתנים לבדיקה.")
 
         # אין צורך ב-MAX_BUTTONS_TO_CHECK מאחר שאין ניווט שובר
 
@@ -59,35 +66,39 @@ def test_check_active_buttons_with_live_timer(driver):
 
         passed_count = 0
 
-        for i, el in enumerate(all_elements, start=1):
-            text = el.text.strip() or el.get_attribute("value") or el.get_attribute("href") or "ללא טקסט"
+        for i, record in enumerate(records, start=1):
+            text = record.text.strip() or record.value or record.href or "ללא טקסט"
 
-            try:
-                # 1. בדיקת גלוי ופעיל
-                is_displayed = el.is_displayed()
-                is_enabled = el.is_enabled()
-
-                if not is_displayed or not is_enabled:
-                    log_warning(f"⚠️ אלמנט {i} '{text}' אינו גלוי או פעיל.")
-                    stats["warnings"] += 1
-                    continue
-
-                # 2. סינון קריטיות (אם לא ניווט אמיתי, אישור שהוא תקין)
-                if any(skip in text.lower() for skip in SKIP_TEXTS):
-                    stats["warnings"] += 1
-                    continue
-
-                # 3. אימות ההצלחה
-                log_success(f"✅ אלמנט {i} '{text}' גלוי ופעיל.")
-                passed_count += 1
-                stats["success"] += 1
+            # 1. בדיקת גלוי ופעיל
+            if not record.displayed or not record.enabled:
+                log_warning(f"⚠️ אלמנט {i} '{text}' אינו גלוי או פעיל.")
+                stats["warnings"] += 1
+                continue
 
-            except StaleElementReferenceException:
-                log_warning("⚠️ אלמנט השתנה במהלך הבדיקה (Stale Element).")
+            # 2. סינון קריטיות (אם לא ניווט אמיתי, אישור שהוא תקין)
+            if any(skip in text.lower() for skip in SKIP_TEXTS):
                 stats["warnings"] += 1
-            except Exception as e:
-                log_error(f"❌ שגיאה בבדיקת אלמנט {i}: '{text}' – {e}")
-                stats["errors"] += 1
+                continue
+
+            # 3. אימות ההצלחה
+            log_success(f"✅ אלמנט {i} '{text}' גלוי ופעיל.")
+            passed_count += 1
+            stats["success"] += 1
+
+        # 💡 מצב סריקה: בדיקה שה-hrefs שנאספו באמת עונים - במקביל, בלי לנווט בדפדפן
+        if request.config.crawl_links:
+            hrefs = list(dict.fromkeys(record.href for record in records if record.href))
+            links = check_links(hrefs, referrer=url, max_depth=request.config.getoption("--crawl-depth"))
+            broken = [link for link in links if not link.ok]
+            request.node.user_properties.append(
+                ("link_health", [link._asdict() for link in links])
+            )
+            log_info(f"🔗 בדיקת קישורים:\n{format_link_report(links)}")
+            stats["links"] = len(links)
+            stats["broken_links"] = [link.url for link in broken]
+            stats["errors"] += len(broken)
+            for link in broken:
+                log_error(f"❌ קישור שבור: {link.url} ({link.status or link.error})")
 
     except Exception as e:
         log_error(f"שגיאה כללית במהלך הבדיקה: {e}")
@@ -103,6 +114,7 @@ def test_check_active_buttons_with_live_timer(driver):
             f"✅ הצלחות: {stats['success']}\n"
             f"⚠️ אזהרות: {stats['warnings']}\n"
             f"❌ שגיאות: {stats['errors']}\n"
+            f"🔗 קישורים שנבדקו: {stats.get('links', '-')}\n"
             f"⏱️ משך כולל: {duration:.2f} שניות\n"
             f"{'=' * 50}\n"
         )
@@ -113,3 +125,5 @@ def test_check_active_buttons_with_live_timer(driver):
             outcome = "failed"
 
         log_test_end(test_name, outcome)
+
+    assert not stats.get("broken_links"), f"קישורים שבורים: {stats['broken_links']}"
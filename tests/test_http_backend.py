@@ -0,0 +1,112 @@
+import pytest
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException
+from selenium.webdriver.common.by import By
+from framework.http_backend import parse_html
+
+# 💡 בדיקות יחידה ל-backend מסוג http: תת-קבוצת ה-CSS, ה-locators של Selenium והטקסט המוצג - בלי רשת
+
+PAGE = """
+<html><head><title>Fixture</title><script>var hidden = "script text";</script></head>
+<body>
+  <div id="main" class="container wide">
+    <ul class="nav">
+      <li><a href="/products" data-qa="products-link">Products</a></li>
+      <li><a href="/login" lang="en-US"> Signup /  Login </a></li>
+      <li class="hidden-item" style="display: none"><a href="#secret">Secret</a></li>
+    </ul>
+    <form action="/login"><input name="email" type="email" disabled><input name="token" type="hidden"></form>
+    <section class="products">
+      <div class="productinfo"><p>Blue Top</p><p>Rs. 500</p></div>
+      <div class="productinfo"><p>Men <b>Tshirt</b></p>line<br>break</div>
+    </section>
+    <table><tr><th>Item</th><td>1</td></tr></table>
+  </div>
+  <p id="footer">Footer</p>
+</body></html>
+"""
+
+
+@pytest.fixture(scope="module")
+def document():
+    return parse_html(PAGE, "http://local.test/page")
+
+
+def _tags(elements) -> list:
+    return [element.tag_name for element in elements]
+
+
+@pytest.mark.parametrize("selector, expected", [
+    ("li", 3),                               # tag
+    ("ul > *", 3),                           # *
+    ("#main", 1),                            # id
+    (".productinfo", 2),                     # class
+    (".container.wide", 1),                  # כמה classes
+    ("[data-qa]", 1),                        # [attr]
+    ("input[name='email']", 1),              # [attr=value] עם מרכאות
+    ('input[name="token"]', 1),
+    ("input[type=hidden]", 1),               # ערך בלי מרכאות
+    ("[class~=wide]", 1),                    # ~=
+    ("a[href^='/lo']", 1),                   # ^=
+    ("a[href$='ducts']", 1),                 # $=
+    ("a[href*='rod']", 1),                   # *=
+    ("a[lang|=en]", 1),                      # |=
+    ("#main p", 3),                          # צאצא
+    ("section > div > p", 3),                # בן ישיר
+    ("body > p", 1),
+    ("ul > a", 0),                           # a אינו בן ישיר של ul
+    ("#main a, #footer", 4),                 # רשימת selectors
+])
+def test_css_selectors(document, selector, expected):
+    assert len(document.find_elements(By.CSS_SELECTOR, selector)) == expected
+
+
+def test_elements_returned_in_document_order(document):
+    assert _tags(document.find_elements(By.CSS_SELECTOR, "#footer, li")) == ["li", "li", "li", "p"]
+
+
+@pytest.mark.parametrize("by, value, expected", [
+    (By.ID, "footer", 1),
+    (By.CLASS_NAME, "nav", 1),
+    (By.NAME, "email", 1),
+    (By.TAG_NAME, "a", 3),
+    (By.LINK_TEXT, "Signup / Login", 1),
+    (By.PARTIAL_LINK_TEXT, "Login", 1),
+])
+def test_selenium_locators(document, by, value, expected):
+    assert len(document.find_elements(by, value)) == expected
+
+
+@pytest.mark.parametrize("by, value", [
+    (By.CSS_SELECTOR, "li:first-child"),
+    (By.CSS_SELECTOR, "a ~ b"),
+    (By.XPATH, "//a"),
+])
+def test_unsupported_selector_raises(document, by, value):
+    with pytest.raises(InvalidSelectorException):
+        document.find_elements(by, value)
+
+
+def test_find_element_missing_raises(document):
+    with pytest.raises(NoSuchElementException):
+        document.find_element(By.ID, "nope")
+
+
+def test_text_separates_block_elements(document):
+    cards = document.find_elements(By.CSS_SELECTOR, ".productinfo")
+    assert cards[0].text == "Blue Top\nRs. 500"
+    assert cards[1].text == "Men Tshirt\nline\nbreak"
+    assert document.find_element(By.TAG_NAME, "table").text == "Item 1"
+
+
+def test_text_collapses_whitespace_and_skips_scripts(document):
+    assert document.find_element(By.CSS_SELECTOR, "a[lang]").text == "Signup / Login"
+    assert "script text" not in document.text
+    assert document.find_element(By.TAG_NAME, "title").text == "Fixture"
+
+
+def test_attributes_and_state(document):
+    assert document.find_element(By.CSS_SELECTOR, "[data-qa]").get_attribute("href") == "http://local.test/products"
+    assert not document.find_element(By.NAME, "email").is_enabled()
+    assert not document.find_element(By.NAME, "token").is_displayed()
+    assert not document.find_element(By.CSS_SELECTOR, "a[href='#secret']").is_displayed()
+    assert document.find_element(By.ID, "footer").is_displayed()
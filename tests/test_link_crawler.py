@@ -0,0 +1,60 @@
+import asyncio
+import pytest
+from framework.link_crawler import LinkCrawler, MAX_REDIRECTS, format_link_report
+from framework.logger import log_info
+from framework.stand_in_server import StandInRequestHandler, StandInServer
+
+# 💡 בדיקות offline לסורק הקישורים מול השרת המקומי - בלי דפדפן ובלי רשת
+
+
+class _CrawlerTestHandler(StandInRequestHandler):
+    """השרת המקומי + לולאת הפניות (/loop/a <-> /loop/b) שלא קיימת באתר."""
+
+    def do_GET(self):
+        if self.path == "/loop/a":
+            self._send(302, location="/loop/b")
+        elif self.path == "/loop/b":
+            self._send(302, location="/loop/a")
+        else:
+            super().do_GET()
+
+
+@pytest.fixture(scope="module")
+def crawler_site():
+    server = StandInServer(handler_class=_CrawlerTestHandler)
+    server.start()
+    yield server.base_url
+    server.stop()
+
+
+def _crawl(urls, referrer="", **options):
+    crawler = LinkCrawler(per_host_rate=0, use_cache=False, **options)
+    results = asyncio.run(crawler.crawl(urls, referrer))
+    log_info(f"🔗 בדיקת קישורים:\n{format_link_report(list(results.values()))}")
+    return crawler, results
+
+
+def test_crawl_counts_ok_broken_and_redirect_loop(crawler_site):
+    urls = [f"{crawler_site}/", f"{crawler_site}/logout", f"{crawler_site}/no_such_page",
+            f"{crawler_site}/product_details/999", f"{crawler_site}/loop/a"]
+    _, results = _crawl(urls)
+
+    ok = [url for url, result in results.items() if result.ok]
+    broken = {url: result for url, result in results.items() if not result.ok}
+    assert sorted(ok) == sorted([f"{crawler_site}/", f"{crawler_site}/logout"])
+    assert len(broken) == 3
+    assert broken[f"{crawler_site}/no_such_page"].status == 404
+    assert broken[f"{crawler_site}/product_details/999"].status == 404
+    loop = broken[f"{crawler_site}/loop/a"]
+    assert loop.status == 302 and str(MAX_REDIRECTS) in loop.error
+    # הפניה אחת (/logout -> /login) היא קישור תקין
+    assert results[f"{crawler_site}/logout"].final_url == f"{crawler_site}/login"
+
+
+def test_crawl_site_reuses_connections(crawler_site):
+    crawler, results = _crawl([f"{crawler_site}/"], max_depth=1, per_host_connections=2)
+
+    assert len(results) > 5
+    assert all(result.ok for result in results.values()), [r.url for r in results.values() if not r.ok]
+    # 💡 keep-alive: כל הדפים נבדקים על החיבורים של ה-host, לא על חיבור חדש לכל קישור
+    assert crawler.connections_opened <= 2
@@ -1,5 +1,5 @@
+import os
 import pytest
-import time
 import random
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -9,8 +9,13 @@ from framework.actions import (
     wait_for_clickable,
     retry_on_stale,
     remove_all_overlays,
-    logout_if_logged_in
+    logout_if_logged_in,
+    wait_for_navigation,
+    navigate
 )
+from framework.locators import Header, LoginPage
+from framework.session_cache import is_logged_in
+from framework.stand_in_server import DEFAULT_USER
 from framework.logger import (
     log_info,
     log_success,
@@ -27,54 +32,69 @@ from framework.logger import (
 #     ...
 
 @pytest.fixture
-def registered_user(driver):
-    username, email, password = register_user(driver)
+def registered_user(driver, base_url):
+    username, email, password = register_user(driver, base_url)
     yield username, email, password
     logout_if_logged_in(driver)
 
+@pytest.fixture
+def logged_in_user(request, driver, session_cache, base_url):
+    """דפדפן מחובר: משחזר את ה-session מה-cache ונופל חזרה להתחברות ב-UI רק אם פג תוקפו."""
+    email = os.environ.get("AE_USER_EMAIL")
+    password = os.environ.get("AE_USER_PASSWORD")
+    if (not email or not password) and request.config.getoption("--target") == "local":
+        # 💡 בשרת המקומי קיים משתמש מוכן מראש
+        email, password = DEFAULT_USER["email"], DEFAULT_USER["password"]
+    if not email or not password:
+        pytest.skip("לא הוגדרו AE_USER_EMAIL / AE_USER_PASSWORD")
+
+    session_cache.login(driver, email, lambda d: login_user(d, email, password, base_url))
+    yield email
+    # 💡 בלי logout: יציאה מבטלת את ה-session בצד השרת ואת ה-snapshot שב-cache
+
 # ===================== User actions =====================
-def register_user(driver):
-    driver.get("https://automationexercise.com/")
-    signup_link = wait_for_clickable(driver, By.LINK_TEXT, "Signup / Login")
+def register_user(driver, base_url):
+    navigate(driver, f"{base_url}/")
+    signup_link = wait_for_clickable(driver, *Header.SIGNUP_LOGIN)
     retry_on_stale(safe_click, driver, signup_link)
 
     name = f"qauser_{random.randint(1000,9999)}"
     email = f"{name}_{random.randint(1000,9999)}@example.test"
     password = f"P@ssw{random.randint(1000,9999)}"
 
-    name_input = wait_for_clickable(driver, By.NAME, "name")
-    email_input = wait_for_clickable(driver, By.XPATH, "//input[@data-qa='signup-email']")
-    signup_btn = wait_for_clickable(driver, By.XPATH, "//button[@data-qa='signup-button']")
+    name_input = wait_for_clickable(driver, *LoginPage.SIGNUP_NAME)
+    email_input = wait_for_clickable(driver, *LoginPage.SIGNUP_EMAIL)
+    signup_btn = wait_for_clickable(driver, *LoginPage.SIGNUP_BUTTON)
 
     name_input.send_keys(name)
     email_input.send_keys(email)
     retry_on_stale(safe_click, driver, signup_btn)
-    time.sleep(1)
+    wait_for_navigation(driver, anchor=signup_btn, url_contains="/signup", legacy_sleep=1)
 
     log_success(f"Registered user: {email}")
     return name, email, password
 
-def login_user(driver, email, password):
-    driver.get("https://automationexercise.com/")
-    signup_link = wait_for_clickable(driver, By.LINK_TEXT, "Signup / Login")
+def login_user(driver, email, password, base_url):
+    navigate(driver, f"{base_url}/")
+    signup_link = wait_for_clickable(driver, *Header.SIGNUP_LOGIN)
     retry_on_stale(safe_click, driver, signup_link)
-    time.sleep(1)
+    wait_for_navigation(driver, url_contains="/login", legacy_sleep=1)
 
-    login_email = wait_for_clickable(driver, By.XPATH, "//input[@data-qa='login-email']")
-    login_password = wait_for_clickable(driver, By.XPATH, "//input[@data-qa='login-password']")
-    login_btn = wait_for_clickable(driver, By.XPATH, "//button[@data-qa='login-button']")
+    login_email = wait_for_clickable(driver, *LoginPage.LOGIN_EMAIL)
+    login_password = wait_for_clickable(driver, *LoginPage.LOGIN_PASSWORD)
+    login_btn = wait_for_clickable(driver, *LoginPage.LOGIN_BUTTON)
 
     login_email.send_keys(email)
     login_password.send_keys(password)
     retry_on_stale(safe_click, driver, login_btn)
-    time.sleep(1)
+    wait_for_navigation(driver, anchor=login_btn, legacy_sleep=1)
 
 # ===================== Tests =====================
-def test_register_user(driver):
+def test_register_user(driver, base_url):
     test_name = "test_register_user"
     log_test_start(test_name)
     try:
-        register_user(driver)
+        register_user(driver, base_url)
         logout_if_logged_in(driver)
         log_test_end(test_name, "passed")
     except Exception as e:
@@ -82,12 +102,12 @@ def test_register_user(driver):
         log_test_end(test_name, "failed")
         raise
 
-def test_login_wrong_user(driver):
+def test_login_wrong_user(driver, base_url):
     test_name = "test_login_wrong_user"
     log_test_start(test_name)
     try:
-        login_user(driver, "wrong@example.test", "invalid123")
-        error_elem = wait_for_clickable(driver, By.XPATH, "//p[contains(text(),'Your email or password is incorrect')]", timeout=5)
+        login_user(driver, "wrong@example.test", "invalid123", base_url)
+        error_elem = wait_for_clickable(driver, *LoginPage.LOGIN_ERROR, timeout=5)
         if error_elem and error_elem.is_displayed():
             log_success("✅ זוהתה הודעת השגיאה – כניסה נכשלת כפי שצפוי")
             log_test_end(test_name, "passed")
@@ -99,3 +119,17 @@ def test_login_wrong_user(driver):
         log_error(f"שגיאה כללית ב-{test_name}: {e}")
         log_test_end(test_name, "failed")
         raise
+
+def test_logged_in_user_session(driver, logged_in_user, base_url):
+    test_name = "test_logged_in_user_session"
+    log_test_start(test_name)
+    try:
+        navigate(driver, f"{base_url}/")
+        assert is_logged_in(driver), "המשתמש אינו מחובר"
+        logged_in_as = wait_for_clickable(driver, *Header.LOGGED_IN_AS, timeout=5)
+        log_success(f"✅ {logged_in_as.text.strip()}")
+        log_test_end(test_name, "passed")
+    except Exception as e:
+        log_error(f"שגיאה כללית ב-{test_name}: {e}")
+        log_test_end(test_name, "failed")
+        raise
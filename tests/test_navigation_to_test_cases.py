@@ -1,16 +1,134 @@
-import logging
+import re
 import time
 from colorama import Fore, Style, init
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from framework.actions import wait_for_scroll_settled, navigate
+from framework.http_backend import HttpBrowser
+from framework.locators import Header, TestCasesPage
 from framework.logger import log_info, log_success, log_error, log_warning, log_test_start, log_test_end
 import pytest
 
 init(autoreset=True)
 
-
-def test_navigate_to_test_cases(driver):
+# שורה ממוספרת: "1." עד "99." בתחילת השורה
+NUMBERED_LINE = re.compile(r"^[1-9]\d?\.")
+
+# 💡 איסוף כל הכותרות והתכנים של האקורדיון במעבר DOM אחד, בלי לפתוח אף פאנל.
+# textContent (ולא innerText) כי פאנל סגור מוסתר ב-display:none.
+_HARVEST_ACCORDION_JS = """
+const cases = [];
+for (const header of document.querySelectorAll(arguments[0])) {
+    const target = (header.getAttribute('href') || '').replace(/^#/, '');
+    const body = target ? document.getElementById(target) : null;
+    let lines = [];
+    if (body) {
+        const items = body.querySelectorAll('li');
+        lines = items.length
+            ? Array.from(items, li => li.textContent)
+            : body.textContent.split('\\n');
+        lines = lines.map(line => line.trim()).filter(line => line);
+    }
+    cases.push({header: header.textContent.trim(), target: target, lines: lines});
+}
+return cases;
+"""
+
+
+def harvest_test_cases(driver):
+    """מחזיר את כל מקרי הבדיקה (כותרת, מזהה פאנל ושורות תוכן) בקריאת execute_script אחת."""
+    if isinstance(driver, HttpBrowser):
+        return _harvest_from_html(driver)
+    return driver.execute_script(_HARVEST_ACCORDION_JS, TestCasesPage.ACCORDION_HEADERS.value)
+
+
+def _harvest_from_html(driver):
+    """אותו איסוף מתוך ה-HTML שנטען, ל-backend בלי JS."""
+    cases = []
+    for header in driver.find_elements(*TestCasesPage.ACCORDION_HEADERS):
+        target = (header.get_attribute("href") or "").partition("#")[2]
+        bodies = driver.find_elements(By.ID, target) if target else []
+        lines = []
+        if bodies:
+            items = bodies[0].find_elements(By.TAG_NAME, "li")
+            lines = [li.text for li in items] if items else bodies[0].text.split("\n")
+            lines = [line.strip() for line in lines if line.strip()]
+        cases.append({"header": header.text.strip(), "target": target, "lines": lines})
+    return cases
+
+
+def count_instruction_lines(lines):
+    """סופר שורות ממוספרות; אם אין כאלה - סופר את כל השורות הלא ריקות."""
+    numbered = sum(1 for line in lines if NUMBERED_LINE.match(line))
+    return numbered or len(lines)
+
+
+def _check_case_content(i, header_text, lines, counters):
+    """בדיקות משותפות לתוכן של Test Case בשני המצבים (bulk / interactive)."""
+    if not lines:
+        log_warning(f"❌ התוכן לא מוצג עבור Test Case {i}")
+        return
+
+    counters["content"] += 1
+    log_success(f"✅ התוכן מוצג עבור Test Case {i}")
+
+    # 🔍 ספירת שורות הוראות
+    line_count = count_instruction_lines(lines)
+    if line_count > 0:
+        counters["instructions"] += 1
+        log_success(f"📝 Test Case {i} מכיל {line_count} שורות הוראות")
+
+        # הצגת 3 השורות הראשונות (preview)
+        for idx, line in enumerate(lines[:3], 1):
+            log_info(f"   שורה {idx}: {line[:80]}{'...' if len(line) > 80 else ''}")
+    else:
+        log_warning(f"⚠️ Test Case {i} לא מכיל הוראות ברורות")
+
+    # בדיקת התאמה בין כותרת לתוכן
+    content_text = "\n".join(lines)
+    if header_text.lower() in content_text.lower():
+        log_success(f"✅ הטקסט בתוכן תואם את הכותרת: '{header_text}'")
+    else:
+        log_warning(f"❌ הטקסט בתוכן לא תואם את הכותרת: '{header_text}'")
+
+
+def _run_bulk_mode(driver, counters):
+    """מצב bulk: קריאת כל הפאנלים במעבר אחד, בלי לחיצות."""
+    cases = harvest_test_cases(driver)
+    for i, case in enumerate(cases, start=1):
+        _check_case_content(i, case["header"], case["lines"], counters)
+    return len(cases)
+
+
+def _run_interactive_mode(driver, counters):
+    """מצב interactive: לחיצה על כל כותרת ואימות שהפאנל אכן נפתח."""
+    accordion_headers = driver.find_elements(*TestCasesPage.ACCORDION_HEADERS)
+
+    for i, header in enumerate(accordion_headers, start=1):
+        try:
+            header_text = header.text.strip()
+            driver.execute_script("arguments[0].scrollIntoView(true);", header)
+            wait_for_scroll_settled(driver, header, legacy_sleep=0.2)
+
+            header.click()
+            log_info(f"נפתח Test Case {i}: {header_text}")
+
+            # המתן לתוכן להופיע
+            content = WebDriverWait(driver, 5).until(
+                EC.visibility_of_element_located(TestCasesPage.PANEL_BODY(number=i))
+            )
+            lines = [line.strip() for line in content.text.split('\n') if line.strip()]
+            _check_case_content(i, header_text, lines, counters)
+
+        except Exception as e:
+            log_error(f"❌ שגיאה בבדיקת Test Case {i}: {e}")
+
+    return len(accordion_headers)
+
+
+@pytest.mark.block_images
+def test_navigate_to_test_cases(driver, request, base_url):
     """בדיקה של ניווט לכפתור Test Cases והפעלת כל מקרי הבדיקה"""
     test_name = "בדיקת ניווט לכפתור Test Cases"
     log_test_start(test_name)
@@ -19,16 +137,17 @@ def test_navigate_to_test_cases(driver):
     total_cases = 0
     cases_with_content = 0
     cases_with_instructions = 0
+    mode_durations = {}
 
     try:
-        url = "https://automationexercise.com/"
+        url = f"{base_url}/"
         start_time = time.time()
         log_info(f"🌐 Loading {url}")
-        driver.get(url)
+        navigate(driver, url)
 
         # --- ניווט לכפתור Test Cases ---
         button = WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.XPATH, "//a[@href='/test_cases']"))
+            EC.visibility_of_element_located(Header.TEST_CASES)
         )
         log_success("כפתור 'Test Cases' נמצא וגלוי לעין")
 
@@ -42,70 +161,26 @@ def test_navigate_to_test_cases(driver):
         log_success("הניווט לעמוד Test Cases הצליח")
 
         # --- בדיקה של מקרי הבדיקה ---
-        test_cases = driver.find_elements(By.CLASS_NAME, "panel-group")
+        test_cases = driver.find_elements(*TestCasesPage.PANELS)
         log_info(f"נמצאו {len(test_cases)} מקרי בדיקה.")
         if len(test_cases) == 0:
             log_warning("לא נמצאו מקרי בדיקה בעמוד!")
 
-        accordion_headers = driver.find_elements(By.XPATH, "//*[@id='form']//h4/a")
-        total_cases = len(accordion_headers)
-
-        for i, header in enumerate(accordion_headers, start=1):
-            try:
-                header_text = header.text.strip()
-                driver.execute_script("arguments[0].scrollIntoView(true);", header)
-                time.sleep(0.2)
-
-                header.click()
-                log_info(f"נפתח Test Case {i}: {header_text}")
-
-                # המתן לתוכן להופיע
-                content = WebDriverWait(driver, 5).until(
-                    EC.visibility_of_element_located(
-                        (By.XPATH, f"//*[@id='form']//div[@id='collapse{i}']")
-                    )
-                )
-
-                if content.is_displayed():
-                    cases_with_content += 1
-                    log_success(f"✅ התוכן מוצג עבור Test Case {i}")
-
-                    # 🔍 ספירת שורות הוראות
-                    content_text = content.text.strip()
-
-                    # ניסיון למצוא שורות ממוספרות (1. 2. 3. וכו')
-                    numbered_lines = [line for line in content_text.split('\n') if
-                                      line.strip() and any(line.strip().startswith(f"{num}.") for num in range(1, 100))]
-
-                    # אם לא נמצאו שורות ממוספרות, ספור שורות לא ריקות
-                    if not numbered_lines:
-                        instruction_lines = [line for line in content_text.split('\n') if line.strip()]
-                        line_count = len(instruction_lines)
-                    else:
-                        line_count = len(numbered_lines)
-
-                    if line_count > 0:
-                        cases_with_instructions += 1
-                        log_success(f"📝 Test Case {i} מכיל {line_count} שורות הוראות")
-
-                        # הצגת 3 השורות הראשונות (preview)
-                        preview_lines = content_text.split('\n')[:3]
-                        for idx, line in enumerate(preview_lines, 1):
-                            if line.strip():
-                                log_info(f"   שורה {idx}: {line.strip()[:80]}{'...' if len(line.strip()) > 80 else ''}")
-                    else:
-                        log_warning(f"⚠️ Test Case {i} לא מכיל הוראות ברורות")
-
-                    # בדיקת התאמה בין כותרת לתוכן
-                    if header_text.lower() in content_text.lower():
-                        log_success(f"✅ הטקסט בתוכן תואם את הכותרת: '{header_text}'")
-                    else:
-                        log_warning(f"❌ הטקסט בתוכן לא תואם את הכותרת: '{header_text}'")
-                else:
-                    log_warning(f"❌ התוכן לא מוצג עבור Test Case {i}")
-
-            except Exception as e:
-                log_error(f"❌ שגיאה בבדיקת Test Case {i}: {e}")
+        # --- איסוף התוכן: bulk (ברירת מחדל), interactive או both להשוואת זמנים ---
+        mode = request.config.getoption("--accordion-mode")
+        modes = ["bulk", "interactive"] if mode == "both" else [mode]
+
+        for current_mode in modes:
+            counters = {"content": 0, "instructions": 0}
+            mode_start = time.perf_counter()
+            if current_mode == "interactive":
+                total_cases = _run_interactive_mode(driver, counters)
+            else:
+                total_cases = _run_bulk_mode(driver, counters)
+            mode_durations[current_mode] = time.perf_counter() - mode_start
+            cases_with_content = counters["content"]
+            cases_with_instructions = counters["instructions"]
+            log_info(f"⏱️ מצב {current_mode}: {mode_durations[current_mode]:.2f} שניות")
 
     except Exception as e:
         log_error(f"שגיאה במהלך הבדיקה: {e}")
@@ -122,7 +197,10 @@ def test_navigate_to_test_cases(driver):
             f"🔢 סה״כ Test Cases: {total_cases}\n"
             f"✅ Cases עם תוכן גלוי: {cases_with_content}\n"
             f"📝 Cases עם הוראות: {cases_with_instructions}\n"
-            f"⏱️  משך הבדיקה: {duration:.2f} שניות\n"
+            + "".join(f"⏱️  מצב {m}: {d:.2f} שניות\n" for m, d in mode_durations.items())
+            + (f"🚀 bulk מהיר פי {mode_durations['interactive'] / mode_durations['bulk']:.1f} מ-interactive\n"
+               if len(mode_durations) == 2 and mode_durations["bulk"] > 0 else "")
+            + f"⏱️  משך הבדיקה: {duration:.2f} שניות\n"
             f"{'=' * 60}\n"
         )
         log_info(summary)
@@ -131,5 +209,26 @@ def test_navigate_to_test_cases(driver):
         log_test_end(test_name, outcome)
 
 
+@pytest.mark.capabilities("dom")
+def test_read_test_cases_list(driver, base_url):
+    """קריאת רשימת ה-Test Cases בלבד, בלי לחיצות - רצה גם ב-backend מסוג http"""
+    test_name = "קריאת רשימת Test Cases"
+    log_test_start(test_name)
+    try:
+        navigate(driver, f"{base_url}/test_cases")
+        counters = {"content": 0, "instructions": 0}
+        total_cases = _run_bulk_mode(driver, counters)
+
+        assert total_cases > 0, "לא נמצאו מקרי בדיקה בעמוד"
+        assert counters["content"] == total_cases, \
+            f"רק ל-{counters['content']} מתוך {total_cases} מקרי בדיקה יש תוכן"
+        log_success(f"נקראו {total_cases} מקרי בדיקה, לכולם יש תוכן")
+        log_test_end(test_name, "passed")
+    except Exception as e:
+        log_error(f"שגיאה בקריאת רשימת Test Cases: {e}")
+        log_test_end(test_name, "failed")
+        raise
+
+
 if __name__ == "__main__":
     print("יש להריץ בדיקה זו באמצעות Pytest: pytest tests/test_navigation_to_test_cases.py")
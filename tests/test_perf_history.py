@@ -0,0 +1,89 @@
+import math
+from statistics import stdev
+import pytest
+from framework import perf_history
+from framework.perf_history import _t_statistic, compare, record_run
+
+# 💡 בדיקות יחידה להשוואת הביצועים - סדרות זמנים קבועות ב-DB זמני, בלי דפדפן
+
+CONFIG = {"target": "local", "backend": "chrome"}
+
+
+@pytest.fixture
+def history_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("GIT_COMMIT", "abc1234")  # בלי subprocess של git
+    return str(tmp_path / "perf_history.sqlite")
+
+
+def _record(path, runs: list):
+    """runs = [{nodeid: duration}] - ריצה לכל מילון, בסדר כרונולוגי."""
+    for i, durations in enumerate(runs):
+        tests = {nodeid: ("passed", duration) for nodeid, duration in durations.items()}
+        record_run(f"run{i}", CONFIG, 0.0, 0, tests, [], path=path)
+
+
+def _rows(result) -> dict:
+    return {row["name"]: row for row in result["rows"]}
+
+
+def test_t_statistic_needs_two_baseline_samples():
+    assert _t_statistic([1.0], [2.0]) is None
+
+
+def test_t_statistic_single_current_sample_uses_prediction_interval():
+    baseline = [1.0, 1.2, 0.8, 1.0]
+    spread = stdev(baseline) * math.sqrt(1 + 1 / len(baseline))
+    assert _t_statistic(baseline, [2.0]) == pytest.approx(1.0 / spread)
+
+
+def test_t_statistic_welch_with_several_current_samples():
+    assert _t_statistic([1.0, 1.2, 0.8], [2.0, 2.2, 1.8]) == pytest.approx(1.0 / math.sqrt(0.04 / 3 + 0.04 / 3))
+
+
+def test_t_statistic_zero_spread():
+    assert _t_statistic([1.0, 1.0, 1.0], [1.5]) == math.inf
+    assert _t_statistic([1.0, 1.0, 1.0], [0.5]) == -math.inf
+    assert _t_statistic([1.0, 1.0, 1.0], [1.0]) == 0.0
+
+
+def test_compare_flags_only_significant_and_material_slowdowns(history_db):
+    baseline = {
+        "regression": [10.0, 10.1, 9.9, 10.0, 10.0],
+        "below_relative": [10.0, 10.1, 9.9, 10.0, 10.0],
+        "below_absolute": [1.0, 1.01, 0.99, 1.0, 1.0],
+        "noisy": [1.0, 3.0, 1.0, 3.0, 1.0],
+        "faster": [5.0, 5.1, 4.9, 5.0, 5.0],
+    }
+    current = {
+        "regression": 11.5,       # +1.5s, +15%, מובהק
+        "below_relative": 10.5,   # +0.5s מובהק, אבל רק 5% (< MIN_RELATIVE_SLOWDOWN)
+        "below_absolute": 1.2,    # +20% מובהק, אבל רק 0.2s (< MIN_ABSOLUTE_SLOWDOWN)
+        "noisy": 3.0,             # +1.2s, אבל בתוך הפיזור של ה-baseline
+        "faster": 4.0,
+        "new_test": 2.0,
+    }
+    _record(history_db, [{name: series[i] for name, series in baseline.items()} for i in range(5)] + [current])
+
+    result = compare(path=history_db)
+    rows = _rows(result)
+
+    assert len(result["current"]) == 1 and len(result["baseline"]) == 5
+    assert [name for name, row in rows.items() if row["slower"]] == ["regression"]
+    assert rows["regression"]["delta"] == pytest.approx(1.5)
+    assert rows["below_relative"]["t"] >= perf_history.SIGNIFICANCE_T
+    assert rows["below_absolute"]["t"] >= perf_history.SIGNIFICANCE_T
+    assert rows["noisy"]["t"] < perf_history.SIGNIFICANCE_T
+    assert rows["new_test"]["baseline"] is None and not rows["new_test"]["slower"]
+
+
+def test_compare_without_regression(history_db):
+    _record(history_db, [{"stable": duration} for duration in (2.0, 2.1, 1.9, 2.0, 2.0, 2.05)])
+
+    rows = _rows(compare(path=history_db))
+
+    assert not rows["stable"]["slower"]
+    assert rows["stable"]["delta"] == pytest.approx(0.05)
+
+
+def test_compare_empty_history(history_db):
+    assert compare(path=history_db)["rows"] == []
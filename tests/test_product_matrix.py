@@ -0,0 +1,110 @@
+import pytest
+
+from framework.actions import (
+    remove_all_overlays,
+    safe_click,
+    wait_for_clickable,
+    retry_on_stale,
+    wait_for_modal_visible,
+    navigate,
+)
+from framework.catalog import Catalogue, diff_cart, snapshot_cart
+from framework.locators import ProductsPage, ProductDetailsPage, CartPage
+from framework.logger import log_info, log_error, log_success, log_test_start, log_test_end
+from framework.state import seed_cart
+
+PRODUCTS_PATH = "/products"
+CART_PATH = "/view_cart"
+
+# 💡 מטריצת מוצרים (--product-matrix): כל בדיקה כאן רצה לכל מוצר. ה-UI מופעל רק בבדיקה שבודקת אותו
+#    (הוספה לעגלה מעמוד המוצרים); שאר הבדיקות ממלאות את העגלה ישירות דרך ה-endpoint (seed_cart)
+#    ורצות ב-backend ה-http, כך שכל הקטלוג נבדק בדקות.
+
+
+# ===================== Per-Product Matrix =====================
+
+@pytest.mark.capabilities("dom")
+def test_product_details_match_catalogue(driver, base_url, product):
+    test_name = f"Product Details ({product.name})"
+    log_test_start(test_name)
+    try:
+        navigate(driver, f"{base_url}/product_details/{product.id}")
+
+        name = driver.find_element(*ProductDetailsPage.NAME).text
+        price = driver.find_element(*ProductDetailsPage.PRICE).text
+        assert name == product.name, f"שם המוצר {product.id} בעמוד הוא '{name}' ולא '{product.name}'"
+        assert price == product.price, f"המחיר של '{product.name}' בעמוד הוא '{price}' ולא '{product.price}'"
+
+        log_success(f"עמוד המוצר '{product.name}' תואם לקטלוג ({price})")
+        log_test_end(test_name, "passed")
+    except Exception as e:
+        log_error(f"שגיאה בבדיקת עמוד המוצר '{product.name}': {e}")
+        log_test_end(test_name, "failed")
+        assert False
+
+
+def test_add_to_cart_from_products_page(driver, base_url, product):
+    test_name = f"Add to Cart ({product.name})"
+    log_test_start(test_name)
+    try:
+        navigate(driver, base_url + PRODUCTS_PATH)
+        remove_all_overlays(driver)
+
+        add_button = wait_for_clickable(driver, *ProductsPage.ADD_TO_CART(product_id=product.id))
+        retry_on_stale(safe_click, driver, add_button)
+        wait_for_modal_visible(driver)
+
+        navigate(driver, base_url + CART_PATH)
+        assert driver.find_elements(*CartPage.ROW(product_id=product.id)), \
+            f"המוצר '{product.name}' לא נוסף לעגלה"
+
+        log_success(f"המוצר '{product.name}' נוסף לעגלה מעמוד המוצרים")
+        log_test_end(test_name, "passed")
+    except Exception as e:
+        log_error(f"שגיאה בהוספת '{product.name}' לעגלה: {e}")
+        log_test_end(test_name, "failed")
+        assert False
+
+
+@pytest.mark.capabilities("dom")
+def test_cart_price_matches_catalogue(driver, base_url, product):
+    test_name = f"Cart Price ({product.name})"
+    log_test_start(test_name)
+    try:
+        # 💡 ההוספה לעגלה אינה הנושא כאן - ישירות דרך ה-endpoint
+        seed_cart(driver, base_url, [product.id])
+        navigate(driver, base_url + CART_PATH)
+
+        differences = diff_cart(Catalogue([product]), snapshot_cart(driver), expected={product.id: 1})
+        assert not differences, f"העגלה אינה תואמת לקטלוג: {differences}"
+
+        log_success(f"המוצר '{product.name}' מופיע בעגלה במחיר הנכון: {product.price}")
+        log_test_end(test_name, "passed")
+    except Exception as e:
+        log_error(f"שגיאה בבדיקת המחיר של '{product.name}' בעגלה: {e}")
+        log_test_end(test_name, "failed")
+        assert False
+
+
+# ===================== Whole Catalogue =====================
+
+@pytest.mark.capabilities("dom")
+def test_full_catalogue_cart_prices(driver, base_url, product_matrix):
+    test_name = "Full Catalogue in Cart"
+    log_test_start(test_name)
+    try:
+        seed_cart(driver, base_url, [product.id for product in product_matrix])
+        navigate(driver, base_url + CART_PATH)
+
+        # 💡 כל העגלה נקראת פעם אחת ומושווית לקטלוג - בלי חיפוש לכל מוצר
+        differences = diff_cart(Catalogue(product_matrix), snapshot_cart(driver),
+                                expected={product.id: 1 for product in product_matrix})
+        assert not differences, f"מוצרים חסרים או במחיר שגוי בעגלה: {differences}"
+
+        log_info(f"🛒 {len(product_matrix)} מוצרים נבדקו בעגלה")
+        log_success("כל מוצרי הקטלוג מופיעים בעגלה במחיר הנכון")
+        log_test_end(test_name, "passed")
+    except Exception as e:
+        log_error(f"שגיאה בבדיקת הקטלוג המלא בעגלה: {e}")
+        log_test_end(test_name, "failed")
+        assert False
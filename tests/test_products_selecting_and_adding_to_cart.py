@@ -1,5 +1,4 @@
 import pytest
-import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -12,26 +11,33 @@ from framework.actions import (
     wait_for_clickable,
     hover_over_element,
     retry_on_stale,
+    wait_for_modal_visible,
+    wait_for_scroll_settled,
+    navigate,
 )
+from framework.catalog import diff_cart, get_catalogue, snapshot_cart
+from framework.locators import Header, ProductsPage, ProductDetailsPage, CartModal, CartPage
 from framework.logger import log_info, log_warning, log_error, log_success, log_test_start, log_test_end
 
-PRODUCTS_URL = "https://automationexercise.com/products"
-PRODUCT_DETAILS_URL = "https://automationexercise.com/product_details/1"
-CART_URL = "https://automationexercise.com/view_cart"
+PRODUCTS_PATH = "/products"
+PRODUCT_DETAILS_PATH = "/product_details/1"
+CART_PATH = "/view_cart"
+
+# 💡 כל בדיקה עומדת בפני עצמה: דפדפן נקי מהמאגר, וה-state הדרוש (למשל מוצר בעגלה) מוצהר ב-needs.
+#    כך אפשר להריץ את המודול במקביל ובכל סדר.
 
 
 # ===================== Product & Cart Tests =====================
 
-@pytest.mark.order(1)
-def test_navigate_to_products(driver):
+def test_navigate_to_products(driver, base_url):
     test_name = "Navigate to Products"
     log_test_start(test_name)
     try:
-        driver.get("https://automationexercise.com/")
+        navigate(driver, f"{base_url}/")
         WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
         remove_all_overlays(driver)
 
-        products_link = wait_for_clickable(driver, By.XPATH, "//a[contains(text(),'Products')]")
+        products_link = wait_for_clickable(driver, *Header.PRODUCTS)
         driver.execute_script("window.scrollBy(0, 300)")  # גלילה בסיסית
         retry_on_stale(safe_click, driver, products_link)
 
@@ -43,15 +49,14 @@ def test_navigate_to_products(driver):
         assert False
 
 
-@pytest.mark.order(2)
-def test_click_women_category(driver):
+def test_click_women_category(driver, base_url):
     test_name = "Click Women Category"
     log_test_start(test_name)
     try:
-        driver.get(PRODUCTS_URL)
+        navigate(driver, base_url + PRODUCTS_PATH)
         remove_all_overlays(driver)
 
-        women_menu = wait_for_clickable(driver, By.XPATH, "//a[@href='#Women']")
+        women_menu = wait_for_clickable(driver, *ProductsPage.WOMEN_CATEGORY)
         driver.execute_script("window.scrollBy(0, 300)")  # גלילה בסיסית
         retry_on_stale(safe_click, driver, women_menu)
 
@@ -63,20 +68,17 @@ def test_click_women_category(driver):
         assert False
 
 
-@pytest.mark.order(3)
-def test_view_blue_top_product(driver):
+def test_view_blue_top_product(driver, base_url):
     test_name = "View Product (Blue Top)"
     log_test_start(test_name)
     try:
-        driver.get(PRODUCTS_URL)
+        navigate(driver, base_url + PRODUCTS_PATH)
         remove_all_overlays(driver)
 
-        product_wrapper = wait_for_clickable(driver, By.XPATH,
-                                             "//div[@class='product-image-wrapper']//p[text()='Blue Top']")
+        product_wrapper = wait_for_clickable(driver, *ProductsPage.PRODUCT_NAME(name="Blue Top"))
         retry_on_stale(hover_over_element, driver, product_wrapper)
 
-        product_link = wait_for_clickable(driver, By.XPATH,
-                                          "//div[@class='product-image-wrapper']//a[@href='/product_details/1']")
+        product_link = wait_for_clickable(driver, *ProductsPage.VIEW_PRODUCT(product_id=1))
         retry_on_stale(safe_click, driver, product_link)
 
         log_success("ניווט ל-Product Details הצליח")
@@ -87,24 +89,22 @@ def test_view_blue_top_product(driver):
         assert False
 
 
-@pytest.mark.order(4)
-def test_add_to_cart_in_details_page(driver):
+def test_add_to_cart_in_details_page(driver, base_url):
     test_name = "Add to Cart (Details Page)"
     log_test_start(test_name)
     try:
-        driver.get(PRODUCT_DETAILS_URL)
+        navigate(driver, base_url + PRODUCT_DETAILS_PATH)
         remove_all_overlays(driver)
 
-        # 💡 תיקון: שימוש ב-XPath על בסיס האייקון <i> ובטקסט "Add to cart"
-        add_to_cart_button = wait_for_clickable(driver, By.XPATH,
-                                                "//button[contains(., 'Add to cart') and i[@class='fa fa-shopping-cart']]")
+        add_to_cart_button = wait_for_clickable(driver, *ProductDetailsPage.ADD_TO_CART)
 
         # 💡 גלילה מפורשת לפני לחיצה
         driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", add_to_cart_button)
-        time.sleep(0.5)
+        wait_for_scroll_settled(driver, add_to_cart_button, legacy_sleep=0.5)
         retry_on_stale(safe_click, driver, add_to_cart_button)
 
-        time.sleep(2)
+        # 💡 המתנה ל-popup "Added!" במקום sleep קבוע
+        wait_for_modal_visible(driver, legacy_sleep=2)
 
         log_success("מוצר נוסף בהצלחה לעגלת הקניות מעמוד Details")
         log_test_end(test_name, "passed")
@@ -114,33 +114,31 @@ def test_add_to_cart_in_details_page(driver):
         assert False
 
 
-@pytest.mark.order(5)
-def test_add_to_cart_via_popup(driver):
+def test_add_to_cart_via_popup(driver, base_url):
     test_name = "Add to Cart via Popup"
     log_test_start(test_name)
     try:
-        driver.get(PRODUCTS_URL)
+        navigate(driver, base_url + PRODUCTS_PATH)
         remove_all_overlays(driver)
 
-        # 💡 תיקון XPath: שימוש במזהה data-product-id='1' של המוצר הראשון
-        add_button = wait_for_clickable(driver, By.XPATH, "//a[@data-product-id='1']")
+        # 💡 שימוש במזהה data-product-id='1' של המוצר הראשון
+        add_button = wait_for_clickable(driver, *ProductsPage.ADD_TO_CART(product_id=1))
 
         # 💡 גלילה מפורשת לפני לחיצה
         driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", add_button)
         retry_on_stale(safe_click, driver, add_button)
 
-        time.sleep(2)
+        wait_for_modal_visible(driver, legacy_sleep=2)
 
         # לחיצה על View Cart ב-popup
-        popup_view_cart = wait_for_clickable(driver, By.XPATH,
-                                             "//div[contains(@class, 'modal-content')]//a[@href='/view_cart']")
+        popup_view_cart = wait_for_clickable(driver, *CartModal.VIEW_CART)
         retry_on_stale(safe_click, driver, popup_view_cart)
 
         # לוודא שהגענו לעגלה
-        driver.get(CART_URL)
+        navigate(driver, base_url + CART_PATH)
 
         # בדיקה שיש מוצר בעגלה
-        cart_items = driver.find_elements(By.XPATH, "//tr[@id='product-1']")
+        cart_items = driver.find_elements(*CartPage.ROW(product_id=1))
         assert cart_items, "לא נוספו מוצרים לעגלה דרך ה-popup"
 
         log_success(f"מוצר נוסף בהצלחה לעגלה דרך ה-popup ({len(cart_items)} מוצר/ים)")
@@ -151,34 +149,25 @@ def test_add_to_cart_via_popup(driver):
         assert False
 
 
-@pytest.mark.order(6)
-def test_verify_cart_item_and_price(driver):
+@pytest.mark.needs(products_in_cart=[1])
+def test_verify_cart_item_and_price(driver, base_url):
     test_name = "Verify Cart Item and Price"
     log_test_start(test_name)
     try:
-        # 1. דגימת מחיר/שם המוצר מהעמוד הראשי
-        driver.get(PRODUCTS_URL)
-        remove_all_overlays(driver)
-
-        product_name_element = wait_for_clickable(driver, By.XPATH, "(//div[@class='productinfo text-center']/p)[1]")
-        product_name = product_name_element.text
+        # 1. תמונת מצב של הקטלוג (קריאת script אחת, נשמרת בזיכרון לכל הריצה)
+        catalogue = get_catalogue(driver, base_url)
 
-        product_price_element = driver.find_element(By.XPATH, "(//div[@class='productinfo text-center']/h2)[1]")
-        product_price = product_price_element.text
-
-        # 2. ניווט ישיר לעגלה
-        driver.get(CART_URL)
+        # 2. ניווט ישיר לעגלה ותמונת מצב שלה
+        navigate(driver, base_url + CART_PATH)
         remove_all_overlays(driver)
+        cart = snapshot_cart(driver)
 
-        # 3. אימות בעמוד העגלה
-        cart_product_element = driver.find_element(By.XPATH,
-                                                   f"//td[@class='cart_description']/h4/a[text()='{product_name}']")
-        assert cart_product_element, f"המוצר '{product_name}' לא נמצא בעגלה"
-
-        cart_price_element = driver.find_element(By.XPATH, f"//td[@class='cart_price']/p[text()='{product_price}']")
-        assert cart_price_element, f"המחיר של המוצר '{product_name}' בעגלה שונה מהמחיר בעמוד מוצר"
+        # 3. אימות: diff בין העגלה לקטלוג
+        differences = diff_cart(catalogue, cart, expected={1: 1})
+        assert not differences, f"העגלה אינה תואמת לקטלוג: {differences}"
 
-        log_success(f"המוצר '{product_name}' מופיע בעגלה והמחיר נכון: {product_price}")
+        product = catalogue[1]
+        log_success(f"המוצר '{product.name}' מופיע בעגלה והמחיר נכון: {product.price}")
         log_test_end(test_name, "passed")
     except Exception as e:
         log_error(f"שגיאה בבדיקת מוצר/מחיר בעגלה: {e}")
@@ -0,0 +1,88 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from framework import wait_manager
+from framework.wait_manager import AdaptiveWait, configure_waits
+
+# 💡 בדיקות יחידה ל-polling האדפטיבי - בלי driver, עם שעון מדומה
+
+
+class _FakeClock:
+    """מחליף את time במודול: sleep מקדם את השעון ונרשם, בלי המתנה אמיתית."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _FakeClock()
+    monkeypatch.setattr(wait_manager, "time", fake)
+    monkeypatch.setattr(wait_manager, "WAIT_SETTINGS",
+                        {"timeout": 10, "initial_poll": 0.05, "max_poll": 0.5, "backoff": 1.5})
+    monkeypatch.setattr(wait_manager, "ACTION_WAIT_SETTINGS", {})
+    return fake
+
+
+def _never(driver):
+    return False
+
+
+def test_poll_interval_grows_by_backoff_up_to_max_poll(clock):
+    configure_waits(timeout=2)
+    with pytest.raises(TimeoutException):
+        AdaptiveWait(driver=object()).until(_never, "never")
+
+    expected, delay = [], 0.05
+    while sum(expected) + delay < 2:
+        expected.append(delay)
+        delay = min(delay * 1.5, 0.5)
+    expected.append(2 - sum(expected))  # ההמתנה האחרונה נחתכת ב-timeout
+    assert clock.sleeps == pytest.approx(expected)
+    assert clock.sleeps[:4] == pytest.approx([0.05, 0.075, 0.1125, 0.16875])
+    assert max(clock.sleeps) == pytest.approx(0.5)
+
+
+def test_timeout_raised_at_deadline(clock):
+    started = clock.now
+    with pytest.raises(TimeoutException, match="not found"):
+        AdaptiveWait(driver=object()).until(_never, "not found", timeout=3)
+    assert clock.now - started == pytest.approx(3)
+
+
+def test_returns_value_once_condition_holds(clock):
+    calls = []
+
+    def ready_on_third_poll(driver):
+        calls.append(driver)
+        if len(calls) < 3:
+            raise NoSuchElementException("not yet")
+        return "element"
+
+    driver = object()
+    assert AdaptiveWait(driver).until(ready_on_third_poll) == "element"
+    assert calls == [driver] * 3
+    assert clock.sleeps == pytest.approx([0.05, 0.075])
+
+
+def test_call_overrides_and_action_settings(clock):
+    configure_waits(action="safe_click", timeout=1, max_poll=0.1)
+    with pytest.raises(TimeoutException):
+        AdaptiveWait(driver=object()).until(_never, action="safe_click", poll=0.1)
+    assert clock.sleeps == pytest.approx([0.1] * 10)
+
+
+def test_unexpected_exception_propagates(clock):
+    def broken(driver):
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        AdaptiveWait(driver=object()).until(broken)
+    assert clock.sleeps == []